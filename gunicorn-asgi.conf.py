@@ -0,0 +1,20 @@
+"""
+Gunicorn settings for serving the ASGI application with uvicorn workers:
+
+    gunicorn -c gunicorn-asgi.conf.py task_flow.asgi:application
+
+Everything else is inherited from gunicorn.conf.py. Each worker runs an
+event loop instead of a thread pool; the views under /async/ await the
+database rather than holding a thread for the whole request.
+"""
+import runpy
+from pathlib import Path
+
+globals().update(
+    (name, value)
+    for name, value in runpy.run_path(str(Path(__file__).with_name("gunicorn.conf.py"))).items()
+    if not name.startswith("__")
+)
+
+# uvicorn.workers is deprecated; the worker class now ships as its own package.
+worker_class = "uvicorn_worker.UvicornWorker"
@@ -0,0 +1,41 @@
+"""
+Gunicorn settings, picked up automatically from the working directory:
+
+    gunicorn task_flow.wsgi
+
+Threads share a worker's memory and, with CONN_MAX_AGE, each thread keeps
+one persistent database connection, so expect up to workers * threads
+connections to Postgres (or size DB_POOL_MAX_SIZE to the thread count).
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get("GUNICORN_BIND", f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+# Import Django once in the master so workers fork with warm modules and
+# shared copy-on-write memory.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "True") != "False"
+
+# Recycle workers periodically to bound slow memory growth; the jitter keeps
+# them from all restarting at once.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    # Connections opened while preloading must not be shared between processes.
+    if server.cfg.preload_app:
+        from django.db import connections
+
+        connections.close_all()
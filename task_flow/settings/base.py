@@ -39,7 +39,6 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
-    "debug_toolbar",
     "crispy_forms",
     "crispy_bootstrap4",
     "tasks",
@@ -47,8 +46,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "tasks.middleware.AsyncWhiteNoiseMiddleware",
+    "tasks.middleware.RequestMetricsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -130,3 +129,67 @@ INTERNAL_IPS = [
 AUTH_USER_MODEL = "tasks.Worker"
 
 CRISPY_TEMPLATE_PACK = "bootstrap4"
+
+# Seconds the dashboard counters on the index page stay cached
+DASHBOARD_STATS_CACHE_TIMEOUT = int(os.environ.get("DASHBOARD_STATS_CACHE_TIMEOUT", 60))
+
+# Seconds the capacity report stays cached; task and assignee changes invalidate it sooner
+CAPACITY_REPORT_CACHE_TIMEOUT = int(os.environ.get("CAPACITY_REPORT_CACHE_TIMEOUT", 600))
+
+# Seconds the dashboard trend chart stays cached; each analytics rollup invalidates it
+TASK_TREND_CACHE_TIMEOUT = int(os.environ.get("TASK_TREND_CACHE_TIMEOUT", 3600))
+
+# Dotted path to a tasks.search backend; picked from the database vendor when unset
+TASKS_SEARCH_BACKEND = os.environ.get("TASKS_SEARCH_BACKEND")
+
+# Requests slower than this are logged to "tasks.requests" with their slowest queries
+SLOW_REQUEST_THRESHOLD_MS = int(os.environ.get("SLOW_REQUEST_THRESHOLD_MS", 500))
+SLOW_REQUEST_TOP_QUERIES = int(os.environ.get("SLOW_REQUEST_TOP_QUERIES", 5))
+
+# The /api/changes/ feed holds back rows written more recently than this, so a
+# transaction still open when a client polls cannot commit rows behind its cursor;
+# keep it above the longest write transaction (imports restamp their rows at the end)
+SYNC_SAFETY_LAG_SECONDS = int(os.environ.get("SYNC_SAFETY_LAG_SECONDS", 60))
+
+# Bearer token for the /metrics/ endpoint; without one only INTERNAL_IPS may scrape it
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+
+# Background jobs run by `manage.py run_worker`; failed attempts are retried
+# after JOB_RETRY_BASE_SECONDS * 2 ** attempt. Workers refresh a running job's
+# heartbeat every JOB_HEARTBEAT_SECONDS; running jobs without one for
+# JOB_TIMEOUT_SECONDS are assumed orphaned and requeued, however long they run
+JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", 5))
+JOB_RETRY_BASE_SECONDS = int(os.environ.get("JOB_RETRY_BASE_SECONDS", 10))
+JOB_HEARTBEAT_SECONDS = int(os.environ.get("JOB_HEARTBEAT_SECONDS", 30))
+JOB_TIMEOUT_SECONDS = int(os.environ.get("JOB_TIMEOUT_SECONDS", 300))
+JOB_RETENTION_DAYS = int(os.environ.get("JOB_RETENTION_DAYS", 7))
+
+# Seconds between runs of the jobs the worker schedules for itself
+PERIODIC_JOBS = {
+    "send_deadline_reminders": int(os.environ.get("DEADLINE_REMINDER_INTERVAL", 900)),
+    "recount": int(os.environ.get("RECOUNT_INTERVAL", 3600)),
+    "prune_jobs": 24 * 3600,
+    "prune_task_events": 24 * 3600,
+    "rollup_analytics": int(os.environ.get("ANALYTICS_ROLLUP_INTERVAL", 900)),
+}
+
+# Task history (TaskEvent rows) older than this is pruned daily
+TASK_EVENT_RETENTION_DAYS = int(os.environ.get("TASK_EVENT_RETENTION_DAYS", 365))
+
+# Workers are reminded of open tasks due within this many hours
+DEADLINE_REMINDER_HOURS = int(os.environ.get("DEADLINE_REMINDER_HOURS", 24))
+
+# Background exports are written here
+MEDIA_ROOT = os.environ.get("MEDIA_ROOT", BASE_DIR / "media")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "tasks.requests": {"handlers": ["console"], "level": "WARNING"},
+        "tasks.jobs": {"handlers": ["console"], "level": "INFO"},
+    },
+}
@@ -5,6 +5,12 @@ import os
 
 DEBUG = True
 
+# The toolbar is a development aid only: production settings never install it,
+# and task_flow/urls.py mounts it only while DEBUG is on.
+INSTALLED_APPS += ["debug_toolbar"]
+MIDDLEWARE.insert(MIDDLEWARE.index("tasks.middleware.RequestMetricsMiddleware") + 1,
+                  "debug_toolbar.middleware.DebugToolbarMiddleware")
+
 ALLOWED_HOSTS = []
 
 # Database
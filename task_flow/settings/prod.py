@@ -17,8 +17,38 @@ DATABASES = {
         "PASSWORD": os.environ["POSTGRES_PASSWORD"],
         "HOST": os.environ["POSTGRES_HOST"],
         "PORT": int(os.environ["POSTGRES_DB_PORT"]),
+        # Keep connections open across requests instead of paying a TCP and
+        # auth handshake on each one; health checks drop ones the server closed.
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 600)),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
+
+# Alternatively use Django's native connection pool (psycopg 3 with the pool extra, see requirements.txt).
+# Size it to at least the gunicorn threads per worker; each worker process
+# holds its own pool.
+DB_POOL_MAX_SIZE = os.environ.get("DB_POOL_MAX_SIZE")
+if DB_POOL_MAX_SIZE:
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+            "max_size": int(DB_POOL_MAX_SIZE),
+            "timeout": int(os.environ.get("DB_POOL_TIMEOUT", 10)),
+        }
+    }
+
+# Shared cache for dashboard stats and template fragments; falls back to a
+# per-process cache when no Redis is configured.
+REDIS_URL = os.environ.get("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+
 RENDER_EXTERNAL_HOSTNAME = os.environ.get('RENDER_EXTERNAL_HOSTNAME')
 if RENDER_EXTERNAL_HOSTNAME:
     ALLOWED_HOSTS.append(RENDER_EXTERNAL_HOSTNAME)
@@ -1,19 +1,45 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
 from django.contrib.auth.admin import UserAdmin
+from django.template.response import TemplateResponse
+from django.utils import timezone
 
-from tasks.models import Position, Worker, TaskType, Task
+from tasks import bulk
+from tasks.audit import buffered_events
+from tasks.forms import WorkerUsernamesField
+from tasks.models import Job, Position, Worker, TaskEvent, TaskReminder, TaskType, Task
+from tasks.search import search
+
+
+class AssigneesActionForm(forms.Form):
+    assignees = WorkerUsernamesField(
+        help_text="Usernames, comma-separated.",
+        widget=forms.TextInput(attrs={"size": 60}),
+    )
+
+
+class SearchBackendAdminMixin:
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        return search(queryset, search_term), False
 
 
 @admin.register(Position)
 class PositionAdmin(admin.ModelAdmin):
-    list_display = ("id", "name")
+    list_display = ("id", "name", "worker_count")
     search_fields = ("name",)
     ordering = ("name",)
 
 
 @admin.register(Worker)
-class WorkerAdmin(UserAdmin):
-    list_display = UserAdmin.list_display + ("position",)
+class WorkerAdmin(SearchBackendAdminMixin, UserAdmin):
+    list_display = UserAdmin.list_display + (
+        "position", "open_task_count", "completed_task_count", "overdue_task_count",
+    )
+    list_select_related = ("position",)
     fieldsets = UserAdmin.fieldsets + (("Additional info", {"fields": ("position",)}),)
     add_fieldsets = UserAdmin.add_fieldsets + (
         ("Additional info", {"fields": ("first_name", "last_name", "position",)}),)
@@ -24,13 +50,127 @@ class WorkerAdmin(UserAdmin):
 
 @admin.register(TaskType)
 class TaskTypeAdmin(admin.ModelAdmin):
-    list_display = ("id", "name")
+    list_display = ("id", "name", "open_task_count", "completed_task_count", "overdue_task_count")
     search_fields = ("name",)
 
 
 @admin.register(Task)
-class TaskAdmin(admin.ModelAdmin):
+class TaskAdmin(SearchBackendAdminMixin, admin.ModelAdmin):
     list_display = ("name", "task_type", "priority", "deadline", "is_completed")
     list_filter = ("task_type", "priority", "is_completed")
     search_fields = ("name", "description")
-    filter_horizontal = ("assignees",)
+    autocomplete_fields = ("assignees",)
+    list_select_related = ("task_type",)
+    actions = ("mark_completed", "add_assignees", "remove_assignees")
+
+    # Saves, deletes and bulk actions all record task events; attribute them to the admin user.
+    def changeform_view(self, request, *args, **kwargs):
+        with buffered_events(actor=request.user):
+            return super().changeform_view(request, *args, **kwargs)
+
+    def changelist_view(self, request, *args, **kwargs):
+        with buffered_events(actor=request.user):
+            return super().changelist_view(request, *args, **kwargs)
+
+    def delete_view(self, request, *args, **kwargs):
+        with buffered_events(actor=request.user):
+            return super().delete_view(request, *args, **kwargs)
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        if self.has_change_permission(request):
+            for priority in Task.PriorityChoices:
+                name = f"set_priority_{priority.name.lower()}"
+                actions[name] = (self._set_priority_action(priority), name, f"Set priority to {priority.label}")
+        return actions
+
+    def _set_priority_action(self, priority):
+        def set_priority(modeladmin, request, queryset):
+            count = bulk.set_priority(queryset, priority)
+            modeladmin.message_user(request, f"Set priority to {priority.label} on {count} task(s).")
+        return set_priority
+
+    def delete_queryset(self, request, queryset):
+        bulk.delete_tasks(queryset)
+
+    @admin.action(description="Mark selected tasks as completed", permissions=["change"])
+    def mark_completed(self, request, queryset):
+        count = bulk.complete_tasks(queryset)
+        self.message_user(request, f"Marked {count} task(s) as completed.")
+
+    @admin.action(description="Add assignees to selected tasks", permissions=["change"])
+    def add_assignees(self, request, queryset):
+        return self._change_assignees(request, queryset, bulk.add_assignees, "add_assignees", "Add assignees")
+
+    @admin.action(description="Remove assignees from selected tasks", permissions=["change"])
+    def remove_assignees(self, request, queryset):
+        return self._change_assignees(
+            request, queryset, bulk.remove_assignees, "remove_assignees", "Remove assignees"
+        )
+
+    def _change_assignees(self, request, queryset, operation, action, title):
+        form = AssigneesActionForm(request.POST if "apply" in request.POST else None)
+        if form.is_valid():
+            count = operation(queryset, form.cleaned_data["assignees"])
+            self.message_user(request, f"{title}: {count} task(s) updated.", messages.SUCCESS)
+            return None
+        return TemplateResponse(request, "admin/tasks/task/assignees_action.html", {
+            **self.admin_site.each_context(request),
+            "title": title,
+            "opts": self.model._meta,
+            "form": form,
+            "queryset": queryset,
+            "action": action,
+            "action_checkbox_name": helpers.ACTION_CHECKBOX_NAME,
+        })
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "status", "attempts", "run_after", "finished_at", "duration", "created_by")
+    list_filter = ("status", "kind")
+    list_select_related = ("created_by",)
+    readonly_fields = (
+        "attempts", "locked_by", "started_at", "heartbeat_at", "finished_at", "duration", "result", "last_error"
+    )
+    raw_id_fields = ("created_by",)
+    actions = ("retry",)
+
+    @admin.action(description="Queue selected jobs to run again", permissions=["change"])
+    def retry(self, request, queryset):
+        count = queryset.exclude(status=Job.Status.RUNNING).update(
+            status=Job.Status.QUEUED, attempts=0, run_after=timezone.now(), finished_at=None, last_error="",
+        )
+        self.message_user(request, f"Queued {count} job(s).")
+
+
+@admin.register(TaskReminder)
+class TaskReminderAdmin(admin.ModelAdmin):
+    list_display = ("task", "worker", "deadline", "created_at")
+    list_select_related = ("task", "worker__position")
+    raw_id_fields = ("task", "worker")
+
+
+@admin.register(TaskEvent)
+class TaskEventAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "kind", "task_id", "worker_id", "actor_id", "changes")
+    list_filter = ("kind",)
+    search_fields = ("task_id",)
+    search_help_text = "Task id"
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        # Look events up by task id; the table is too large for text search.
+        search_term = search_term.strip()
+        if search_term.isdigit():
+            return queryset.filter(task_id=int(search_term)), False
+        return queryset, False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,297 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from tasks.models import PositionDailyStat, RollupWatermark, Task, TaskEvent, TaskType, TaskTypeDailyStat
+
+ROLLUP_WATERMARK = "daily-task-stats"
+ROLLUP_BATCH_SIZE = 2000
+TASK_TREND_CACHE_KEY = "tasks:task-trend"
+TREND_DAYS = 365
+
+DIMENSIONS = {TaskTypeDailyStat: "task_type_id", PositionDailyStat: "position_id"}
+COUNTED_FIELDS = ["created", "completed", "overdue", "lead_time"]
+
+
+class Rollup:
+    """Increments to the daily stat rows, keyed by (task type or position, day, priority)."""
+
+    def __init__(self):
+        self.rows = {model: defaultdict(dict) for model in DIMENSIONS}
+
+    def add(self, model, dimension_id, day, priority, **counts):
+        entry = self.rows[model][dimension_id, day, priority]
+        for name, value in counts.items():
+            entry[name] = entry[name] + value if name in entry else value
+
+    def add_task(self, day, task_type_id, priority, position_ids, **counts):
+        self.add(TaskTypeDailyStat, task_type_id, day, priority, **counts)
+        for position_id in position_ids:
+            self.add(PositionDailyStat, position_id, day, priority, **counts)
+
+    def save(self):
+        for model, rows in self.rows.items():
+            _save_rows(model, rows)
+
+
+def _save_rows(model, rows):
+    if not rows:
+        return
+    dimension = DIMENSIONS[model]
+    existing = {
+        (getattr(row, dimension), row.day, row.priority): row
+        for row in model.objects.filter(
+            day__in={day for _, day, _ in rows}, **{f"{dimension}__in": {key for key, _, _ in rows}}
+        )
+    }
+    changed = []
+    created = []
+    for key, counts in rows.items():
+        row = existing.get(key)
+        if row is None:
+            dimension_id, day, priority = key
+            row = model(day=day, priority=priority, **{dimension: dimension_id})
+            created.append(row)
+        else:
+            changed.append(row)
+        for name, value in counts.items():
+            setattr(row, name, getattr(row, name) + value)
+    model.objects.bulk_update(changed, COUNTED_FIELDS, batch_size=ROLLUP_BATCH_SIZE)
+    model.objects.bulk_create(created, batch_size=ROLLUP_BATCH_SIZE)
+
+
+def task_positions(task_ids=None):
+    """{task_id: {position_id, ...}} over the tasks' current assignees."""
+    assignments = Task.assignees.through.objects.filter(worker__position__isnull=False)
+    if task_ids is not None:
+        assignments = assignments.filter(task_id__in=task_ids)
+    positions = defaultdict(set)
+    for task_id, position_id in assignments.values_list("task_id", "worker__position_id").distinct().iterator():
+        positions[task_id].add(position_id)
+    return positions
+
+
+def _roll_up_batch(rollup, events):
+    task_ids = {task_id for _, task_id, _, _, _ in events}
+    tasks = {
+        row[0]: row[1:]
+        for row in Task.objects.filter(pk__in=task_ids).values_list("id", "task_type_id", "priority", "created_at")
+    }
+    positions = task_positions(task_ids)
+    task_type_ids = {changes.get("task_type") for _, _, kind, changes, _ in events if kind == TaskEvent.Kind.CREATED}
+    task_type_ids = set(TaskType.objects.filter(pk__in=task_type_ids - {None}).values_list("id", flat=True))
+    for _, task_id, kind, changes, created_at in events:
+        day = timezone.localdate(created_at)
+        task = tasks.get(task_id)
+        if kind == TaskEvent.Kind.CREATED:
+            # The event keeps the type and priority the task was created with, even if it is gone since.
+            task_type_id = changes.get("task_type", task and task[0])
+            if task_type_id in task_type_ids:
+                rollup.add_task(
+                    day, task_type_id, changes.get("priority", task and task[1]), positions.get(task_id, ()), created=1
+                )
+        elif changes["is_completed"] == [False, True] and task is not None:
+            task_type_id, priority, task_created_at = task
+            rollup.add_task(
+                day, task_type_id, priority, positions.get(task_id, ()),
+                completed=1, lead_time=created_at - task_created_at,
+            )
+
+
+def roll_up_events(now=None):
+    """
+    Add the creations and completions not counted yet to the daily stats,
+    mark them counted and refresh today's overdue snapshot. The first run
+    rebuilds the stats from the tasks instead. Returns the number of events
+    processed.
+    """
+    now = now or timezone.now()
+    processed = 0
+    with transaction.atomic():
+        # The row lock keeps concurrent runs from counting the same events twice.
+        watermark, created = RollupWatermark.objects.select_for_update().get_or_create(name=ROLLUP_WATERMARK)
+        if created:
+            _rebuild(watermark, now)
+        else:
+            processed = _roll_up_pending()
+            snapshot_overdue(now)
+    invalidate_task_trend()
+    return processed
+
+
+def _roll_up_pending():
+    # Events are flagged rather than read past an id watermark: ids are allocated
+    # before the writing transaction commits, so a long import can make events
+    # visible well behind newer ones. Those are simply still pending next run.
+    pending = (
+        TaskEvent.objects.filter(pending_rollup=True)
+        .order_by("id")
+        .values_list("id", "task_id", "kind", "changes", "created_at")
+    )
+    rollup = Rollup()
+    processed = 0
+    while batch := list(pending[:ROLLUP_BATCH_SIZE]):
+        _roll_up_batch(rollup, batch)
+        TaskEvent.objects.filter(pk__in=[row[0] for row in batch]).update(pending_rollup=False)
+        processed += len(batch)
+    rollup.save()
+    return processed
+
+
+def snapshot_overdue(now=None):
+    """Replace today's overdue counts with the open tasks past their deadline right now."""
+    now = now or timezone.now()
+    today = timezone.localdate(now)
+    rollup = Rollup()
+    overdue = Task.objects.filter(is_completed=False, deadline__lt=now).order_by()
+    for task_type_id, priority, count in overdue.values_list("task_type_id", "priority").annotate(Count("id")):
+        rollup.add(TaskTypeDailyStat, task_type_id, today, priority, overdue=count)
+    assignments = (
+        Task.assignees.through.objects.filter(
+            task__is_completed=False, task__deadline__lt=now, worker__position__isnull=False
+        )
+        .values_list("worker__position_id", "task__priority")
+        .annotate(count=Count("task_id", distinct=True))
+        .order_by()
+    )
+    for position_id, priority, count in assignments:
+        rollup.add(PositionDailyStat, position_id, today, priority, overdue=count)
+    for model in DIMENSIONS:
+        model.objects.filter(day=today).exclude(overdue=0).update(overdue=0)
+    rollup.save()
+
+
+def _rebuild(watermark, now):
+    # The events visible here describe changes the tasks already reflect.
+    TaskEvent.objects.filter(pending_rollup=True).update(pending_rollup=False)
+    for model in DIMENSIONS:
+        model.objects.all().delete()
+    rollup = Rollup()
+    positions = task_positions()
+    tasks = Task.objects.order_by().values_list(
+        "id", "task_type_id", "priority", "created_at", "updated_at", "is_completed"
+    )
+    for task_id, task_type_id, priority, created_at, updated_at, is_completed in tasks.iterator(
+        chunk_size=ROLLUP_BATCH_SIZE
+    ):
+        position_ids = positions.get(task_id, ())
+        rollup.add_task(timezone.localdate(created_at), task_type_id, priority, position_ids, created=1)
+        if is_completed:
+            rollup.add_task(
+                timezone.localdate(updated_at), task_type_id, priority, position_ids,
+                completed=1, lead_time=updated_at - created_at,
+            )
+    rollup.save()
+    watermark.save()
+    snapshot_overdue(now)
+
+
+def rebuild_daily_stats(now=None):
+    """
+    Recompute the daily stats from the current tasks, for history older
+    than the events or after raw SQL changes. Completion days and lead
+    times use ``updated_at``, the closest a task row gets to when it was
+    completed.
+    """
+    with transaction.atomic():
+        watermark, _ = RollupWatermark.objects.select_for_update().get_or_create(name=ROLLUP_WATERMARK)
+        _rebuild(watermark, now or timezone.now())
+    invalidate_task_trend()
+
+
+def add_untracked_tasks(rollup, task_count, now=None):
+    """
+    Add ``rollup``, the stats of ``task_count`` new tasks written without
+    task events (seeded ones), under the lock roll_up_events() takes. Before
+    the first roll-up the stats are rebuilt from the tasks instead, unless
+    those tasks are all there are.
+    """
+    with transaction.atomic():
+        watermark, created = RollupWatermark.objects.select_for_update().get_or_create(name=ROLLUP_WATERMARK)
+        if created and Task.objects.count() != task_count:
+            _rebuild(watermark, now or timezone.now())
+        else:
+            rollup.save()
+    transaction.on_commit(invalidate_task_trend)
+
+
+def trend_rows(start, end):
+    """Daily totals over all task types: one grouped query over the day index."""
+    return (
+        TaskTypeDailyStat.objects.filter(day__gte=start, day__lte=end)
+        .values_list("day")
+        .annotate(Sum("created"), Sum("completed"), Sum("overdue"), Sum("lead_time"))
+        .order_by("day")
+    )
+
+
+def _trend_bounds(today):
+    start = today - timedelta(days=TREND_DAYS - 1)
+    return start - timedelta(days=start.weekday()), today
+
+
+def build_task_trend(rows, start, end):
+    """
+    Weekly series for the dashboard chart: tasks created and completed per
+    week, average lead time in days of the tasks completed that week, and
+    the overdue count of the week's latest snapshot.
+    """
+    weeks = [start + timedelta(weeks=n) for n in range((end - start).days // 7 + 1)]
+    created = [0] * len(weeks)
+    completed = [0] * len(weeks)
+    overdue = [0] * len(weeks)
+    lead_time = [timedelta()] * len(weeks)
+    for day, day_created, day_completed, day_overdue, day_lead_time in rows:
+        week = (day - start).days // 7
+        created[week] += day_created
+        completed[week] += day_completed
+        lead_time[week] += day_lead_time or timedelta()
+        # Rows come in day order, so the week ends up with its latest snapshot.
+        overdue[week] = day_overdue
+    return {
+        "labels": [week.isoformat() for week in weeks],
+        "created": created,
+        "completed": completed,
+        "overdue": overdue,
+        "lead_time_days": [
+            round(total.total_seconds() / 86400 / count, 1) if count else None
+            for total, count in zip(lead_time, completed)
+        ],
+    }
+
+
+def compute_task_trend(today=None):
+    start, end = _trend_bounds(today or timezone.localdate())
+    return build_task_trend(trend_rows(start, end), start, end)
+
+
+async def acompute_task_trend(today=None):
+    start, end = _trend_bounds(today or timezone.localdate())
+    return build_task_trend([row async for row in trend_rows(start, end)], start, end)
+
+
+def _cache_key(today):
+    return f"{TASK_TREND_CACHE_KEY}:{today.isoformat()}"
+
+
+def get_task_trend():
+    today = timezone.localdate()
+    return cache.get_or_set(_cache_key(today), lambda: compute_task_trend(today), settings.TASK_TREND_CACHE_TIMEOUT)
+
+
+async def aget_task_trend():
+    today = timezone.localdate()
+    trend = await cache.aget(_cache_key(today))
+    if trend is None:
+        trend = await acompute_task_trend(today)
+        await cache.aset(_cache_key(today), trend, settings.TASK_TREND_CACHE_TIMEOUT)
+    return trend
+
+
+def invalidate_task_trend():
+    cache.delete(_cache_key(timezone.localdate()))
@@ -0,0 +1,260 @@
+import hashlib
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db.models import Max, Prefetch
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, quote_etag
+from django.views import generic
+
+from tasks.forms import WorkerUsernameSearchForm
+from tasks.models import Position, Task, TaskType, Tombstone, Worker
+from tasks.pagination import CursorPaginator, InvalidCursor, default_cursor_ordering
+from tasks.search import search
+from tasks.sync import InvalidWatermark, changes_since
+from tasks.views import TaskFilterMixin
+
+
+class ApiError(Exception):
+    pass
+
+
+class ApiResource:
+    model = None
+    fields = {}
+
+    def prepare_queryset(self, queryset, fields):
+        return queryset
+
+    def serialize(self, obj, fields):
+        return {name: self.fields[name](obj) for name in fields}
+
+
+class JsonApiMixin(LoginRequiredMixin):
+    """
+    Shared plumbing for the read-only JSON API: sparse fieldsets through
+    ``?fields=`` and strong ETags derived from a change marker, so
+    unchanged resources are answered with 304 before any rows are loaded.
+    """
+
+    raise_exception = True
+
+    def get_base_queryset(self):
+        return self.model.objects.all()
+
+    def get_requested_fields(self):
+        requested = self.request.GET.get("fields")
+        if not requested:
+            return list(self.fields)
+        names = [name.strip() for name in requested.split(",") if name.strip()]
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ApiError(f"Unknown fields: {', '.join(unknown)}")
+        return names
+
+    def get_marker(self, queryset):
+        # Every write bumps updated_at and every delete leaves a tombstone, so the two
+        # model-wide maxima (both read off an index) move whenever any listing could.
+        return (
+            self.model.objects.aggregate(last=Max("updated_at"))["last"],
+            Tombstone.objects.filter(model=self.model._meta.label_lower).aggregate(last=Max("deleted_at"))["last"],
+        )
+
+    def get_etag(self, marker):
+        key = f"{self.model._meta.label}|{marker}|{self.request.GET.urlencode()}"
+        return quote_etag(hashlib.sha256(key.encode()).hexdigest()[:32])
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except ApiError as error:
+            return JsonResponse({"detail": str(error)}, status=400)
+
+    def conditional_response(self, marker, build_payload):
+        etag = self.get_etag(marker)
+        response = get_conditional_response(self.request, etag=etag)
+        if response is None:
+            response = JsonResponse(build_payload())
+        response["ETag"] = etag
+        return response
+
+
+class ApiListView(JsonApiMixin, generic.View):
+    http_method_names = ["get", "head", "options"]
+    page_size = 50
+    max_page_size = 500
+
+    def get_queryset(self):
+        return self.get_base_queryset()
+
+    def get_page_size(self):
+        try:
+            limit = int(self.request.GET.get("limit", self.page_size))
+        except ValueError:
+            raise ApiError("limit must be an integer")
+        return max(1, min(limit, self.max_page_size))
+
+    def get_page_url(self, cursor):
+        if cursor is None:
+            return None
+        params = self.request.GET.copy()
+        params["cursor"] = cursor
+        return f"{self.request.path}?{params.urlencode()}"
+
+    def get(self, request, *args, **kwargs):
+        fields = self.get_requested_fields()
+        queryset = self.get_queryset()
+
+        def build_payload():
+            paginator = CursorPaginator(
+                self.prepare_queryset(queryset, fields),
+                self.get_page_size(),
+                default_cursor_ordering(self.model),
+            )
+            try:
+                page = paginator.page(request.GET.get("cursor"))
+            except InvalidCursor:
+                raise ApiError("Invalid cursor")
+            return {
+                "results": [self.serialize(obj, fields) for obj in page],
+                "next": self.get_page_url(page.next_cursor),
+                "previous": self.get_page_url(page.previous_cursor),
+            }
+
+        return self.conditional_response(self.get_marker(queryset), build_payload)
+
+
+class ApiDetailView(JsonApiMixin, generic.View):
+    http_method_names = ["get", "head", "options"]
+
+    def get(self, request, *args, **kwargs):
+        fields = self.get_requested_fields()
+        queryset = self.get_base_queryset().filter(pk=kwargs["pk"])
+        marker = queryset.values_list("updated_at", flat=True).first()
+        if marker is None:
+            raise Http404("No object found.")
+
+        def build_payload():
+            return self.serialize(get_object_or_404(self.prepare_queryset(queryset, fields)), fields)
+
+        return self.conditional_response(marker, build_payload)
+
+
+def isoformat(value):
+    return value.isoformat() if value else None
+
+
+class TaskResource(ApiResource):
+    model = Task
+    fields = {
+        "id": lambda task: task.pk,
+        "name": lambda task: task.name,
+        "description": lambda task: task.description,
+        "deadline": lambda task: isoformat(task.deadline),
+        "priority": lambda task: task.priority,
+        "is_completed": lambda task: task.is_completed,
+        "task_type": lambda task: task.task_type_id,
+        "assignees": lambda task: [worker.pk for worker in task.assignees.all()],
+        "created_at": lambda task: isoformat(task.created_at),
+        "updated_at": lambda task: isoformat(task.updated_at),
+    }
+
+    def prepare_queryset(self, queryset, fields):
+        if "assignees" in fields:
+            queryset = queryset.prefetch_related(
+                Prefetch("assignees", queryset=Worker.objects.only("id"))
+            )
+        return queryset
+
+
+class TaskApiListView(TaskResource, TaskFilterMixin, ApiListView):
+    def get_queryset(self):
+        return self.filter_tasks(self.get_base_queryset())
+
+
+class TaskApiDetailView(TaskResource, ApiDetailView):
+    pass
+
+
+class WorkerResource(ApiResource):
+    model = Worker
+    fields = {
+        "id": lambda worker: worker.pk,
+        "username": lambda worker: worker.username,
+        "first_name": lambda worker: worker.first_name,
+        "last_name": lambda worker: worker.last_name,
+        "email": lambda worker: worker.email,
+        "position": lambda worker: worker.position_id,
+        "date_joined": lambda worker: isoformat(worker.date_joined),
+        "updated_at": lambda worker: isoformat(worker.updated_at),
+    }
+
+
+class WorkerApiListView(WorkerResource, ApiListView):
+    def get_queryset(self):
+        queryset = self.get_base_queryset()
+        form = WorkerUsernameSearchForm(self.request.GET)
+        if form.is_valid() and form.cleaned_data["username"]:
+            queryset = search(queryset, form.cleaned_data["username"])
+        return queryset
+
+
+class WorkerApiDetailView(WorkerResource, ApiDetailView):
+    pass
+
+
+class TaskTypeResource(ApiResource):
+    model = TaskType
+    fields = {
+        "id": lambda task_type: task_type.pk,
+        "name": lambda task_type: task_type.name,
+        "created_at": lambda task_type: isoformat(task_type.created_at),
+        "updated_at": lambda task_type: isoformat(task_type.updated_at),
+    }
+
+
+class TaskTypeApiListView(TaskTypeResource, ApiListView):
+    pass
+
+
+class TaskTypeApiDetailView(TaskTypeResource, ApiDetailView):
+    pass
+
+
+class PositionResource(ApiResource):
+    model = Position
+    fields = {
+        "id": lambda position: position.pk,
+        "name": lambda position: position.name,
+        "created_at": lambda position: isoformat(position.created_at),
+        "updated_at": lambda position: isoformat(position.updated_at),
+    }
+
+
+class PositionApiListView(PositionResource, ApiListView):
+    pass
+
+
+class PositionApiDetailView(PositionResource, ApiDetailView):
+    pass
+
+
+class ChangesApiView(LoginRequiredMixin, generic.View):
+    raise_exception = True
+    http_method_names = ["get", "head", "options"]
+    resources = [PositionResource, TaskTypeResource, WorkerResource, TaskResource]
+    page_size = 500
+    max_page_size = 2000
+
+    def get(self, request, *args, **kwargs):
+        try:
+            limit = max(1, min(int(request.GET.get("limit", self.page_size)), self.max_page_size))
+        except ValueError:
+            return JsonResponse({"detail": "limit must be an integer"}, status=400)
+        try:
+            changes, cursor, has_more = changes_since(
+                [resource() for resource in self.resources], request.GET.get("since"), limit
+            )
+        except InvalidWatermark:
+            return JsonResponse({"detail": "Invalid since cursor"}, status=400)
+        return JsonResponse({"changes": changes, "cursor": cursor, "has_more": has_more})
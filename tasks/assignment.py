@@ -0,0 +1,133 @@
+import heapq
+from collections import defaultdict, namedtuple
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from tasks.models import PositionFit, Task, Worker, WorkerDeadlineDay
+
+Suggestion = namedtuple("Suggestion", ["worker_id", "username", "score", "open_tasks", "load", "clustered", "fit"])
+
+
+def compute_position_fit():
+    """
+    {task_type_id: {position_id: share}}: the share of each position's
+    completed assignments that were of that task type.
+    """
+    rows = (
+        Task.assignees.through.objects.filter(task__is_completed=True, worker__position__isnull=False)
+        .values_list("task__task_type_id", "worker__position_id")
+        .annotate(count=Count("*"))
+        .order_by()
+    )
+    by_type = defaultdict(dict)
+    totals = defaultdict(int)
+    for task_type_id, position_id, count in rows:
+        by_type[task_type_id][position_id] = count
+        totals[position_id] += count
+    return {
+        task_type_id: {position_id: count / totals[position_id] for position_id, count in positions.items()}
+        for task_type_id, positions in by_type.items()
+    }
+
+
+@transaction.atomic
+def refresh_position_fit():
+    """
+    Store compute_position_fit() in PositionFit. History changes slowly and
+    the aggregate scans every completed assignment, so the recount job runs
+    this rather than the requests that read it. Returns the number of rows.
+    """
+    fit = compute_position_fit()
+    PositionFit.objects.all().delete()
+    PositionFit.objects.bulk_create([
+        PositionFit(task_type_id=task_type_id, position_id=position_id, share=share)
+        for task_type_id, positions in fit.items()
+        for position_id, share in positions.items()
+    ])
+    return sum(len(positions) for positions in fit.values())
+
+
+def get_position_fit(task_type_id):
+    """{position_id: share} for one task type, as of the last refresh_position_fit()."""
+    return dict(PositionFit.objects.filter(task_type_id=task_type_id).values_list("position_id", "share"))
+
+
+class AssignmentEngine:
+    """
+    Ranks active workers for a new task; lower scores are better::
+
+        score = open_weight * open tasks
+              + load_weight * open tasks weighted by priority (Worker.open_load)
+              + cluster_weight * open tasks due within cluster_days of the deadline
+              - fit_weight * position fit for the task type
+
+    Everything comes from the maintained counters and deadline days
+    (tasks.counters) and the stored position fit, in four queries however
+    many workers there are. The best ``count`` are picked with a bounded
+    heap over plain numbers; only their usernames are loaded.
+    """
+
+    open_weight = 1.0
+    load_weight = 0.5
+    cluster_weight = 2.0
+    fit_weight = 5.0
+    cluster_days = 2
+
+    def window_load(self, deadline):
+        """{worker_id: open tasks due within cluster_days of the deadline}."""
+        day = timezone.localdate(deadline)
+        window = (day - timedelta(days=self.cluster_days), day + timedelta(days=self.cluster_days))
+        # One grouped range scan over worker_deadline_day_idx; a correlated SUM
+        # per worker costs a subquery for each of thousands of workers.
+        return dict(
+            WorkerDeadlineDay.objects.filter(day__range=window)
+            .values_list("worker_id")
+            .annotate(total=Sum("open_count"))
+            .order_by()
+        )
+
+    def candidates(self):
+        return (
+            Worker.objects.filter(is_active=True)
+            .values_list("pk", "position_id", "open_task_count", "open_load")
+            .order_by()
+        )
+
+    def score(self, open_tasks, load, clustered, fit):
+        return (
+            self.open_weight * open_tasks
+            + self.load_weight * load
+            + self.cluster_weight * clustered
+            - self.fit_weight * fit
+        )
+
+    def suggest(self, task_type_id, deadline, count=3, exclude=()):
+        fit_by_position = get_position_fit(task_type_id)
+        clustered = self.window_load(deadline)
+        exclude = set(exclude)
+        # score() inlined with local weights: this loop runs once per active worker.
+        open_weight, load_weight = self.open_weight, self.load_weight
+        cluster_weight, fit_weight = self.cluster_weight, self.fit_weight
+        best = heapq.nsmallest(count, (
+            (
+                open_weight * open_tasks + load_weight * load + cluster_weight * clustered.get(pk, 0)
+                - fit_weight * fit_by_position.get(position_id, 0.0),
+                pk, position_id, open_tasks, load,
+            )
+            for pk, position_id, open_tasks, load in self.candidates()
+            if pk not in exclude
+        ))
+        if not best:
+            return []
+        usernames = dict(Worker.objects.filter(pk__in=[row[1] for row in best]).values_list("pk", "username"))
+        return [
+            Suggestion(
+                pk, usernames[pk], score, open_tasks, load, clustered.get(pk, 0), fit_by_position.get(position_id, 0.0)
+            )
+            for score, pk, position_id, open_tasks, load in best
+            # Skip a worker deleted since the candidates were read.
+            if pk in usernames
+        ]
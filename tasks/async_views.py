@@ -0,0 +1,103 @@
+import asyncio
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.mixins import AccessMixin
+from django.http import Http404
+from django.views import generic
+
+from tasks.analytics import aget_task_trend
+from tasks.audit import task_history
+from tasks.deadlines import atask_type_deadline_buckets, aworker_deadline_buckets
+from tasks.forms import TaskBulkActionForm, TaskNameSearchForm, TaskStatusFilterForm
+from tasks.models import Task
+from tasks.pagination import CursorPaginationMixin
+from tasks.stats import aget_dashboard_stats
+from tasks.views import TaskFilterMixin, worker_task_paginator
+
+
+class AsyncLoginRequiredMixin(AccessMixin):
+    """LoginRequiredMixin for async views: resolves the user with ``auser()``."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        # Cache the resolved user so templates and handle_no_permission()
+        # don't trigger a synchronous session lookup.
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
+        return await super().dispatch(request, *args, **kwargs)
+
+
+class AsyncTemplateView(generic.base.ContextMixin, generic.base.TemplateResponseMixin, generic.View):
+    pass
+
+
+class AsyncIndexView(AsyncTemplateView):
+    template_name = "tasks/index.html"
+
+    async def get(self, request, *args, **kwargs):
+        stats, upcoming, deadlines, trend = await asyncio.gather(
+            aget_dashboard_stats(),
+            aslice(Task.objects.upcoming(), 5),
+            atask_type_deadline_buckets(),
+            aget_task_trend(),
+        )
+        return self.render_to_response(self.get_context_data(
+            upcoming_deadlines=upcoming, task_trend=trend, **stats, **deadlines
+        ))
+
+
+class AsyncTaskListView(AsyncLoginRequiredMixin, TaskFilterMixin, CursorPaginationMixin, AsyncTemplateView):
+    model = Task
+    template_name = "tasks/task_list.html"
+    paginate_by = 5
+    page_kwarg = "page"
+
+    async def get(self, request, *args, **kwargs):
+        queryset = self.filter_tasks(Task.objects.for_list())
+        paginator, page, tasks, is_paginated = await self.apaginate_queryset(queryset, self.paginate_by)
+        return self.render_to_response(self.get_context_data(
+            paginator=paginator,
+            page_obj=page,
+            is_paginated=is_paginated,
+            object_list=tasks,
+            task_list=tasks,
+            search_form=TaskNameSearchForm(request.GET),
+            filter_form=TaskStatusFilterForm(request.GET),
+            bulk_form=TaskBulkActionForm(),
+        ))
+
+
+class AsyncTaskDetailView(AsyncLoginRequiredMixin, AsyncTemplateView):
+    template_name = "tasks/task_detail.html"
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            task = await Task.objects.for_list().aget(pk=kwargs["pk"])
+        except Task.DoesNotExist:
+            raise Http404("No task found.")
+        events = [event async for event in task_history(task.pk)]
+        return self.render_to_response(self.get_context_data(object=task, task=task, events=events))
+
+
+class AsyncWorkerDetailView(AsyncLoginRequiredMixin, AsyncTemplateView):
+    template_name = "tasks/worker_detail.html"
+
+    async def get(self, request, *args, **kwargs):
+        Worker = get_user_model()
+        try:
+            worker = await Worker.objects.select_related("position").aget(pk=kwargs["pk"])
+        except Worker.DoesNotExist:
+            raise Http404("No worker found.")
+        open_tasks, completed_tasks, deadline_buckets = await asyncio.gather(
+            worker_task_paginator(worker.pk, "open").apage(),
+            worker_task_paginator(worker.pk, "completed").apage(),
+            aworker_deadline_buckets(worker.pk),
+        )
+        return self.render_to_response(self.get_context_data(
+            object=worker, worker=worker, open_tasks=open_tasks, completed_tasks=completed_tasks,
+            deadline_buckets=deadline_buckets,
+        ))
+
+
+async def aslice(queryset, limit):
+    return [obj async for obj in queryset[:limit]]
@@ -0,0 +1,102 @@
+import threading
+from contextlib import contextmanager
+
+from django.db import transaction
+
+from tasks.models import TaskEvent
+
+TASK_HISTORY_SIZE = 20
+
+_buffer = threading.local()
+
+
+def task_history(task_id):
+    """The latest events of a task, newest first (served by task_event_task_idx)."""
+    return TaskEvent.objects.filter(task_id=task_id).select_related("actor", "worker")[:TASK_HISTORY_SIZE]
+
+
+def _actor_id():
+    actor = getattr(_buffer, "actor", None)
+    return actor.pk if actor is not None and actor.is_authenticated else None
+
+
+def record(events):
+    """Write events now, or at the end of the enclosing buffered_events() block."""
+    if not events:
+        return
+    pending = getattr(_buffer, "events", None)
+    if pending is None:
+        TaskEvent.objects.bulk_create(events)
+    else:
+        pending.extend(events)
+
+
+@contextmanager
+def buffered_events(actor=None):
+    """
+    Collect the events recorded in the block, attributed to ``actor``, and
+    bulk insert them at its end. The block runs in a transaction so the
+    events commit (or roll back) together with the changes they describe;
+    inside an outer transaction it joins it without a savepoint.
+    """
+    if getattr(_buffer, "events", None) is not None:
+        yield
+        return
+    _buffer.events = []
+    _buffer.actor = actor
+    try:
+        with transaction.atomic(savepoint=False):
+            yield
+            TaskEvent.objects.bulk_create(_buffer.events)
+    finally:
+        _buffer.events = None
+        _buffer.actor = None
+
+
+def event(task_id, kind, changes=None, worker_id=None):
+    changes = changes or {}
+    return TaskEvent(
+        task_id=task_id,
+        kind=kind,
+        changes=changes,
+        worker_id=worker_id,
+        actor_id=_actor_id(),
+        # Creations and completions feed the daily stats (tasks.analytics).
+        pending_rollup=kind == TaskEvent.Kind.CREATED or "is_completed" in changes,
+    )
+
+
+def record_save(task, created, update_fields=None):
+    values = task.audited_values(update_fields)
+    if created:
+        record([event(task.pk, TaskEvent.Kind.CREATED, values)])
+    else:
+        loaded = getattr(task, "_loaded_values", {})
+        changes = {
+            name: [loaded[name], value]
+            for name, value in values.items()
+            if name in loaded and loaded[name] != value
+        }
+        if changes:
+            record([event(task.pk, TaskEvent.Kind.UPDATED, changes)])
+
+
+def record_created(tasks):
+    record([event(task.pk, TaskEvent.Kind.CREATED, task.audited_values()) for task in tasks])
+
+
+def record_updates(old_values, field, new_value):
+    """One update event per ``(task_id, old value)`` pair whose value differs from ``new_value``."""
+    record([
+        event(task_id, TaskEvent.Kind.UPDATED, {field: [old_value, new_value]})
+        for task_id, old_value in old_values
+        if old_value != new_value
+    ])
+
+
+def record_deleted(task_ids):
+    record([event(task_id, TaskEvent.Kind.DELETED) for task_id in task_ids])
+
+
+def record_assignees(kind, pairs):
+    record([event(task_id, kind, worker_id=worker_id) for task_id, worker_id in pairs])
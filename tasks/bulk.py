@@ -0,0 +1,82 @@
+from django.db import transaction
+from django.utils import timezone
+
+from tasks import audit
+from tasks.capacity import invalidate_capacity_report
+from tasks.counters import recount_for_tasks, recount_task_types, recount_workers
+from tasks.models import Task, TaskEvent
+from tasks.signals import deferred_delete_side_effects
+from tasks.stats import invalidate_dashboard_stats
+
+
+def _task_ids(tasks):
+    return list(tasks.values_list("pk", flat=True)) if hasattr(tasks, "values_list") else list(tasks)
+
+
+@transaction.atomic
+def complete_tasks(tasks):
+    task_ids = _task_ids(tasks)
+    audit.record_updates(
+        Task.objects.filter(pk__in=task_ids).values_list("pk", "is_completed"), "is_completed", True
+    )
+    updated = Task.objects.filter(pk__in=task_ids).update(is_completed=True, updated_at=timezone.now())
+    recount_for_tasks(task_ids)
+    transaction.on_commit(invalidate_dashboard_stats)
+    transaction.on_commit(invalidate_capacity_report)
+    return updated
+
+
+@transaction.atomic
+def set_priority(tasks, priority):
+    task_ids = _task_ids(tasks)
+    audit.record_updates(Task.objects.filter(pk__in=task_ids).values_list("pk", "priority"), "priority", priority)
+    updated = Task.objects.filter(pk__in=task_ids).update(priority=priority, updated_at=timezone.now())
+    # Worker.open_load is priority-weighted.
+    recount_workers(Task.assignees.through.objects.filter(task_id__in=task_ids).values_list("worker_id", flat=True))
+    transaction.on_commit(invalidate_dashboard_stats)
+    transaction.on_commit(invalidate_capacity_report)
+    return updated
+
+
+@transaction.atomic
+def add_assignees(tasks, workers):
+    task_ids = _task_ids(tasks)
+    Through = Task.assignees.through
+    pairs = {(task_id, worker.pk) for task_id in task_ids for worker in workers}
+    pairs -= set(
+        Through.objects.filter(task_id__in=task_ids, worker_id__in=[worker.pk for worker in workers])
+        .values_list("task_id", "worker_id")
+    )
+    Through.objects.bulk_create(
+        [Through(task_id=task_id, worker_id=worker_id) for task_id, worker_id in pairs], ignore_conflicts=True
+    )
+    audit.record_assignees(TaskEvent.Kind.ASSIGNED, sorted(pairs))
+    recount_workers([worker.pk for worker in workers])
+    transaction.on_commit(invalidate_capacity_report)
+    return Task.objects.filter(pk__in=task_ids).update(updated_at=timezone.now())
+
+
+@transaction.atomic
+def remove_assignees(tasks, workers):
+    task_ids = _task_ids(tasks)
+    worker_ids = [worker.pk for worker in workers]
+    assignments = Task.assignees.through.objects.filter(task_id__in=task_ids, worker_id__in=worker_ids)
+    audit.record_assignees(TaskEvent.Kind.UNASSIGNED, list(assignments.values_list("task_id", "worker_id")))
+    assignments.delete()
+    recount_workers(worker_ids)
+    transaction.on_commit(invalidate_capacity_report)
+    return Task.objects.filter(pk__in=task_ids).update(updated_at=timezone.now())
+
+
+@transaction.atomic
+def delete_tasks(tasks):
+    task_ids = _task_ids(tasks)
+    worker_ids = list(
+        Task.assignees.through.objects.filter(task_id__in=task_ids).values_list("worker_id", flat=True).distinct()
+    )
+    task_type_ids = list(Task.objects.filter(pk__in=task_ids).values_list("task_type_id", flat=True).distinct())
+    with deferred_delete_side_effects():
+        deleted = Task.objects.filter(pk__in=task_ids).delete()[1]
+    recount_workers(worker_ids)
+    recount_task_types(task_type_ids)
+    return deleted.get(Task._meta.label, 0)
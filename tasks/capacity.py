@@ -0,0 +1,140 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, DateField, Value
+from django.db.models.functions import Greatest, Least, TruncWeek
+from django.utils import timezone
+
+from tasks.models import Task
+
+CAPACITY_REPORT_CACHE_KEY = "tasks:capacity-report"
+# Deadline week columns from the current week on; earlier and later weeks are folded into one column each.
+CAPACITY_WEEKS = 6
+
+
+def week_starts(today):
+    first = today - timedelta(days=today.weekday())
+    return [first + timedelta(weeks=n) for n in range(CAPACITY_WEEKS)]
+
+
+def _midnight(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _deadline_week(weeks):
+    earliest = _midnight(weeks[0] - timedelta(weeks=1))
+    latest = _midnight(weeks[-1] + timedelta(weeks=1))
+    deadline = Greatest(Least("task__deadline", Value(latest)), Value(earliest))
+    return TruncWeek(deadline, output_field=DateField())
+
+
+def capacity_rows(weeks):
+    """
+    Open assignments counted per worker, priority and deadline week: one
+    grouped query over the through table. Deadlines are clamped to the week
+    before ``weeks`` and the week after them first, so each worker has at
+    most len(weeks) + 2 week groups however far the deadlines spread.
+    """
+    return (
+        Task.assignees.through.objects.filter(task__is_completed=False)
+        .values_list("worker_id", "worker__username", "worker__position__name", "task__priority")
+        .annotate(week=_deadline_week(weeks), count=Count("*"))
+        .order_by()
+    )
+
+
+def position_rows(weeks):
+    """
+    Open tasks counted per position, priority and deadline week, grouped like
+    capacity_rows(). A task shared by workers of one position counts once.
+    """
+    return (
+        Task.assignees.through.objects.filter(task__is_completed=False)
+        .values_list("worker__position_id", "worker__position__name", "task__priority")
+        .annotate(week=_deadline_week(weeks), count=Count("task_id", distinct=True))
+        .order_by()
+    )
+
+
+def _entry(name, position=None):
+    return {
+        "name": name,
+        "position": position,
+        "total": 0,
+        "priorities": [0] * len(Task.PriorityChoices),
+        "weeks": [0] * (CAPACITY_WEEKS + 2),
+    }
+
+
+def _add(entry, priority_index, week_index, count):
+    entry["total"] += count
+    entry["priorities"][priority_index] += count
+    entry["weeks"][week_index] += count
+
+
+def _heat(entries, key):
+    # 0..1 shading per cell, relative to the busiest cell of the same table.
+    peak = max((count for entry in entries for count in entry[key]), default=0) or 1
+    for entry in entries:
+        entry[f"{key}_cells"] = [(count, round(count / peak, 2)) for count in entry[key]]
+
+
+def compute_capacity_report(today=None):
+    """
+    Open tasks per worker and per position, split by priority and by
+    deadline week. Week columns are "Earlier", the CAPACITY_WEEKS weeks
+    starting with the current one, then "Later".
+    """
+    weeks = week_starts(today or timezone.localdate())
+    # The rows report earlier deadlines as the week before, later ones as the week after.
+    columns = [weeks[0] - timedelta(weeks=1), *weeks, weeks[-1] + timedelta(weeks=1)]
+    week_index = {week: n for n, week in enumerate(columns)}
+    priority_index = {priority: n for n, priority in enumerate(Task.PriorityChoices.values)}
+
+    workers = {}
+    positions = {}
+    for worker_id, username, position_name, priority, week, count in capacity_rows(weeks):
+        if worker_id not in workers:
+            workers[worker_id] = dict(_entry(username, position_name), id=worker_id)
+        _add(workers[worker_id], priority_index[priority], week_index[week], count)
+    for position_id, position_name, priority, week, count in position_rows(weeks):
+        if position_id not in positions:
+            positions[position_id] = dict(_entry(position_name or "No position"), id=position_id)
+        _add(positions[position_id], priority_index[priority], week_index[week], count)
+
+    workers = sorted(workers.values(), key=lambda entry: (-entry["total"], entry["name"]))
+    positions = sorted(positions.values(), key=lambda entry: (-entry["total"], entry["name"]))
+    for entries in (workers, positions):
+        _heat(entries, "priorities")
+        _heat(entries, "weeks")
+    return {
+        "priorities": Task.PriorityChoices.labels,
+        "weeks": weeks,
+        "workers": workers,
+        "positions": positions,
+    }
+
+
+def _cache_key(today):
+    # Keyed by week so the columns roll over on Monday without an invalidation.
+    return f"{CAPACITY_REPORT_CACHE_KEY}:{week_starts(today)[0].isoformat()}"
+
+
+def get_capacity_report():
+    today = timezone.localdate()
+    return cache.get_or_set(
+        _cache_key(today), lambda: compute_capacity_report(today), settings.CAPACITY_REPORT_CACHE_TIMEOUT
+    )
+
+
+def invalidate_capacity_report():
+    cache.delete(_cache_key(timezone.localdate()))
+
+
+def iter_capacity_csv_rows(report):
+    week_labels = ["Earlier"] + [week.isoformat() for week in report["weeks"]] + ["Later"]
+    yield ["Level", "Name", "Position", "Open tasks"] + list(report["priorities"]) + week_labels
+    for level, entries in (("worker", report["workers"]), ("position", report["positions"])):
+        for entry in entries:
+            yield [level, entry["name"], entry["position"] or "", entry["total"], *entry["priorities"], *entry["weeks"]]
@@ -0,0 +1,274 @@
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from tasks.deadlines import apply_deadline_day_deltas, refresh_task_type_deadline_days, refresh_worker_deadline_days
+from tasks.models import Position, Task, TaskType, TaskTypeDeadlineDay, Worker, WorkerDeadlineDay
+
+Assignment = Task.assignees.through
+
+_deferred = threading.local()
+
+# How much an open task of each priority adds to Worker.open_load.
+PRIORITY_WEIGHTS = {
+    Task.PriorityChoices.URGENT: 4,
+    Task.PriorityChoices.HIGH: 3,
+    Task.PriorityChoices.MEDIUM: 2,
+    Task.PriorityChoices.LOW: 1,
+}
+
+
+def count_of(queryset, outer_field):
+    """Correlated COUNT(*) of ``queryset`` rows whose ``outer_field`` is the outer row."""
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{outer_field: OuterRef("pk")})
+            .order_by()
+            .values(outer_field)
+            .annotate(count=Count("*"))
+            .values("count"),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def priority_weight(field="priority"):
+    return Case(
+        *[When(**{field: priority}, then=Value(weight)) for priority, weight in PRIORITY_WEIGHTS.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def load_of(queryset, outer_field, task_prefix=""):
+    """Correlated SUM of PRIORITY_WEIGHTS over the open ``queryset`` rows whose ``outer_field`` is the outer row."""
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{outer_field: OuterRef("pk"), f"{task_prefix}is_completed": False})
+            .order_by()
+            .values(outer_field)
+            .annotate(load=Sum(priority_weight(f"{task_prefix}priority")))
+            .values("load"),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def task_counts(queryset, outer_field, task_prefix=""):
+    now = timezone.now()
+    return {
+        "open_task_count": count_of(queryset.filter(**{f"{task_prefix}is_completed": False}), outer_field),
+        "completed_task_count": count_of(queryset.filter(**{f"{task_prefix}is_completed": True}), outer_field),
+        "overdue_task_count": count_of(
+            queryset.filter(**{f"{task_prefix}is_completed": False, f"{task_prefix}deadline__lt": now}),
+            outer_field,
+        ),
+    }
+
+
+def _restrict(queryset, ids):
+    return queryset if ids is None else queryset.filter(pk__in=ids)
+
+
+def _evaluate(ids):
+    # Subquery ids are resolved once since both the counters and the deadline days use them.
+    return None if ids is None else {pk for pk in ids if pk is not None}
+
+
+def _defer(key, ids):
+    pending = getattr(_deferred, "ids", None)
+    if pending is None or ids is None:
+        return False
+    pending[key].update(ids)
+    return True
+
+
+@contextmanager
+def deferred_recounts():
+    """
+    Collect the worker and task type recounts requested inside the block
+    (e.g. by a task save followed by its assignee changes) and run each
+    once when the block exits.
+    """
+    if getattr(_deferred, "ids", None) is not None:
+        yield
+        return
+    _deferred.ids = {"workers": set(), "task_types": set()}
+    try:
+        yield
+        pending = _deferred.ids
+    finally:
+        _deferred.ids = None
+    recount_workers(pending["workers"])
+    recount_task_types(pending["task_types"])
+
+
+def recount_workers(ids=None):
+    ids = _evaluate(ids)
+    if ids is not None and not ids or _defer("workers", ids):
+        return 0
+    updated = _restrict(Worker.objects.all(), ids).update(
+        **task_counts(Assignment.objects.all(), "worker", task_prefix="task__"),
+        open_load=load_of(Assignment.objects.all(), "worker", task_prefix="task__"),
+    )
+    refresh_worker_deadline_days(ids)
+    return updated
+
+
+def recount_task_types(ids=None):
+    ids = _evaluate(ids)
+    if ids is not None and not ids or _defer("task_types", ids):
+        return 0
+    updated = _restrict(TaskType.objects.all(), ids).update(**task_counts(Task.objects.all(), "task_type"))
+    refresh_task_type_deadline_days(ids)
+    return updated
+
+
+def recount_positions(ids=None):
+    return _restrict(Position.objects.all(), ids).update(worker_count=count_of(Worker.objects.all(), "position"))
+
+
+def move_worker_position(old_position_id, new_position_id):
+    if old_position_id == new_position_id:
+        return
+    if old_position_id is not None:
+        apply_deltas(Position.objects.filter(pk=old_position_id), {"worker_count": -1})
+    if new_position_id is not None:
+        apply_deltas(Position.objects.filter(pk=new_position_id), {"worker_count": 1})
+
+
+def recount_for_tasks(task_ids):
+    """Refresh the counters that depend on the given tasks (a list or a pk subquery)."""
+    recount_workers(Assignment.objects.filter(task_id__in=task_ids).values_list("worker_id", flat=True))
+    recount_task_types(Task.objects.filter(pk__in=task_ids).values_list("task_type_id", flat=True))
+
+
+# The Task fields (by AUDITED_FIELDS name) a task's contribution to the counters depends on.
+COUNTED_FIELDS = ("is_completed", "deadline", "priority", "task_type")
+
+
+def normalize_state(values):
+    """Counted field values as the database holds them; unsaved instances may still carry strings."""
+    state = dict(values)
+    deadline = Task._meta.get_field("deadline").to_python(state["deadline"])
+    if timezone.is_naive(deadline):
+        deadline = timezone.make_aware(deadline)
+    state["deadline"] = deadline
+    state["is_completed"] = Task._meta.get_field("is_completed").to_python(state["is_completed"])
+    return state
+
+
+def counted_state(task):
+    """The counted fields of ``task`` as last loaded or saved, or None when some were never loaded."""
+    loaded = getattr(task, "_loaded_values", {})
+    if not all(name in loaded for name in COUNTED_FIELDS):
+        return None
+    return normalize_state({name: loaded[name] for name in COUNTED_FIELDS})
+
+
+def contribution(state, now):
+    """What one task in ``state`` adds to the counters of its task type and of each assignee."""
+    if state is None:
+        return Counter()
+    is_open = not state["is_completed"]
+    return Counter({
+        "open_task_count": int(is_open),
+        "completed_task_count": int(not is_open),
+        "overdue_task_count": int(is_open and state["deadline"] < now),
+        "open_load": PRIORITY_WEIGHTS.get(state["priority"], 0) if is_open else 0,
+    })
+
+
+def deadline_day_deltas(old, new):
+    """{(task_type_id, local deadline date): change} for moving one task from ``old`` to ``new``."""
+    deltas = Counter()
+    for state, sign in ((old, -1), (new, 1)):
+        if state is not None and not state["is_completed"]:
+            deltas[state["task_type"], timezone.localdate(state["deadline"])] += sign
+    return deltas
+
+
+def _worker_day_deltas(day_deltas, worker_ids):
+    deltas = Counter()
+    for (_, day), delta in day_deltas.items():
+        for worker_id in worker_ids:
+            deltas[worker_id, day] += delta
+    return deltas
+
+
+def _difference(new, old):
+    return {name: new[name] - old[name] for name in new.keys() | old.keys() if new[name] != old[name]}
+
+
+def apply_deltas(queryset, deltas):
+    """
+    Add ``deltas`` ({field: change}) to the counters of the matched rows in
+    one UPDATE. Counters never go below zero, so drift left by raw SQL or
+    passing deadlines cannot fail a save; `manage.py recount` repairs it.
+    """
+    if deltas:
+        queryset.update(**{name: Greatest(F(name) + delta, Value(0)) for name, delta in deltas.items()})
+
+
+def _task_type_deltas(old, new, now):
+    deltas = defaultdict(Counter)
+    if old is not None:
+        deltas[old["task_type"]].subtract(contribution(old, now))
+    if new is not None:
+        deltas[new["task_type"]].update(contribution(new, now))
+    return deltas
+
+
+def apply_task_change(old, new, worker_ids, now=None):
+    """
+    Move one task's contribution to the counters from state ``old`` to
+    ``new`` (None for a task that did not or no longer exists), for its
+    task type and for the workers in ``worker_ids``.
+    """
+    now = now or timezone.now()
+    for task_type_id, deltas in _task_type_deltas(old, new, now).items():
+        deltas.pop("open_load", None)
+        apply_deltas(TaskType.objects.filter(pk=task_type_id), _difference(deltas, Counter()))
+    worker_ids = _evaluate(worker_ids)
+    if worker_ids:
+        apply_deltas(
+            Worker.objects.filter(pk__in=worker_ids), _difference(contribution(new, now), contribution(old, now))
+        )
+    day_deltas = deadline_day_deltas(old, new)
+    apply_deadline_day_deltas(TaskTypeDeadlineDay, "task_type_id", day_deltas)
+    apply_deadline_day_deltas(WorkerDeadlineDay, "worker_id", _worker_day_deltas(day_deltas, worker_ids or ()))
+
+
+def apply_assignee_change(task_ids, worker_ids, added, now=None):
+    """Add (or with ``added`` false, remove) the contribution of each task to each worker's counters."""
+    now = now or timezone.now()
+    worker_ids = _evaluate(worker_ids)
+    if not task_ids or not worker_ids:
+        return
+    sign = 1 if added else -1
+    totals = Counter()
+    day_deltas = Counter()
+    states = Task.objects.filter(pk__in=task_ids).values_list(*(
+        "task_type_id" if name == "task_type" else name for name in COUNTED_FIELDS
+    ))
+    for values in states:
+        state = dict(zip(COUNTED_FIELDS, values))
+        totals.update(contribution(state, now))
+        day_deltas.update({key: delta * sign for key, delta in deadline_day_deltas(None, state).items()})
+    deltas = {name: count * sign for name, count in totals.items() if count}
+    apply_deltas(Worker.objects.filter(pk__in=worker_ids), deltas)
+    apply_deadline_day_deltas(WorkerDeadlineDay, "worker_id", _worker_day_deltas(day_deltas, worker_ids))
+
+
+def recount_all():
+    return {
+        "workers": recount_workers(),
+        "task_types": recount_task_types(),
+        "positions": recount_positions(),
+    }
@@ -0,0 +1,129 @@
+from datetime import timedelta
+
+from collections import defaultdict
+
+from django.db import connection
+from django.db.models import Count, F, Q, Sum, Value
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+
+from tasks.models import Task, TaskTypeDeadlineDay, WorkerDeadlineDay
+
+Assignment = Task.assignees.through
+
+BUCKETS = ("overdue", "today", "this_week", "later")
+
+
+def bucket_aggregates(today=None):
+    """SUM(open_count) per bucket over deadline-day rows, relative to ``today`` (local date)."""
+    today = today or timezone.localdate()
+    week_end = today + timedelta(days=7)
+    filters = {
+        "overdue": Q(day__lt=today),
+        "today": Q(day=today),
+        "this_week": Q(day__gt=today, day__lte=week_end),
+        "later": Q(day__gt=week_end),
+    }
+    return {bucket: Sum("open_count", filter=filters[bucket], default=0) for bucket in BUCKETS}
+
+
+def worker_deadline_buckets(worker_id, today=None):
+    return WorkerDeadlineDay.objects.filter(worker_id=worker_id).aggregate(**bucket_aggregates(today))
+
+
+async def aworker_deadline_buckets(worker_id, today=None):
+    return await WorkerDeadlineDay.objects.filter(worker_id=worker_id).aaggregate(**bucket_aggregates(today))
+
+
+def task_type_deadline_queryset(today=None):
+    return (
+        TaskTypeDeadlineDay.objects.values("task_type_id", "task_type__name")
+        .annotate(**bucket_aggregates(today))
+        .order_by("task_type__name", "task_type_id")
+    )
+
+
+def summarize(rows):
+    """Per task type bucket rows plus their column totals (every open task has exactly one type)."""
+    rows = list(rows)
+    totals = {bucket: sum(row[bucket] for row in rows) for bucket in BUCKETS}
+    return {"task_type_deadlines": rows, "deadline_totals": totals}
+
+
+def task_type_deadline_buckets(today=None):
+    return summarize(task_type_deadline_queryset(today))
+
+
+async def atask_type_deadline_buckets(today=None):
+    return summarize([row async for row in task_type_deadline_queryset(today)])
+
+
+def _refresh(model, owner_field, source, task_prefix, ids):
+    rows = source.filter(**{f"{task_prefix}is_completed": False})
+    existing = model.objects.all()
+    if ids is not None:
+        ids = list(ids)
+        if not ids:
+            return
+        rows = rows.filter(**{f"{owner_field}__in": ids})
+        existing = existing.filter(**{f"{owner_field}__in": ids})
+    rows = (
+        rows.annotate(day=TruncDate(f"{task_prefix}deadline"))
+        .order_by()
+        .values(owner_field, "day")
+        .annotate(open_count=Count("*"))
+    )
+    existing.delete()
+    # INSERT ... SELECT keeps the grouped rows in the database, however many there are. A row
+    # upserted by a concurrent single-task change in between is overwritten rather than conflicting.
+    sql, params = rows.query.sql_with_params()
+    quote = connection.ops.quote_name
+    columns = ", ".join(quote(column) for column in (owner_field, "day", "open_count"))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {quote(model._meta.db_table)} ({columns}) {sql} "
+            f"ON CONFLICT ({quote(owner_field)}, {quote('day')}) DO UPDATE SET "
+            f"{quote('open_count')} = EXCLUDED.{quote('open_count')}",
+            params,
+        )
+
+
+def apply_deadline_day_deltas(model, owner_field, deltas):
+    """
+    Add ``deltas`` ({(owner_id, day): change}) to the open counts. Increments
+    are upserted, so concurrent changes to the same owner and day add up
+    instead of colliding on the unique constraint; decrements floor at zero
+    and drop rows that reach it.
+    """
+    increments = [(owner_id, day, delta) for (owner_id, day), delta in deltas.items() if delta > 0]
+    if increments:
+        quote = connection.ops.quote_name
+        table = quote(model._meta.db_table)
+        owner, day, open_count = quote(owner_field), quote("day"), quote("open_count")
+        values = ", ".join(["(%s, %s, %s)"] * len(increments))
+        params = []
+        for owner_id, day_value, delta in increments:
+            params += [owner_id, connection.ops.adapt_datefield_value(day_value), delta]
+        add = f"{open_count} = {table}.{open_count} + EXCLUDED.{open_count}"
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} ({owner}, {day}, {open_count}) VALUES {values} "
+                f"ON CONFLICT ({owner}, {day}) DO UPDATE SET {add}",
+                params,
+            )
+    decrements = defaultdict(Q)
+    for (owner_id, day_value), delta in deltas.items():
+        if delta < 0:
+            decrements[delta] |= Q(**{owner_field: owner_id, "day": day_value})
+    for delta, rows in decrements.items():
+        model.objects.filter(rows).update(open_count=Greatest(F("open_count") + delta, Value(0)))
+        model.objects.filter(rows, open_count=0).delete()
+
+
+def refresh_worker_deadline_days(ids=None):
+    """Rebuild the deadline-day rows of the given workers (all when ``ids`` is None)."""
+    _refresh(WorkerDeadlineDay, "worker_id", Assignment.objects.all(), "task__", ids)
+
+
+def refresh_task_type_deadline_days(ids=None):
+    _refresh(TaskTypeDeadlineDay, "task_type_id", Task.objects.all(), "", ids)
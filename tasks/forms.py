@@ -2,13 +2,22 @@ from django.contrib.auth import get_user_model
 from django import forms
 from django.contrib.auth.forms import UserCreationForm, UserChangeForm
 
-from tasks.models import Task, Worker
+from tasks.assignment import AssignmentEngine
+from tasks.models import Task, TaskType, Worker
+from tasks.search import search
+from tasks.widgets import WorkerAutocompleteWidget
 
 
 class TaskForm(forms.ModelForm):
     assignees = forms.ModelMultipleChoiceField(
-        queryset=get_user_model().objects.all(),
-        widget=forms.CheckboxSelectMultiple,
+        queryset=get_user_model().objects.select_related("position"),
+        widget=WorkerAutocompleteWidget,
+        required=False,
+    )
+    auto_assign = forms.BooleanField(
+        required=False,
+        label="Assign automatically",
+        help_text="Leave assignees empty to pick the best available worker for this task type and deadline.",
     )
     deadline = forms.DateTimeField(
         widget=forms.DateTimeInput(attrs={"type": "datetime-local"}),
@@ -17,7 +26,78 @@ class TaskForm(forms.ModelForm):
 
     class Meta:
         model = Task
-        fields = ["name", "description", "deadline", "priority", "task_type", "assignees", "is_completed"]
+        fields = [
+            "name", "description", "deadline", "priority", "task_type", "assignees", "auto_assign", "is_completed",
+        ]
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get("assignees") or "assignees" in self.errors:
+            return cleaned_data
+        if not cleaned_data.get("auto_assign"):
+            self.add_error("assignees", "Choose assignees or assign automatically.")
+        elif cleaned_data.get("task_type") and cleaned_data.get("deadline"):
+            suggestions = AssignmentEngine().suggest(cleaned_data["task_type"].pk, cleaned_data["deadline"], count=1)
+            if not suggestions:
+                self.add_error("auto_assign", "No active worker is available.")
+            else:
+                cleaned_data["assignees"] = get_user_model().objects.filter(pk=suggestions[0].worker_id)
+        return cleaned_data
+
+
+class AssigneeSuggestionForm(forms.Form):
+    task_type = forms.ModelChoiceField(queryset=TaskType.objects.all())
+    deadline = forms.DateTimeField(input_formats=["%Y-%m-%dT%H:%M"])
+
+
+class WorkerUsernamesField(forms.CharField):
+    def clean(self, value):
+        value = super().clean(value)
+        usernames = {name.strip() for name in value.split(",") if name.strip()}
+        workers = list(get_user_model().objects.filter(username__in=usernames))
+        missing = usernames - {worker.username for worker in workers}
+        if missing:
+            raise forms.ValidationError(f"Unknown workers: {', '.join(sorted(missing))}")
+        return workers
+
+
+class TaskBulkActionForm(forms.Form):
+    ACTION_CHOICES = (
+        ("complete", "Mark completed"),
+        ("priority", "Change priority"),
+        ("add_assignees", "Add assignees"),
+        ("remove_assignees", "Remove assignees"),
+        ("delete", "Delete"),
+    )
+    action = forms.ChoiceField(
+        choices=ACTION_CHOICES,
+        widget=forms.Select(attrs={"class": "form-control form-control-sm mr-2"}),
+    )
+    tasks = forms.ModelMultipleChoiceField(
+        queryset=Task.objects.all(),
+        widget=forms.MultipleHiddenInput,
+    )
+    priority = forms.ChoiceField(
+        choices=(("", "Priority"),) + tuple(Task.PriorityChoices.choices),
+        required=False,
+        widget=forms.Select(attrs={"class": "form-control form-control-sm mr-2"}),
+    )
+    assignees = WorkerUsernamesField(
+        required=False,
+        widget=forms.TextInput(attrs={
+            "class": "form-control form-control-sm mr-2",
+            "placeholder": "Usernames, comma-separated",
+        }),
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        action = cleaned_data.get("action")
+        if action == "priority" and not cleaned_data.get("priority"):
+            self.add_error("priority", "Choose a priority.")
+        if action in ("add_assignees", "remove_assignees") and not cleaned_data.get("assignees"):
+            self.add_error("assignees", "Enter at least one username.")
+        return cleaned_data
 
 
 class TaskNameSearchForm(forms.Form):
@@ -25,7 +105,7 @@ class TaskNameSearchForm(forms.Form):
         max_length=255,
         required=False,
         label="",
-        widget=forms.TextInput(attrs={"placeholder": "Search by task name"})
+        widget=forms.TextInput(attrs={"placeholder": "Search by name or description"})
     )
 
 
@@ -43,6 +123,25 @@ class TaskStatusFilterForm(forms.Form):
     )
 
 
+def filter_tasks(queryset, data):
+    """Apply the task list's name search and status filter from ``data`` (e.g. request.GET)."""
+    search_form = TaskNameSearchForm(data)
+    if search_form.is_valid():
+        name = search_form.cleaned_data["name"]
+        if name:
+            queryset = search(queryset, name)
+
+    status_form = TaskStatusFilterForm(data)
+    if status_form.is_valid():
+        status = status_form.cleaned_data["status"]
+        if status == "completed":
+            queryset = queryset.filter(is_completed=True)
+        elif status == "pending":
+            queryset = queryset.filter(is_completed=False)
+
+    return queryset
+
+
 class WorkerCreationForm(UserCreationForm):
     class Meta(UserCreationForm.Meta):
         model = Worker
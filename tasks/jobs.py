@@ -0,0 +1,321 @@
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from django.db.models import Count, Exists, F, Max, Min, OuterRef, Q, Sum
+from django.utils import timezone
+
+from tasks.analytics import roll_up_events
+from tasks.assignment import refresh_position_fit
+from tasks.counters import recount_all
+from tasks.forms import filter_tasks
+from tasks.metrics import labels
+from tasks.models import Job, Task, TaskEvent, TaskReminder
+from tasks.transfer import iter_task_rows, serialize_rows
+
+logger = logging.getLogger("tasks.jobs")
+
+handlers = {}
+
+
+def job_handler(kind):
+    """Register ``func(job)`` as the handler for jobs of ``kind``; its return value is stored as the result."""
+    def decorator(func):
+        handlers[kind] = func
+        return func
+    return decorator
+
+
+def enqueue(kind, payload=None, run_after=None, dedupe_key=None, created_by=None):
+    """
+    Queue a job. With a ``dedupe_key`` nothing is queued (and None is
+    returned) while another job with that key is queued or running.
+    """
+    if kind not in handlers:
+        raise ValueError(f"Unknown job kind: {kind!r}")
+    job = Job(
+        kind=kind,
+        payload=payload or {},
+        run_after=run_after or timezone.now(),
+        dedupe_key=dedupe_key,
+        created_by=created_by,
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+    )
+    if dedupe_key is None:
+        job.save()
+        return job
+    try:
+        with transaction.atomic():
+            job.save()
+    except IntegrityError:
+        return None
+    return job
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim(name):
+    """Lock the next runnable job and mark it running, or return None."""
+    now = timezone.now()
+    with transaction.atomic():
+        # SKIP LOCKED lets concurrent workers on Postgres pass over each other's rows;
+        # SQLite ignores FOR UPDATE, so the conditional UPDATE below settles races there.
+        job = (
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.Status.QUEUED, run_after__lte=now)
+            .order_by("run_after", "id")
+            .first()
+        )
+        if job is None:
+            return None
+        claimed = Job.objects.filter(pk=job.pk, status=Job.Status.QUEUED).update(
+            status=Job.Status.RUNNING, attempts=F("attempts") + 1, started_at=now, heartbeat_at=now, locked_by=name,
+        )
+    if not claimed:
+        return None
+    job.status, job.attempts, job.started_at, job.locked_by = Job.Status.RUNNING, job.attempts + 1, now, name
+    job.heartbeat_at = now
+    return job
+
+
+def touch_heartbeat(job):
+    Job.objects.filter(pk=job.pk, status=Job.Status.RUNNING, locked_by=job.locked_by).update(
+        heartbeat_at=timezone.now()
+    )
+
+
+@contextmanager
+def heartbeat(job):
+    """Refresh the job's heartbeat from a background thread while the block runs."""
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(settings.JOB_HEARTBEAT_SECONDS):
+                try:
+                    touch_heartbeat(job)
+                except DatabaseError:
+                    logger.warning("Heartbeat of job %s#%s failed", job.kind, job.pk, exc_info=True)
+        finally:
+            # The thread has its own connection; don't leave it open.
+            connection.close()
+
+    thread = threading.Thread(target=beat, name=f"job-{job.pk}-heartbeat", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _save(job, **fields):
+    for name, value in fields.items():
+        setattr(job, name, value)
+    Job.objects.filter(pk=job.pk).update(**fields)
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=settings.JOB_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0))
+
+
+def run(job):
+    """Run a claimed job in its own transaction; failures are retried with exponential backoff."""
+    started = time.perf_counter()
+    try:
+        handler = handlers.get(job.kind)
+        if handler is None:
+            raise LookupError(f"No handler for job kind {job.kind!r}")
+        with heartbeat(job), transaction.atomic():
+            result = handler(job)
+    except Exception:
+        duration = time.perf_counter() - started
+        now = timezone.now()
+        if job.attempts < job.max_attempts:
+            _save(
+                job, status=Job.Status.QUEUED, run_after=now + retry_delay(job.attempts),
+                locked_by="", last_error=traceback.format_exc(), duration=duration,
+            )
+        else:
+            _save(
+                job, status=Job.Status.FAILED, finished_at=now,
+                locked_by="", last_error=traceback.format_exc(), duration=duration,
+            )
+        logger.warning(
+            "Job %s#%s failed (attempt %d of %d, %.0f ms)",
+            job.kind, job.pk, job.attempts, job.max_attempts, duration * 1000, exc_info=True,
+        )
+        return False
+
+    duration = time.perf_counter() - started
+    _save(
+        job, status=Job.Status.DONE, result=result, finished_at=timezone.now(),
+        locked_by="", last_error="", duration=duration,
+    )
+    logger.info("Job %s#%s done in %.0f ms", job.kind, job.pk, duration * 1000)
+    return True
+
+
+def run_pending(name=None, limit=None):
+    """Run runnable jobs until the queue is empty or ``limit`` is reached; returns how many ran."""
+    name = name or worker_name()
+    count = 0
+    while limit is None or count < limit:
+        job = claim(name)
+        if job is None:
+            break
+        run(job)
+        count += 1
+    return count
+
+
+def requeue_stale():
+    """Put back jobs whose worker stopped sending heartbeats mid-run, or fail them once out of attempts."""
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=settings.JOB_TIMEOUT_SECONDS)
+    # Jobs claimed before heartbeats existed have none; fall back to their start.
+    stale = Job.objects.filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff), status=Job.Status.RUNNING
+    )
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.Status.FAILED, finished_at=now, locked_by="", last_error="Timed out",
+    )
+    requeued = stale.update(
+        status=Job.Status.QUEUED, run_after=now, locked_by="", last_error="Timed out; requeued",
+    )
+    return requeued + failed
+
+
+def schedule_periodic(now=None):
+    """Queue each of settings.PERIODIC_JOBS to run one interval after its last completion."""
+    now = now or timezone.now()
+    last_runs = dict(
+        Job.objects.filter(kind__in=settings.PERIODIC_JOBS, status=Job.Status.DONE)
+        .values_list("kind")
+        .annotate(last_finished=Max("finished_at"))
+        .order_by()
+    )
+    for kind, interval in settings.PERIODIC_JOBS.items():
+        last_finished = last_runs.get(kind)
+        run_after = max(now, last_finished + timedelta(seconds=interval)) if last_finished else now
+        enqueue(kind, run_after=run_after, dedupe_key=f"periodic:{kind}")
+
+
+def render_job_metrics():
+    """Prometheus text for the jobs table: one grouped query over retained jobs."""
+    now = timezone.now()
+    rows = (
+        Job.objects.values("kind", "status")
+        .annotate(count=Count("id"), seconds=Sum("duration"), oldest=Min("run_after"))
+        .order_by("kind", "status")
+    )
+    lines = [
+        "# HELP taskflow_jobs Retained background jobs, by kind and status.",
+        "# TYPE taskflow_jobs gauge",
+    ]
+    durations = []
+    lag = []
+    for row in rows:
+        lines.append(f"taskflow_jobs{{{labels(kind=row['kind'], status=row['status'])}}} {row['count']}")
+        if row["status"] == Job.Status.DONE:
+            durations.append((row["kind"], row["seconds"] or 0.0))
+        elif row["status"] == Job.Status.QUEUED:
+            lag.append((row["kind"], max((now - row["oldest"]).total_seconds(), 0.0)))
+    lines += [
+        "# HELP taskflow_job_seconds Time spent running retained completed jobs.",
+        "# TYPE taskflow_job_seconds gauge",
+    ]
+    lines += [f"taskflow_job_seconds{{{labels(kind=kind)}}} {seconds}" for kind, seconds in durations]
+    lines += [
+        "# HELP taskflow_job_queue_lag_seconds How long the oldest queued job has been runnable.",
+        "# TYPE taskflow_job_queue_lag_seconds gauge",
+    ]
+    lines += [f"taskflow_job_queue_lag_seconds{{{labels(kind=kind)}}} {seconds}" for kind, seconds in lag]
+    return "\n".join(lines) + "\n"
+
+
+@job_handler("send_deadline_reminders")
+def send_deadline_reminders(job):
+    now = timezone.now()
+    hours = job.payload.get("hours", settings.DEADLINE_REMINDER_HOURS)
+    Assignment = Task.assignees.through
+    due = (
+        Assignment.objects.filter(
+            task__is_completed=False, task__deadline__gt=now, task__deadline__lte=now + timedelta(hours=hours)
+        )
+        .exclude(Exists(TaskReminder.objects.filter(
+            task_id=OuterRef("task_id"), worker_id=OuterRef("worker_id"), deadline=OuterRef("task__deadline")
+        )))
+        .values_list("task_id", "worker_id", "task__deadline")
+    )
+    created = 0
+    batch = []
+    for task_id, worker_id, deadline in due.iterator(chunk_size=2000):
+        batch.append(TaskReminder(task_id=task_id, worker_id=worker_id, deadline=deadline))
+        if len(batch) >= 2000:
+            created += len(TaskReminder.objects.bulk_create(batch, ignore_conflicts=True))
+            batch = []
+    created += len(TaskReminder.objects.bulk_create(batch, ignore_conflicts=True))
+    return {"reminders": created}
+
+
+@job_handler("export_tasks")
+def export_tasks(job):
+    fmt = job.payload.get("format", "csv")
+    rows = iter_task_rows(filter_tasks(Task.objects.all(), job.payload.get("filters", {})))
+    count = 0
+
+    def counted(rows):
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield row
+
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as buffer:
+        for chunk in serialize_rows(counted(rows), fmt):
+            buffer.write(chunk.encode())
+        buffer.seek(0)
+        path = default_storage.save(f"exports/tasks-{job.pk}.{fmt}", File(buffer))
+    return {"path": path, "rows": count}
+
+
+@job_handler("recount")
+def recount(job):
+    return {**recount_all(), "position_fit": refresh_position_fit()}
+
+
+@job_handler("prune_jobs")
+def prune_jobs(job):
+    cutoff = timezone.now() - timedelta(days=settings.JOB_RETENTION_DAYS)
+    finished = Job.objects.filter(
+        Q(status=Job.Status.DONE) | Q(status=Job.Status.FAILED), finished_at__lt=cutoff
+    )
+    for result in finished.filter(kind="export_tasks", result__has_key="path").values_list("result", flat=True):
+        default_storage.delete(result["path"])
+    deleted, _ = finished.delete()
+    return {"deleted": deleted}
+
+
+@job_handler("prune_task_events")
+def prune_task_events(job):
+    # Run daily, so each run deletes about one day of history through the created_at index.
+    cutoff = timezone.now() - timedelta(days=job.payload.get("days", settings.TASK_EVENT_RETENTION_DAYS))
+    deleted, _ = TaskEvent.objects.filter(created_at__lt=cutoff).delete()
+    return {"deleted": deleted}
+
+
+@job_handler("rollup_analytics")
+def rollup_analytics(job):
+    return {"events": roll_up_events()}
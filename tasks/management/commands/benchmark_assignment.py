@@ -0,0 +1,71 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from tasks.assignment import AssignmentEngine, refresh_position_fit
+from tasks.models import TaskType, Worker
+from tasks.seeding import FixtureGenerator
+
+TARGET_MS = 50
+
+
+class Command(BaseCommand):
+    help = (
+        "Time AssignmentEngine.suggest() against a generated team (10,000 workers "
+        "by default) inside a transaction that is rolled back afterwards. Pass "
+        "--workers 0 to measure the existing data instead."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=10000)
+        parser.add_argument("--tasks", type=int, default=50000)
+        parser.add_argument("--assignees-per-task", type=int, default=3)
+        parser.add_argument("--runs", type=int, default=20)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options["workers"]:
+                self.stdout.write(f"Generating {options['workers']} workers and {options['tasks']} tasks...")
+                FixtureGenerator().run(
+                    workers=options["workers"],
+                    tasks=options["tasks"],
+                    assignees_per_task=options["assignees_per_task"],
+                )
+            self.benchmark(options["runs"])
+            transaction.set_rollback(True)
+
+    def benchmark(self, runs):
+        task_type_ids = list(TaskType.objects.values_list("pk", flat=True))
+        if not task_type_ids:
+            self.stderr.write("No task types to assign.")
+            return
+        # The recount job stores the position fit; requests only read it.
+        started = time.perf_counter()
+        refresh_position_fit()
+        fit_ms = (time.perf_counter() - started) * 1000
+
+        engine = AssignmentEngine()
+        now = timezone.now()
+        timings = []
+        for run in range(runs):
+            deadline = now + timedelta(days=run % 14)
+            started = time.perf_counter()
+            suggestions = engine.suggest(task_type_ids[run % len(task_type_ids)], deadline)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        p50 = statistics.median(timings)
+        style = self.style.SUCCESS if p50 < TARGET_MS else self.style.ERROR
+        self.stdout.write(f"{connection.vendor}: {Worker.objects.filter(is_active=True).count()} active workers")
+        self.stdout.write(f"position fit (recount job): {fit_ms:.1f} ms")
+        self.stdout.write(style(
+            f"suggest(): p50 {p50:.1f} ms, max {max(timings):.1f} ms over {runs} runs (target {TARGET_MS} ms)"
+        ))
+        for suggestion in suggestions:
+            self.stdout.write(
+                f"  {suggestion.username:<16} score {suggestion.score:>7.2f}  open {suggestion.open_tasks}  "
+                f"load {suggestion.load}  clustered {suggestion.clustered}  fit {suggestion.fit:.2f}"
+            )
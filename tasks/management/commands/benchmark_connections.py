@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connection
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure per-request database overhead with a new connection per "
+        "request, persistent connections, and the configured settings. Run it "
+        "against the production database settings to see the handshake cost."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200)
+
+    def handle(self, *args, **options):
+        settings_dict = connection.settings_dict
+        configured = {
+            "CONN_MAX_AGE": settings_dict["CONN_MAX_AGE"],
+            "CONN_HEALTH_CHECKS": settings_dict["CONN_HEALTH_CHECKS"],
+        }
+        pooled = bool(settings_dict.get("OPTIONS", {}).get("pool"))
+        setups = {
+            "new connection per request": {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False},
+            "persistent": {"CONN_MAX_AGE": None, "CONN_HEALTH_CHECKS": False},
+            "persistent + health checks": {"CONN_MAX_AGE": None, "CONN_HEALTH_CHECKS": True},
+            "as configured" + (" (pool)" if pooled else ""): configured,
+        }
+
+        results = {}
+        try:
+            for name, overrides in setups.items():
+                settings_dict.update(overrides)
+                results[name] = self.time_requests(options["iterations"])
+        finally:
+            settings_dict.update(configured)
+            connection.close()
+
+        baseline = results["new connection per request"]
+        self.stdout.write(f"{connection.vendor} {connection.settings_dict['NAME']}")
+        for name, duration in results.items():
+            self.stdout.write(f"{name:<32}{duration:>8.3f} ms/request  ({baseline - duration:+.3f} ms saved)")
+
+    def time_requests(self, iterations):
+        # Mirrors the connection handling Django does around each request.
+        connection.close()
+        started = time.perf_counter()
+        for _ in range(iterations):
+            request_started.send(sender=self.__class__)
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            request_finished.send(sender=self.__class__)
+        return (time.perf_counter() - started) * 1000 / iterations
@@ -0,0 +1,93 @@
+import copy
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory, override_settings
+
+from tasks.models import Task
+from tasks.views import IndexView, TaskListView, WorkerDetailView, WorkerListView
+
+CACHED_LOADERS = [
+    (
+        "django.template.loaders.cached.Loader",
+        [
+            "django.template.loaders.filesystem.Loader",
+            "django.template.loaders.app_directories.Loader",
+        ],
+    ),
+]
+UNCACHED_LOADERS = [
+    "django.template.loaders.filesystem.Loader",
+    "django.template.loaders.app_directories.Loader",
+]
+DUMMY_CACHE = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def templates_with_loaders(loaders):
+    templates = copy.deepcopy(settings.TEMPLATES)
+    templates[0]["APP_DIRS"] = False
+    templates[0]["OPTIONS"]["loaders"] = loaders
+    return templates
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure per-view render time with and without the cached template "
+        "loader and fragment caching, against the current database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50)
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.order_by("pk").first()
+        if user is None or not Task.objects.exists():
+            raise CommandError("Seed some workers and tasks first.")
+
+        views = {
+            "tasks:index": (IndexView.as_view(), {}),
+            "tasks:task-list": (TaskListView.as_view(), {}),
+            "tasks:worker-list": (WorkerListView.as_view(), {}),
+            "tasks:worker-detail": (WorkerDetailView.as_view(), {"pk": user.pk}),
+        }
+        setups = {
+            "baseline": (UNCACHED_LOADERS, DUMMY_CACHE),
+            "cached loader": (CACHED_LOADERS, DUMMY_CACHE),
+            "cached loader + fragments": (CACHED_LOADERS, LOCMEM_CACHE),
+        }
+
+        results = {}
+        for setup, (loaders, cache_settings) in setups.items():
+            with override_settings(TEMPLATES=templates_with_loaders(loaders), CACHES=cache_settings):
+                caches["default"].clear()
+                for name, (view, kwargs) in views.items():
+                    results[name, setup] = self.time_view(view, kwargs, user, options["iterations"])
+
+        header = f"{'view':<22}" + "".join(f"{setup:>28}" for setup in setups)
+        self.stdout.write(header)
+        for name in views:
+            baseline = results[name, "baseline"]
+            cells = "".join(
+                f"{results[name, setup]:>14.2f} ms ({(1 - results[name, setup] / baseline) * 100:>5.1f}%)"
+                for setup in setups
+            )
+            self.stdout.write(f"{name:<22}{cells}")
+
+    def time_view(self, view, kwargs, user, iterations):
+        factory = RequestFactory()
+
+        def render():
+            request = factory.get("/")
+            request.user = user
+            request.session = {}
+            view(request, **kwargs).render()
+
+        render()  # warm up loaders and caches
+        started = time.perf_counter()
+        for _ in range(iterations):
+            render()
+        return (time.perf_counter() - started) * 1000 / iterations
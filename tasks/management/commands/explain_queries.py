@@ -0,0 +1,83 @@
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.utils import timezone
+
+from tasks.analytics import TREND_DAYS, trend_rows
+from tasks.deadlines import bucket_aggregates, task_type_deadline_queryset
+from tasks.models import Task, Worker, WorkerDeadlineDay
+from tasks.views import WORKER_TASK_PAGE_SIZE, TaskListView, WorkerListView
+
+SEQUENTIAL_SCAN_PATTERNS = {
+    "postgresql": re.compile(r"Seq Scan on \"?(\w+)\"?"),
+    "sqlite": re.compile(r"\bSCAN (\w+)\s*$"),
+}
+
+
+def list_view_queryset(view_class, params=None):
+    view = view_class()
+    view.setup(RequestFactory().get("/", params or {}))
+    queryset = view.get_queryset()
+    return queryset[: view.get_paginate_by(queryset)]
+
+
+def get_view_querysets():
+    worker_id = Worker.objects.values_list("pk", flat=True).first() or 0
+    today = timezone.localdate()
+    return {
+        "tasks:index upcoming deadlines": Task.objects.upcoming()[:5],
+        "tasks:task-list": list_view_queryset(TaskListView),
+        "tasks:task-list status=completed": list_view_queryset(TaskListView, {"status": "completed"}),
+        "tasks:task-list status=pending": list_view_queryset(TaskListView, {"status": "pending"}),
+        "tasks:worker-list": list_view_queryset(WorkerListView),
+        "tasks:index deadline buckets": task_type_deadline_queryset(),
+        "tasks:index weekly trends": trend_rows(today - timedelta(days=TREND_DAYS), today),
+        "tasks:worker-detail open tasks": Task.objects.filter(
+            assignees=worker_id, is_completed=False
+        ).order_by("deadline", "id")[:WORKER_TASK_PAGE_SIZE + 1],
+        "tasks:worker-detail deadline buckets": WorkerDeadlineDay.objects.filter(worker_id=worker_id)
+        .values("worker_id").annotate(**bucket_aggregates()),
+    }
+
+
+def find_sequential_scans(plan, vendor=None):
+    pattern = SEQUENTIAL_SCAN_PATTERNS.get(vendor or connection.vendor)
+    if pattern is None:
+        return []
+    return [match.group(1) for match in map(pattern.search, plan.splitlines()) if match]
+
+
+class Command(BaseCommand):
+    help = "Run EXPLAIN for the querysets behind each list and dashboard view."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fail-on-seq-scan",
+            action="store_true",
+            help="Exit with an error if a plan sequentially scans one of the checked tables.",
+        )
+        parser.add_argument(
+            "--table",
+            action="append",
+            dest="tables",
+            help="Table to check for sequential scans (repeatable). Defaults to the task tables.",
+        )
+
+    def handle(self, *args, **options):
+        tables = set(options["tables"] or [Task._meta.db_table, Task.assignees.through._meta.db_table])
+        offenders = []
+
+        for name, queryset in get_view_querysets().items():
+            plan = queryset.explain()
+            scanned = [table for table in find_sequential_scans(plan) if table in tables]
+            style = self.style.ERROR if scanned else self.style.SUCCESS
+            self.stdout.write(style(f"== {name}"))
+            self.stdout.write(plan)
+            if scanned:
+                offenders.append(f"{name} ({', '.join(scanned)})")
+
+        if offenders and options["fail_on_seq_scan"]:
+            raise CommandError("Sequential scans found: " + "; ".join(offenders))
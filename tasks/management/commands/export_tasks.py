@@ -0,0 +1,37 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.transfer import FORMATS, iter_task_rows, serialize_rows
+
+
+class Command(BaseCommand):
+    help = "Stream all tasks to a CSV or JSONL file (use - for stdout)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=FORMATS, help="Defaults to the file extension.")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or Path(path).suffix.lstrip(".").lower()
+        if fmt not in FORMATS:
+            raise CommandError("Cannot infer the format, pass --format.")
+
+        self.exported = 0
+        rows = self.counted(iter_task_rows(chunk_size=options["chunk_size"]))
+        if path == "-":
+            # Through self.stdout, so call_command(stdout=...) captures it; the lines carry their own endings.
+            for line in serialize_rows(rows, fmt):
+                self.stdout.write(line, ending="")
+            return
+
+        with open(path, "w", newline="", encoding="utf-8") as stream:
+            stream.writelines(serialize_rows(rows, fmt))
+        self.stdout.write(self.style.SUCCESS(f"Exported {self.exported} tasks to {path}"))
+
+    def counted(self, rows):
+        for row in rows:
+            self.exported += 1
+            yield row
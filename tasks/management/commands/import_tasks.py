@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.transfer import FORMATS, TaskImporter, TaskImportError, read_rows
+
+
+class Command(BaseCommand):
+    help = "Import tasks from a CSV or JSONL file (use - for stdin)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=FORMATS, help="Defaults to the file extension.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Use bulk_create instead of COPY on PostgreSQL.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or Path(path).suffix.lstrip(".").lower()
+        if fmt not in FORMATS:
+            raise CommandError("Cannot infer the format, pass --format.")
+
+        importer = TaskImporter(
+            batch_size=options["batch_size"],
+            use_copy=False if options["no_copy"] else None,
+        )
+        stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+        try:
+            count = importer.run(read_rows(stream, fmt))
+        except TaskImportError as error:
+            raise CommandError(str(error))
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        self.stdout.write(self.style.SUCCESS(f"Imported {count} tasks"))
@@ -0,0 +1,107 @@
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from tasks.models import Task
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay GET requests against a running server (e.g. gunicorn) from a "
+        "pool of threads and report p50/p95/p99 latency per endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--username", required=True, help="Worker the requests are made as.")
+        parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint.")
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--timeout", type=float, default=30)
+        parser.add_argument(
+            "--async-views",
+            action="store_true",
+            help="Hit the /async/ variants instead, e.g. when the server runs task_flow.asgi.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options["username"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No worker named {options['username']!r}.")
+        task = Task.objects.order_by("pk").first()
+        if task is None:
+            raise CommandError("Seed some tasks first.")
+
+        cookie = f"{settings.SESSION_COOKIE_NAME}={self.create_session(user)}"
+        base_url = options["base_url"].rstrip("/")
+        if options["async_views"]:
+            endpoints = {
+                "tasks:async-index": reverse("tasks:async-index"),
+                "tasks:async-task-list": reverse("tasks:async-task-list"),
+                "tasks:async-task-list (search)": reverse("tasks:async-task-list") + "?name=fix",
+                "tasks:async-task-detail": reverse("tasks:async-task-detail", args=[task.pk]),
+                "tasks:async-worker-detail": reverse("tasks:async-worker-detail", args=[user.pk]),
+            }
+        else:
+            endpoints = {
+                "tasks:index": reverse("tasks:index"),
+                "tasks:task-list": reverse("tasks:task-list"),
+                "tasks:task-list (search)": reverse("tasks:task-list") + "?name=fix",
+                "tasks:task-detail": reverse("tasks:task-detail", args=[task.pk]),
+                "tasks:worker-list": reverse("tasks:worker-list"),
+                "tasks:worker-detail": reverse("tasks:worker-detail", args=[user.pk]),
+                "tasks:worker-autocomplete": reverse("tasks:worker-autocomplete") + "?q=work",
+                "tasks:api-task-list": reverse("tasks:api-task-list"),
+                "tasks:api-changes": reverse("tasks:api-changes"),
+            }
+
+        self.stdout.write(f"{'endpoint':<34}{'ok':>6}{'err':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'rps':>8}")
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            for name, path in endpoints.items():
+                url = base_url + path
+                started = time.perf_counter()
+                results = list(pool.map(
+                    lambda _: self.fetch(url, cookie, options["timeout"]), range(options["requests"])
+                ))
+                elapsed = time.perf_counter() - started
+                self.report(name, results, elapsed)
+
+    def create_session(self, user):
+        # Mirrors what Client.force_login stores, so no password is needed.
+        session = import_module(settings.SESSION_ENGINE).SessionStore()
+        session[SESSION_KEY] = user._meta.pk.value_to_string(user)
+        session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.save()
+        return session.session_key
+
+    def fetch(self, url, cookie, timeout):
+        request = urllib.request.Request(url, headers={"Cookie": cookie})
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                response.read()
+                ok = response.status < 400
+        except (urllib.error.URLError, TimeoutError):
+            ok = False
+        return ok, (time.perf_counter() - started) * 1000
+
+    def report(self, name, results, elapsed):
+        latencies = sorted(duration for ok, duration in results if ok)
+        errors = len(results) - len(latencies)
+        if len(latencies) < 2:
+            self.stdout.write(self.style.ERROR(f"{name:<34}{len(latencies):>6}{errors:>6}"))
+            return
+        cuts = statistics.quantiles(latencies, n=100)
+        self.stdout.write(
+            f"{name:<34}{len(latencies):>6}{errors:>6}"
+            f"{cuts[49]:>10.1f}{cuts[94]:>10.1f}{cuts[98]:>10.1f}{len(results) / elapsed:>8.1f}"
+        )
@@ -0,0 +1,18 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = "Delete tombstones older than the retention window. Sync clients must poll more often than this."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=90)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} tombstones"))
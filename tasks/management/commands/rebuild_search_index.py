@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tasks.search import get_search_backend, get_searchable_models
+
+
+class Command(BaseCommand):
+    help = "Rebuild the search index for tasks and workers, e.g. after bulk loads that skip signals."
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        for model in get_searchable_models():
+            with transaction.atomic():
+                backend.rebuild(model)
+            self.stdout.write(f"Rebuilt search index for {model._meta.label}")
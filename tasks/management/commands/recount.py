@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tasks.assignment import refresh_position_fit
+from tasks.counters import recount_all
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the maintained task counters on workers, task types and positions, "
+        "and the position fit used for auto-assignment. "
+        "Run periodically (e.g. hourly) so overdue counts follow passing deadlines, "
+        "and after any raw SQL that bypasses the signals."
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            counts = recount_all()
+            fit_rows = refresh_position_fit()
+        summary = ", ".join(f"{count} {name.replace('_', ' ')}" for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Recounted {summary}; stored {fit_rows} position fit rows"))
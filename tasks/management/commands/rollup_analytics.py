@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from tasks.analytics import rebuild_daily_stats, roll_up_events
+
+
+class Command(BaseCommand):
+    help = (
+        "Add the task events recorded since the last run to the daily analytics rollups and "
+        "refresh today's overdue snapshot. The worker runs this periodically; the first run "
+        "(or --rebuild) computes the rollups from the existing tasks instead."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild", action="store_true", help="Recompute all rollups from the tasks instead of the new events."
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            rebuild_daily_stats()
+            self.stdout.write(self.style.SUCCESS("Rebuilt the daily task stats"))
+            return
+        processed = roll_up_events()
+        self.stdout.write(self.style.SUCCESS(f"Rolled up {processed} task events"))
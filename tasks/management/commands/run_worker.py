@@ -0,0 +1,62 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from tasks.jobs import claim, requeue_stale, run, schedule_periodic, worker_name
+
+MAINTENANCE_INTERVAL = 60
+
+
+class Command(BaseCommand):
+    help = (
+        "Claim and run background jobs until stopped (SIGTERM/SIGINT finish the current job first). "
+        "Also requeues orphaned jobs and schedules the periodic ones from settings.PERIODIC_JOBS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit once no job is runnable, e.g. from cron.")
+        parser.add_argument("--sleep", type=float, default=1.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument("--max-jobs", type=int, help="Exit after running this many jobs.")
+        parser.add_argument("--no-schedule", action="store_true", help="Do not queue the periodic jobs.")
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        previous = {signum: signal.signal(signum, self.stop) for signum in (signal.SIGTERM, signal.SIGINT)}
+        try:
+            processed = self.work(options)
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+        self.stdout.write(f"Processed {processed} job(s)")
+
+    def work(self, options):
+        name = worker_name()
+        processed = 0
+        last_maintenance = None
+        while not self.stopping:
+            close_old_connections()
+            if last_maintenance is None or time.monotonic() - last_maintenance >= MAINTENANCE_INTERVAL:
+                requeue_stale()
+                if not options["no_schedule"]:
+                    schedule_periodic()
+                last_maintenance = time.monotonic()
+
+            job = claim(name)
+            if job is None:
+                if options["once"]:
+                    break
+                time.sleep(options["sleep"])
+                continue
+
+            ok = run(job)
+            processed += 1
+            style = self.style.SUCCESS if ok else self.style.ERROR
+            self.stdout.write(style(f"{job.kind}#{job.pk} {job.status} in {job.duration * 1000:.0f} ms"))
+            if options["max_jobs"] and processed >= options["max_jobs"]:
+                break
+        return processed
+
+    def stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,51 @@
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.seeding import FixtureGenerator
+
+
+class Command(BaseCommand):
+    help = "Fill the database with generated positions, task types, workers and tasks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--positions", type=int, default=10)
+        parser.add_argument("--task-types", type=int, default=10)
+        parser.add_argument("--workers", type=int, default=1000)
+        parser.add_argument("--tasks", type=int, default=100000)
+        parser.add_argument("--assignees-per-task", type=int, default=3)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=0, help="Random seed, for reproducible data.")
+        parser.add_argument(
+            "--password",
+            help="Password shared by every generated worker; hashed once. Workers cannot log in without it.",
+        )
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Use INSERT instead of COPY on PostgreSQL.",
+        )
+
+    def handle(self, *args, **options):
+        if options["tasks"] and not options["task_types"]:
+            raise CommandError("Tasks need at least one task type.")
+
+        generator = FixtureGenerator(
+            batch_size=options["batch_size"],
+            seed=options["seed"],
+            password_hash=make_password(options["password"]),
+            use_copy=False if options["no_copy"] else None,
+        )
+        started = time.perf_counter()
+        counts = generator.run(
+            positions=options["positions"],
+            task_types=options["task_types"],
+            workers=options["workers"],
+            tasks=options["tasks"],
+            assignees_per_task=options["assignees_per_task"],
+        )
+        elapsed = time.perf_counter() - started
+
+        summary = ", ".join(f"{count} {name.replace('_', ' ')}" for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Created {summary} in {elapsed:.1f}s"))
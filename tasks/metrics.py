@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNRESOLVED_VIEW = "<unresolved>"
+
+# The recorder of the request being handled. A context variable rather than
+# a thread-local so queries run through sync_to_async in async views still
+# land on the request that issued them.
+current_recorder = ContextVar("current_query_recorder", default=None)
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.queries = []
+
+    @property
+    def total_seconds(self):
+        return sum(duration for duration, _ in self.queries)
+
+    def slowest(self, count):
+        return sorted(self.queries, key=lambda query: query[0], reverse=True)[:count]
+
+
+def record_query(execute, sql, params, many, context):
+    recorder = current_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        recorder.queries.append((time.perf_counter() - started, sql))
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class ViewMetrics:
+    def __init__(self):
+        self.requests = defaultdict(int)
+        self.latency_buckets = [0] * len(LATENCY_BUCKETS)
+        self.latency_sum = 0.0
+        self.latency_count = 0
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.template_seconds = 0.0
+
+
+class MetricsRegistry:
+    """
+    Per-process request metrics keyed by resolved URL name. Every gunicorn
+    worker keeps its own registry, so scrape each worker or sum in the query.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = defaultdict(ViewMetrics)
+
+    def record(self, view, method, status, duration, queries, query_seconds, template_seconds):
+        with self.lock:
+            metrics = self.views[view]
+            metrics.requests[method, status] += 1
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if duration <= bound:
+                    metrics.latency_buckets[index] += 1
+            metrics.latency_sum += duration
+            metrics.latency_count += 1
+            metrics.queries += queries
+            metrics.query_seconds += query_seconds
+            metrics.template_seconds += template_seconds
+
+    def reset(self):
+        with self.lock:
+            self.views.clear()
+
+    def render(self):
+        with self.lock:
+            views = sorted(self.views.items())
+            lines = [
+                "# HELP taskflow_requests_total Requests handled, by view, method and status.",
+                "# TYPE taskflow_requests_total counter",
+            ]
+            for view, metrics in views:
+                for (method, status), count in sorted(metrics.requests.items()):
+                    lines.append(
+                        f"taskflow_requests_total{{{labels(view=view, method=method, status=status)}}} {count}"
+                    )
+
+            lines += [
+                "# HELP taskflow_request_duration_seconds Time spent producing the response.",
+                "# TYPE taskflow_request_duration_seconds histogram",
+            ]
+            for view, metrics in views:
+                for bound, count in zip(LATENCY_BUCKETS, metrics.latency_buckets):
+                    lines.append(
+                        f"taskflow_request_duration_seconds_bucket{{{labels(view=view, le=bound)}}} {count}"
+                    )
+                lines += [
+                    f"taskflow_request_duration_seconds_bucket{{{labels(view=view, le='+Inf')}}} "
+                    f"{metrics.latency_count}",
+                    f"taskflow_request_duration_seconds_sum{{{labels(view=view)}}} {metrics.latency_sum}",
+                    f"taskflow_request_duration_seconds_count{{{labels(view=view)}}} {metrics.latency_count}",
+                ]
+
+            for name, attribute, help_text in (
+                ("taskflow_db_queries_total", "queries", "SQL queries executed."),
+                ("taskflow_db_query_seconds_total", "query_seconds", "Time spent executing SQL."),
+                ("taskflow_template_render_seconds_total", "template_seconds", "Time spent rendering templates."),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                for view, metrics in views:
+                    lines.append(f"{name}{{{labels(view=view)}}} {getattr(metrics, attribute)}")
+        return "\n".join(lines) + "\n"
+
+
+def labels(**values):
+    return ",".join(f'{key}="{escape_label(value)}"' for key, value in values.items())
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,115 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from tasks.metrics import UNRESOLVED_VIEW, QueryRecorder, current_recorder, registry
+
+logger = logging.getLogger("tasks.requests")
+
+
+class RequestMetricsMiddleware:
+    """
+    Records latency, SQL count and time, and template render time per URL
+    name. Queries are timed by an execute wrapper installed on every
+    connection, so this works with DEBUG off and under both WSGI and ASGI;
+    rendering is timed between ``process_template_response`` and the
+    response's post-render callback.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        recorder, token, started = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_recorder.reset(token)
+        self.finish(request, response, recorder, started)
+        return response
+
+    async def __acall__(self, request):
+        recorder, token, started = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_recorder.reset(token)
+        self.finish(request, response, recorder, started)
+        return response
+
+    def start(self, request):
+        recorder = QueryRecorder()
+        request._template_seconds = 0.0
+        return recorder, current_recorder.set(recorder), time.perf_counter()
+
+    def finish(self, request, response, recorder, started):
+        duration = time.perf_counter() - started
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else UNRESOLVED_VIEW
+        registry.record(
+            view, request.method, response.status_code, duration,
+            len(recorder.queries), recorder.total_seconds, request._template_seconds,
+        )
+        if duration * 1000 >= settings.SLOW_REQUEST_THRESHOLD_MS:
+            self.log_slow_request(request, view, duration, recorder)
+
+    def process_template_response(self, request, response):
+        started = time.perf_counter()
+
+        def record_render_time(rendered):
+            request._template_seconds += time.perf_counter() - started
+
+        response.add_post_render_callback(record_render_time)
+        return response
+
+    def log_slow_request(self, request, view, duration, recorder):
+        top_queries = "".join(
+            f"\n  {query_duration * 1000:.1f} ms  {sql}"
+            for query_duration, sql in recorder.slowest(settings.SLOW_REQUEST_TOP_QUERIES)
+        )
+        logger.warning(
+            "Slow request %s %s (%s): %.0f ms, %d queries in %.0f ms, templates %.0f ms%s",
+            request.method, request.get_full_path(), view, duration * 1000,
+            len(recorder.queries), recorder.total_seconds * 1000, request._template_seconds * 1000,
+            top_queries,
+        )
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise is sync-only, which makes Django run the whole ASGI middleware
+    chain through a thread. Non-static requests only need a dict lookup, so
+    pass those straight to the async chain and serve files in a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.6 on 2026-10-18 03:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="position",
+            options={
+                "ordering": ["name"],
+                "verbose_name": "Position",
+                "verbose_name_plural": "Positions",
+            },
+        ),
+        migrations.AlterModelOptions(
+            name="task",
+            options={
+                "ordering": ["deadline", "priority"],
+                "verbose_name": "Task",
+                "verbose_name_plural": "Tasks",
+            },
+        ),
+        migrations.AlterModelOptions(
+            name="tasktype",
+            options={
+                "ordering": ["name"],
+                "verbose_name": "Task Type",
+                "verbose_name_plural": "Task Types",
+            },
+        ),
+        migrations.AlterModelOptions(
+            name="worker",
+            options={
+                "ordering": ["username"],
+                "verbose_name": "Worker",
+                "verbose_name_plural": "Workers",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["deadline", "priority", "id"], name="task_ordering_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["is_completed", "deadline", "priority"],
+                name="task_status_deadline_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("is_completed", False)),
+                fields=["deadline", "priority"],
+                name="task_open_deadline_idx",
+            ),
+        ),
+    ]
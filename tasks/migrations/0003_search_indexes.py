@@ -0,0 +1,51 @@
+import sqlite3
+
+from django.db import migrations
+
+SEARCH_TABLES = {
+    "tasks_task": ("name", "description"),
+    "tasks_worker": ("username", "first_name", "last_name", "email"),
+}
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for table, fields in SEARCH_TABLES.items():
+            for field in fields:
+                schema_editor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {table}_{field}_trgm "
+                    f"ON {table} USING gin (UPPER({field}) gin_trgm_ops)"
+                )
+    elif vendor == "sqlite" and sqlite3.sqlite_version_info >= (3, 34, 0):
+        for table, fields in SEARCH_TABLES.items():
+            columns = ", ".join(fields)
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts "
+                f"USING fts5({columns}, tokenize='trigram')"
+            )
+            schema_editor.execute(
+                f"INSERT INTO {table}_fts (rowid, {columns}) SELECT id, {columns} FROM {table}"
+            )
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for table, fields in SEARCH_TABLES.items():
+        if vendor == "postgresql":
+            for field in fields:
+                schema_editor.execute(f"DROP INDEX IF EXISTS {table}_{field}_trgm")
+        elif vendor == "sqlite":
+            schema_editor.execute(f"DROP TABLE IF EXISTS {table}_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0002_task_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
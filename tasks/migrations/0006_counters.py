@@ -0,0 +1,98 @@
+# Generated by Django 5.2.6 on 2026-10-18 03:50
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def count_of(queryset, outer_field):
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{outer_field: OuterRef("pk")})
+            .order_by()
+            .values(outer_field)
+            .annotate(count=Count("*"))
+            .values("count"),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def populate_counters(apps, schema_editor):
+    Position = apps.get_model("tasks", "Position")
+    Task = apps.get_model("tasks", "Task")
+    TaskType = apps.get_model("tasks", "TaskType")
+    Worker = apps.get_model("tasks", "Worker")
+    Assignment = Task.assignees.through
+    now = timezone.now()
+
+    Worker.objects.update(
+        open_task_count=count_of(
+            Assignment.objects.filter(task__is_completed=False), "worker"
+        ),
+        completed_task_count=count_of(
+            Assignment.objects.filter(task__is_completed=True), "worker"
+        ),
+        overdue_task_count=count_of(
+            Assignment.objects.filter(task__is_completed=False, task__deadline__lt=now),
+            "worker",
+        ),
+    )
+    TaskType.objects.update(
+        open_task_count=count_of(Task.objects.filter(is_completed=False), "task_type"),
+        completed_task_count=count_of(
+            Task.objects.filter(is_completed=True), "task_type"
+        ),
+        overdue_task_count=count_of(
+            Task.objects.filter(is_completed=False, deadline__lt=now), "task_type"
+        ),
+    )
+    Position.objects.update(worker_count=count_of(Worker.objects.all(), "position"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0005_change_tracking"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="position",
+            name="worker_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="tasktype",
+            name="completed_task_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="tasktype",
+            name="open_task_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="tasktype",
+            name="overdue_task_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="worker",
+            name="completed_task_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="worker",
+            name="open_task_count",
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="worker",
+            name="overdue_task_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,105 @@
+# Generated by Django 5.2.6 on 2026-10-18 03:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def populate_deadline_days(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    WorkerDeadlineDay = apps.get_model("tasks", "WorkerDeadlineDay")
+    TaskTypeDeadlineDay = apps.get_model("tasks", "TaskTypeDeadlineDay")
+
+    for model, source, owner_field, task_prefix in (
+        (
+            WorkerDeadlineDay,
+            Task.assignees.through.objects.all(),
+            "worker_id",
+            "task__",
+        ),
+        (TaskTypeDeadlineDay, Task.objects.all(), "task_type_id", ""),
+    ):
+        rows = (
+            source.filter(**{f"{task_prefix}is_completed": False})
+            .annotate(day=TruncDate(f"{task_prefix}deadline"))
+            .order_by()
+            .values(owner_field, "day")
+            .annotate(open_count=Count("*"))
+        )
+        model.objects.bulk_create([model(**row) for row in rows], batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0006_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskTypeDeadlineDay",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("open_count", models.PositiveIntegerField(default=0)),
+                (
+                    "task_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="deadline_days",
+                        to="tasks.tasktype",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("task_type", "day"),
+                        name="unique_task_type_deadline_day",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="WorkerDeadlineDay",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("open_count", models.PositiveIntegerField(default=0)),
+                (
+                    "worker",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="deadline_days",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("worker", "day"), name="unique_worker_deadline_day"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_deadline_days, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:13
+
+from django.db import migrations, models
+from django.db.models import Case, IntegerField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+PRIORITY_WEIGHTS = {"Urgent": 4, "High": 3, "Medium": 2, "Low": 1}
+
+
+def populate_open_load(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    Worker = apps.get_model("tasks", "Worker")
+    weight = Case(
+        *[
+            When(task__priority=priority, then=Value(weight))
+            for priority, weight in PRIORITY_WEIGHTS.items()
+        ],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    Worker.objects.update(
+        open_load=Coalesce(
+            Subquery(
+                Task.assignees.through.objects.filter(
+                    worker=OuterRef("pk"), task__is_completed=False
+                )
+                .order_by()
+                .values("worker")
+                .annotate(load=Sum(weight))
+                .values("load"),
+                output_field=IntegerField(),
+            ),
+            Value(0),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0008_jobs"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="worker",
+            name="open_load",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_open_load, migrations.RunPython.noop),
+    ]
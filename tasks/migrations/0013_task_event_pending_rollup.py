@@ -0,0 +1,45 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:02
+
+from django.db import migrations, models
+from django.db.models import Q
+
+
+def flag_unprocessed_events(apps, schema_editor):
+    # Events past the old watermark have not been counted yet.
+    RollupWatermark = apps.get_model("tasks", "RollupWatermark")
+    TaskEvent = apps.get_model("tasks", "TaskEvent")
+    watermark = RollupWatermark.objects.filter(name="daily-task-stats").first()
+    if watermark is None:
+        return
+    TaskEvent.objects.filter(
+        Q(kind="created") | Q(kind="updated", changes__has_key="is_completed"),
+        id__gt=watermark.last_event_id,
+    ).update(pending_rollup=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0012_job_heartbeat"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="taskevent",
+            name="pending_rollup",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(flag_unprocessed_events, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="rollupwatermark",
+            name="last_event_id",
+        ),
+        migrations.AddIndex(
+            model_name="taskevent",
+            index=models.Index(
+                condition=models.Q(("pending_rollup", True)),
+                fields=["id"],
+                name="task_event_pending_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.6 on 2026-10-18 05:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0013_task_event_pending_rollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PositionFit",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("share", models.FloatField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="workerdeadlineday",
+            index=models.Index(
+                fields=["day", "worker", "open_count"], name="worker_deadline_day_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="positionfit",
+            name="position",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="tasks.position",
+            ),
+        ),
+        migrations.AddField(
+            model_name="positionfit",
+            name="task_type",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="tasks.tasktype",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="positionfit",
+            constraint=models.UniqueConstraint(
+                fields=("task_type", "position"), name="unique_position_fit"
+            ),
+        ),
+    ]
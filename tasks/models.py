@@ -1,10 +1,17 @@
+from datetime import timedelta
+
 from django.contrib.auth.models import AbstractUser
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 
 
 class Position(models.Model):
     name = models.CharField(max_length=63)
+    worker_count = models.PositiveIntegerField(default=0, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ["name"]
@@ -23,6 +30,14 @@ class Worker(AbstractUser):
         null=True,
         blank=True
     )
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Maintained by tasks.counters; overdue_task_count drifts as deadlines
+    # pass and is refreshed by `manage.py recount`.
+    open_task_count = models.PositiveIntegerField(default=0, editable=False, db_index=True)
+    completed_task_count = models.PositiveIntegerField(default=0, editable=False)
+    overdue_task_count = models.PositiveIntegerField(default=0, editable=False)
+    # Open tasks weighted by priority (tasks.counters.PRIORITY_WEIGHTS).
+    open_load = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ["username"]
@@ -32,12 +47,24 @@ class Worker(AbstractUser):
     def __str__(self):
         return f"{self.username} ({self.position})" if self.position else self.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if "position_id" in instance.__dict__:
+            instance._loaded_position_id = instance.position_id
+        return instance
+
     def get_absolute_url(self):
         return reverse("tasks:worker-detail", kwargs={"pk": self.pk})
 
 
 class TaskType(models.Model):
     name = models.CharField(max_length=255)
+    open_task_count = models.PositiveIntegerField(default=0, editable=False)
+    completed_task_count = models.PositiveIntegerField(default=0, editable=False)
+    overdue_task_count = models.PositiveIntegerField(default=0, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ["name"]
@@ -48,6 +75,26 @@ class TaskType(models.Model):
         return self.name
 
 
+class TaskQuerySet(models.QuerySet):
+    def for_list(self):
+        return self.select_related("task_type").prefetch_related(
+            models.Prefetch(
+                "assignees",
+                queryset=Worker.objects.select_related("position").only(
+                    "id", "username", "position__name"
+                ),
+            )
+        )
+
+    def upcoming(self, days=7):
+        today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        return self.filter(
+            is_completed=False,
+            deadline__gte=today,
+            deadline__lte=today + timedelta(days=days)
+        ).order_by("deadline")
+
+
 class Task(models.Model):
     class PriorityChoices(models.TextChoices):
         URGENT = "Urgent", "Urgent"
@@ -74,11 +121,318 @@ class Task(models.Model):
         Worker,
         related_name="assigned_tasks"
     )
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = TaskQuerySet.as_manager()
 
     class Meta:
         ordering = ["deadline", "priority"]
+        indexes = [
+            models.Index(fields=["deadline", "priority", "id"], name="task_ordering_idx"),
+            models.Index(fields=["is_completed", "deadline", "priority"], name="task_status_deadline_idx"),
+            models.Index(
+                fields=["deadline", "priority"],
+                condition=models.Q(is_completed=False),
+                name="task_open_deadline_idx",
+            ),
+        ]
         verbose_name = "Task"
         verbose_name_plural = "Tasks"
 
+    # Changes to these fields are recorded as TaskEvents (tasks.audit).
+    AUDITED_FIELDS = {
+        "name": "name",
+        "description": "description",
+        "deadline": "deadline",
+        "priority": "priority",
+        "task_type": "task_type_id",
+        "is_completed": "is_completed",
+    }
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = instance.audited_values()
+        return instance
+
     def __str__(self):
         return f"{self.name} [{self.priority}]"
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # post_save receivers (audit diffs, counter deltas) have seen the previous values by now.
+        saved = self.audited_values(kwargs.get("update_fields"))
+        self._loaded_values = {**getattr(self, "_loaded_values", {}), **saved}
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._loaded_values = {**getattr(self, "_loaded_values", {}), **self.audited_values(fields)}
+
+    def audited_values(self, fields=None):
+        """
+        AUDITED_FIELDS values by name, limited to ``fields`` (names or
+        attnames) when given. Deferred fields are left out rather than loaded.
+        """
+        return {
+            name: self.__dict__[attname]
+            for name, attname in self.AUDITED_FIELDS.items()
+            if attname in self.__dict__ and (fields is None or name in fields or attname in fields)
+        }
+
+
+class Tombstone(models.Model):
+    model = models.CharField(max_length=63)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["deleted_at", "id"]
+        verbose_name = "Tombstone"
+        verbose_name_plural = "Tombstones"
+
+    def __str__(self):
+        return f"{self.model}#{self.object_id}"
+
+
+class DeadlineDay(models.Model):
+    """
+    Open tasks per local deadline date, maintained by tasks.counters. Rows
+    never go stale as time passes; tasks.deadlines sums them into
+    overdue/today/this week/later buckets relative to the current date.
+    """
+
+    day = models.DateField()
+    open_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class WorkerDeadlineDay(DeadlineDay):
+    worker = models.ForeignKey(Worker, on_delete=models.CASCADE, related_name="deadline_days")
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["worker", "day"], name="unique_worker_deadline_day")]
+        indexes = [
+            # Covers the per-worker sums over a range of days in tasks.assignment.
+            models.Index(fields=["day", "worker", "open_count"], name="worker_deadline_day_idx"),
+        ]
+
+
+class TaskTypeDeadlineDay(DeadlineDay):
+    task_type = models.ForeignKey(TaskType, on_delete=models.CASCADE, related_name="deadline_days")
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["task_type", "day"], name="unique_task_type_deadline_day")]
+
+
+class PositionFit(models.Model):
+    """
+    The share of a position's completed assignments that were of a task
+    type, refreshed with the counters by tasks.assignment.refresh_position_fit.
+    """
+
+    task_type = models.ForeignKey(TaskType, on_delete=models.CASCADE, related_name="+")
+    position = models.ForeignKey(Position, on_delete=models.CASCADE, related_name="+")
+    share = models.FloatField()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["task_type", "position"], name="unique_position_fit")]
+
+    def __str__(self):
+        return f"{self.position_id} fits {self.task_type_id}: {self.share:.2f}"
+
+
+class Job(models.Model):
+    """A unit of background work, claimed and run by `manage.py run_worker` (see tasks.jobs)."""
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    kind = models.CharField(max_length=63)
+    payload = models.JSONField(default=dict, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.QUEUED)
+    # At most one queued or running job per key, so periodic jobs are not stacked up.
+    dedupe_key = models.CharField(max_length=127, null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=127, blank=True)
+    last_error = models.TextField(blank=True)
+    created_by = models.ForeignKey(
+        Worker,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="jobs",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Refreshed by the worker while the job runs; running jobs with a stale heartbeat are requeued.
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    duration = models.FloatField(null=True, blank=True, help_text="Seconds spent in the last attempt.")
+
+    class Meta:
+        ordering = ["run_after", "id"]
+        indexes = [
+            models.Index(
+                fields=["run_after", "id"],
+                condition=models.Q(status="queued"),
+                name="job_queued_idx",
+            ),
+            models.Index(fields=["kind", "status"], name="job_kind_status_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dedupe_key"],
+                condition=models.Q(status__in=["queued", "running"]),
+                name="unique_pending_job",
+            ),
+        ]
+        verbose_name = "Job"
+        verbose_name_plural = "Jobs"
+
+    def __str__(self):
+        return f"{self.kind}#{self.pk} ({self.status})"
+
+
+class TaskReminder(models.Model):
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="reminders")
+    worker = models.ForeignKey(Worker, on_delete=models.CASCADE, related_name="reminders")
+    # The deadline reminded about; moving the deadline makes the task due for a new reminder.
+    deadline = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["-created_at", "id"]
+        constraints = [
+            models.UniqueConstraint(fields=["task", "worker", "deadline"], name="unique_task_reminder"),
+        ]
+        verbose_name = "Task reminder"
+        verbose_name_plural = "Task reminders"
+
+    def __str__(self):
+        return f"{self.worker} - {self.task} ({self.deadline:%Y-%m-%d %H:%M})"
+
+
+class TaskEvent(models.Model):
+    """
+    Append-only task history written by tasks.audit. ``changes`` holds only
+    what changed: {field: [old, new]} for updates, {field: value} for new
+    tasks. Task and worker keys carry no database constraint so events
+    outlive the rows they describe.
+    """
+
+    class Kind(models.TextChoices):
+        CREATED = "created", "Created"
+        UPDATED = "updated", "Updated"
+        DELETED = "deleted", "Deleted"
+        ASSIGNED = "assigned", "Assigned"
+        UNASSIGNED = "unassigned", "Unassigned"
+
+    task = models.ForeignKey(
+        Task, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, related_name="events"
+    )
+    kind = models.CharField(max_length=15, choices=Kind.choices)
+    # The worker assigned or unassigned.
+    worker = models.ForeignKey(
+        Worker,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        blank=True,
+        related_name="task_events",
+    )
+    # Who made the change, when known.
+    actor = models.ForeignKey(
+        Worker,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    changes = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    # Set on creations and completion changes until tasks.analytics has counted them.
+    pending_rollup = models.BooleanField(default=False)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["task", "created_at"], name="task_event_task_idx"),
+            models.Index(
+                fields=["worker", "created_at"],
+                condition=models.Q(worker__isnull=False),
+                name="task_event_worker_idx",
+            ),
+            models.Index(fields=["id"], condition=models.Q(pending_rollup=True), name="task_event_pending_idx"),
+        ]
+        verbose_name = "Task event"
+        verbose_name_plural = "Task events"
+
+    def __str__(self):
+        return f"{self.get_kind_display()} task #{self.task_id} at {self.created_at:%Y-%m-%d %H:%M}"
+
+    def changed_fields(self):
+        """(field, old, new) triples for update events."""
+        if self.kind != self.Kind.UPDATED:
+            return []
+        return [(field, old, new) for field, (old, new) in self.changes.items()]
+
+
+class DailyTaskStat(models.Model):
+    """
+    Tasks created, completed and overdue per local day and priority,
+    rolled up from TaskEvent by tasks.analytics so trend charts never scan
+    Task. ``overdue`` is a snapshot taken by the latest rollup of that day.
+    """
+
+    day = models.DateField(db_index=True)
+    priority = models.CharField(max_length=10, choices=Task.PriorityChoices.choices)
+    created = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    overdue = models.PositiveIntegerField(default=0)
+    # Sum over the tasks completed that day; divide by ``completed`` for the average lead time.
+    lead_time = models.DurationField(default=timedelta)
+
+    class Meta:
+        abstract = True
+
+
+class TaskTypeDailyStat(DailyTaskStat):
+    task_type = models.ForeignKey(TaskType, on_delete=models.CASCADE, related_name="daily_stats")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["task_type", "day", "priority"], name="unique_task_type_daily_stat"),
+        ]
+
+
+class PositionDailyStat(DailyTaskStat):
+    """Tasks count once for each position among their assignees; unassigned tasks are left out."""
+
+    position = models.ForeignKey(Position, on_delete=models.CASCADE, related_name="daily_stats")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["position", "day", "priority"], name="unique_position_daily_stat"),
+        ]
+
+
+class RollupWatermark(models.Model):
+    """Marks a rollup as built; runs lock its row so only one counts the pending events at a time."""
+
+    name = models.CharField(max_length=63, unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.updated_at:%Y-%m-%d %H:%M}"
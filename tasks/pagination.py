@@ -0,0 +1,205 @@
+import asyncio
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage, Paginator
+from django.db.models import Q
+from django.http import Http404
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def default_cursor_ordering(model):
+    ordering = list(model._meta.ordering)
+    if not {"pk", "id", "-pk", "-id"} & set(ordering):
+        ordering.append("id")
+    return ordering
+
+
+class CursorPage:
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Keyset paginator: pages are addressed by the ordering values of a boundary row."""
+
+    def __init__(self, queryset, per_page, ordering):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = [self._normalize(field) for field in ordering]
+
+    def _normalize(self, field):
+        descending = field.startswith("-")
+        name = field.lstrip("-")
+        model_field = self.queryset.model._meta.get_field(
+            self.queryset.model._meta.pk.name if name == "pk" else name
+        )
+        return model_field, descending
+
+    def encode_cursor(self, obj, direction):
+        values = [getattr(obj, field.attname) for field, _ in self.ordering]
+        payload = json.dumps([direction, values], default=str)
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            direction, values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if direction not in ("next", "prev") or len(values) != len(self.ordering):
+                raise InvalidCursor(cursor)
+            values = [
+                field.to_python(value)
+                for (field, _), value in zip(self.ordering, values)
+            ]
+        except (ValueError, TypeError, binascii.Error, ValidationError):
+            raise InvalidCursor(cursor)
+        return direction, values
+
+    def _seek(self, values, backwards):
+        condition = Q()
+        equal = Q()
+        for (field, descending), value in zip(self.ordering, values):
+            lookup = "lt" if descending != backwards else "gt"
+            condition |= equal & Q(**{f"{field.attname}__{lookup}": value})
+            equal &= Q(**{field.attname: value})
+        return condition
+
+    def _order_by(self, backwards):
+        return [
+            f"{'-' if descending != backwards else ''}{field.attname}"
+            for field, descending in self.ordering
+        ]
+
+    def _page_queryset(self, cursor):
+        direction, values = self.decode_cursor(cursor) if cursor else ("next", None)
+        backwards = direction == "prev"
+
+        queryset = self.queryset.order_by(*self._order_by(backwards))
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, backwards))
+        return queryset[: self.per_page + 1], backwards, values is not None
+
+    def _build_page(self, rows, backwards, has_cursor):
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if backwards:
+            rows.reverse()
+
+        has_next = has_more if not backwards else True
+        has_previous = has_more if backwards else has_cursor
+        return CursorPage(
+            rows,
+            next_cursor=self.encode_cursor(rows[-1], "next") if rows and has_next else None,
+            previous_cursor=self.encode_cursor(rows[0], "prev") if rows and has_previous else None,
+        )
+
+    def page(self, cursor=None):
+        queryset, backwards, has_cursor = self._page_queryset(cursor)
+        return self._build_page(list(queryset), backwards, has_cursor)
+
+    async def apage(self, cursor=None):
+        queryset, backwards, has_cursor = self._page_queryset(cursor)
+        return self._build_page([obj async for obj in queryset], backwards, has_cursor)
+
+
+async def _alist(queryset):
+    return [obj async for obj in queryset]
+
+
+async def apaginate(queryset, per_page, page_number):
+    """
+    Async counterpart of ListView.paginate_queryset(). The count and the rows
+    of the requested page are fetched together and the number is checked
+    against the count afterwards; only "last" needs the count first.
+    """
+    paginator = Paginator(queryset, per_page)
+    if page_number == "last":
+        paginator.count = await queryset.acount()
+        page = paginator.page(paginator.num_pages)
+        page.object_list = await _alist(page.object_list)
+        return paginator, page
+    try:
+        number = int(page_number or 1)
+    except ValueError:
+        raise Http404("Invalid page.")
+    bottom = max(number - 1, 0) * per_page
+    paginator.count, object_list = await asyncio.gather(
+        queryset.acount(), _alist(queryset[bottom:bottom + per_page])
+    )
+    try:
+        page = paginator.page(number)
+    except InvalidPage:
+        raise Http404("Invalid page.")
+    page.object_list = object_list
+    return paginator, page
+
+
+class CursorPaginationMixin:
+    """
+    Opt-in keyset pagination for ListView subclasses.
+
+    Enabled per view with ``cursor_pagination = True`` or per request by
+    passing the ``cursor`` query parameter (empty for the first page).
+    """
+
+    cursor_pagination = False
+    cursor_param = "cursor"
+    cursor_ordering = None
+
+    def use_cursor_pagination(self):
+        return self.cursor_pagination or self.cursor_param in self.request.GET
+
+    def get_cursor_ordering(self):
+        if self.cursor_ordering is not None:
+            return self.cursor_ordering
+        return default_cursor_ordering(self.model)
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.use_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = CursorPaginator(queryset, page_size, self.get_cursor_ordering())
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_param))
+        except InvalidCursor:
+            raise Http404("Invalid cursor.")
+        return None, page, page.object_list, page.has_other_pages()
+
+    async def apaginate_queryset(self, queryset, page_size):
+        if not self.use_cursor_pagination():
+            paginator, page = await apaginate(queryset, page_size, self.request.GET.get(self.page_kwarg))
+            return paginator, page, page.object_list, page.has_other_pages()
+
+        paginator = CursorPaginator(queryset, page_size, self.get_cursor_ordering())
+        try:
+            page = await paginator.apage(self.request.GET.get(self.cursor_param))
+        except InvalidCursor:
+            raise Http404("Invalid cursor.")
+        return None, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["cursor_pagination"] = self.use_cursor_pagination()
+        return context
@@ -0,0 +1,116 @@
+import sqlite3
+from functools import reduce
+from operator import or_
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+SEARCH_FIELDS = {
+    "tasks.Task": ("name", "description"),
+    "tasks.Worker": ("username", "first_name", "last_name", "email"),
+}
+
+# The FTS5 trigram tokenizer needs at least three characters to match.
+TRIGRAM_MIN_LENGTH = 3
+
+
+def get_search_fields(model):
+    return SEARCH_FIELDS[model._meta.label]
+
+
+def get_searchable_models():
+    return [apps.get_model(label) for label in SEARCH_FIELDS]
+
+
+def fts_table_name(model):
+    return f"{model._meta.db_table}_fts"
+
+
+def sqlite_supports_trigram_fts():
+    return sqlite3.sqlite_version_info >= (3, 34, 0)
+
+
+class IContainsSearchBackend:
+    def search(self, queryset, term):
+        fields = get_search_fields(queryset.model)
+        return queryset.filter(reduce(or_, (Q(**{f"{field}__icontains": term}) for field in fields)))
+
+    def index_object(self, instance):
+        self.index_objects(type(instance), [instance])
+
+    def index_objects(self, model, objects):
+        pass
+
+    def remove_object(self, instance):
+        self.remove_objects(type(instance), [instance.pk])
+
+    def remove_objects(self, model, pks):
+        pass
+
+    def rebuild(self, model):
+        pass
+
+
+class PostgresTrigramSearchBackend(IContainsSearchBackend):
+    """
+    ``icontains`` compiles to ``UPPER(field) LIKE UPPER(%term%)``, which the
+    ``gin_trgm_ops`` indexes on ``UPPER(field)`` from the search migration can
+    serve directly, so no extra index maintenance is needed.
+    """
+
+
+class SQLiteFTSSearchBackend(IContainsSearchBackend):
+    """Searches an FTS5 trigram table per model, kept in sync by signals."""
+
+    def search(self, queryset, term):
+        if len(term) < TRIGRAM_MIN_LENGTH:
+            return super().search(queryset, term)
+        table = fts_table_name(queryset.model)
+        match = '"{}"'.format(term.replace('"', '""'))
+        return queryset.filter(
+            pk__in=RawSQL(f"SELECT rowid FROM {table} WHERE {table} MATCH %s", [match])
+        )
+
+    def index_objects(self, model, objects):
+        fields = get_search_fields(model)
+        table = fts_table_name(model)
+        rows = [[obj.pk, *(getattr(obj, field) or "" for field in fields)] for obj in objects]
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {table} WHERE rowid = %s", [row[:1] for row in rows])
+            cursor.executemany(
+                f"INSERT INTO {table} (rowid, {', '.join(fields)}) "
+                f"VALUES (%s, {', '.join(['%s'] * len(fields))})",
+                rows,
+            )
+
+    def remove_objects(self, model, pks):
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {fts_table_name(model)} WHERE rowid = %s", [[pk] for pk in pks])
+
+    def rebuild(self, model):
+        fields = ", ".join(get_search_fields(model))
+        table = fts_table_name(model)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table}")
+            cursor.execute(
+                f"INSERT INTO {table} (rowid, {fields}) "
+                f"SELECT id, {fields} FROM {model._meta.db_table}"
+            )
+
+
+def get_search_backend():
+    if settings.TASKS_SEARCH_BACKEND:
+        return import_string(settings.TASKS_SEARCH_BACKEND)()
+    if connection.vendor == "postgresql":
+        return PostgresTrigramSearchBackend()
+    if connection.vendor == "sqlite" and sqlite_supports_trigram_fts():
+        return SQLiteFTSSearchBackend()
+    return IContainsSearchBackend()
+
+
+def search(queryset, term):
+    return get_search_backend().search(queryset, term)
@@ -0,0 +1,302 @@
+import random
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from tasks.analytics import Rollup, add_untracked_tasks
+from tasks.capacity import invalidate_capacity_report
+from tasks.counters import PRIORITY_WEIGHTS, recount_positions
+from tasks.models import (
+    Position, PositionDailyStat, Task, TaskType, TaskTypeDailyStat, TaskTypeDeadlineDay, Worker, WorkerDeadlineDay,
+)
+from tasks.search import get_search_backend, get_searchable_models
+from tasks.stats import invalidate_dashboard_stats
+from tasks.transfer import copy_rows
+
+WORDS = (
+    "api billing cache checkout dashboard deploy export import invoice login "
+    "metrics migration mobile onboarding payments profile report search "
+    "session signup sync upload webhook"
+).split()
+VERBS = ("Fix", "Refactor", "Review", "Document", "Test", "Implement", "Investigate", "Optimize")
+
+# Above this many tasks, secondary indexes are dropped for the load and
+# rebuilt afterwards; one sorted build beats millions of random B-tree inserts.
+DEFER_INDEXES_THRESHOLD = 100000
+
+# The tables written with raw INSERTs (COPY on PostgreSQL).
+BULK_LOADED_MODELS = (Task, Task.assignees.through, WorkerDeadlineDay, TaskTypeDeadlineDay)
+
+# The counter columns tasks.counters maintains, per owner model.
+COUNTER_FIELDS = {
+    Worker: ("open_task_count", "completed_task_count", "overdue_task_count", "open_load"),
+    TaskType: ("open_task_count", "completed_task_count", "overdue_task_count"),
+}
+
+
+def get_secondary_index_definitions(cursor, table):
+    if connection.vendor == "sqlite":
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = %s "
+            "AND sql IS NOT NULL AND sql NOT LIKE 'CREATE UNIQUE%%'",
+            [table],
+        )
+    elif connection.vendor == "postgresql":
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s "
+            "AND indexdef NOT LIKE 'CREATE UNIQUE%%'",
+            [table],
+        )
+    else:
+        return []
+    return cursor.fetchall()
+
+
+@contextmanager
+def deferred_indexes(tables):
+    with connection.cursor() as cursor:
+        definitions = [
+            definition for table in tables for definition in get_secondary_index_definitions(cursor, table)
+        ]
+        for name, _ in definitions:
+            cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+    yield
+    with connection.cursor() as cursor:
+        for _, sql in definitions:
+            cursor.execute(sql)
+
+
+class SeedTotals:
+    """
+    What the generated tasks add to the counters, the deadline-day rows and
+    the daily stats, summed while the rows are generated. Tasks are counted
+    per worker, task type and position by their (priority, is_completed,
+    is_overdue) state, which is all their contribution depends on.
+    """
+
+    def __init__(self, worker_positions):
+        self.worker_positions = worker_positions
+        self.states = {Worker: defaultdict(int), TaskType: defaultdict(int), Position: defaultdict(int)}
+        self.days = {WorkerDeadlineDay: defaultdict(int), TaskTypeDeadlineDay: defaultdict(int)}
+
+    def add(self, task_type_id, worker_ids, state, deadline_day):
+        """Count one task; ``deadline_day`` is its local deadline date as adapted for the database."""
+        self.states[TaskType][task_type_id, state] += 1
+        workers = self.states[Worker]
+        for worker_id in worker_ids:
+            workers[worker_id, state] += 1
+        positions = self.states[Position]
+        for position_id in {self.worker_positions[worker_id] for worker_id in worker_ids}:
+            positions[position_id, state] += 1
+        _, is_completed, _ = state
+        if not is_completed:
+            self.days[TaskTypeDeadlineDay][task_type_id, deadline_day] += 1
+            worker_days = self.days[WorkerDeadlineDay]
+            for worker_id in worker_ids:
+                worker_days[worker_id, deadline_day] += 1
+
+    def counters(self, model):
+        """[[change per COUNTER_FIELDS[model]..., owner_id]] for the owners the tasks touched."""
+        totals = defaultdict(Counter)
+        for (owner_id, (priority, is_completed, is_overdue)), count in self.states[model].items():
+            owner = totals[owner_id]
+            owner["completed_task_count" if is_completed else "open_task_count"] += count
+            owner["overdue_task_count"] += count if is_overdue else 0
+            owner["open_load"] += 0 if is_completed else PRIORITY_WEIGHTS[priority] * count
+        return [[owner[name] for name in COUNTER_FIELDS[model]] + [owner_id] for owner_id, owner in totals.items()]
+
+    def rollup(self, day):
+        rollup = Rollup()
+        for model, owner_model in ((TaskTypeDailyStat, TaskType), (PositionDailyStat, Position)):
+            for (dimension_id, (priority, is_completed, is_overdue)), count in self.states[owner_model].items():
+                if dimension_id is None:
+                    continue
+                # Seeded tasks are created (and completed) at the same instant: lead time zero.
+                rollup.add(
+                    model, dimension_id, day, priority, created=count, completed=count if is_completed else 0,
+                    overdue=count if is_overdue else 0,
+                )
+        return rollup
+
+
+class FixtureGenerator:
+    """
+    Generates realistic volumes of positions, task types, workers and tasks
+    with bulk inserts. Tasks and their assignee rows are written one batch at
+    a time so memory stays flat however many tasks are requested. Workers
+    share one password hash, so no per-user PBKDF2 rounds are spent. The
+    tasks only go to workers and task types created by the same run, so
+    their counters are written from the generated values (SeedTotals)
+    rather than recounted from the tables.
+    """
+
+    def __init__(self, batch_size=5000, seed=0, password_hash=None, use_copy=None):
+        self.batch_size = batch_size
+        self.use_copy = connection.vendor == "postgresql" if use_copy is None else use_copy
+        self.random = random.Random(seed)
+        self.password_hash = password_hash or make_password(None)
+
+    def run(self, positions=10, task_types=10, workers=100, tasks=1000, assignees_per_task=3):
+        with transaction.atomic():
+            position_ids = self.create_positions(positions)
+            task_type_ids = self.create_task_types(task_types)
+            worker_positions = self.create_workers(workers, position_ids)
+            totals = SeedTotals(worker_positions)
+            if tasks >= DEFER_INDEXES_THRESHOLD:
+                self.tune_connection()
+                loading = deferred_indexes([model._meta.db_table for model in BULK_LOADED_MODELS])
+            else:
+                loading = nullcontext()
+            with loading:
+                task_count, assignment_count = self.create_tasks(
+                    tasks, task_type_ids, list(worker_positions), assignees_per_task, totals
+                )
+                self.write_totals(totals)
+            for model in get_searchable_models():
+                get_search_backend().rebuild(model)
+            recount_positions(position_ids)
+            # Seeded tasks bypass the audit trail, so their daily stats come from the totals.
+            add_untracked_tasks(totals.rollup(timezone.localdate()), task_count)
+        transaction.on_commit(invalidate_dashboard_stats)
+        transaction.on_commit(invalidate_capacity_report)
+        return {
+            "positions": len(position_ids),
+            "task_types": len(task_type_ids),
+            "workers": len(worker_positions),
+            "tasks": task_count,
+            "assignments": assignment_count,
+        }
+
+    def tune_connection(self):
+        if connection.vendor == "sqlite":
+            # Index builds and the search rebuild spill out of SQLite's 2 MB default page cache.
+            with connection.cursor() as cursor:
+                cursor.execute("PRAGMA cache_size = -262144")
+        elif connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL maintenance_work_mem = '256MB'")
+
+    def create_positions(self, count):
+        objs = Position.objects.bulk_create(
+            [Position(name=f"Position {n}") for n in range(1, count + 1)], batch_size=self.batch_size
+        )
+        return [obj.pk for obj in objs]
+
+    def create_task_types(self, count):
+        objs = TaskType.objects.bulk_create(
+            [TaskType(name=f"Type {n}") for n in range(1, count + 1)], batch_size=self.batch_size
+        )
+        return [obj.pk for obj in objs]
+
+    def create_workers(self, count, position_ids):
+        """Create ``count`` workers; returns {pk: position_id} in creation order."""
+        # Offset usernames past existing rows so repeated runs never collide.
+        offset = Worker.objects.aggregate(last=Max("pk"))["last"] or 0
+        now = timezone.now()
+        objs = Worker.objects.bulk_create(
+            [
+                Worker(
+                    username=f"worker{offset + n}",
+                    first_name=self.random.choice(WORDS).title(),
+                    last_name=self.random.choice(WORDS).title(),
+                    email=f"worker{offset + n}@example.com",
+                    password=self.password_hash,
+                    position_id=self.random.choice(position_ids) if position_ids else None,
+                    date_joined=now,
+                )
+                for n in range(1, count + 1)
+            ],
+            batch_size=self.batch_size,
+        )
+        return {obj.pk: obj.position_id for obj in objs}
+
+    def reserve_ids(self, cursor, table, count):
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)", [table, count]
+            )
+            return [pk for (pk,) in cursor.fetchall()]
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+        first = cursor.fetchone()[0] + 1
+        return range(first, first + count)
+
+    def insert_rows(self, cursor, table, columns, rows):
+        if self.use_copy:
+            copy_rows(cursor, table, columns, rows)
+        else:
+            placeholders = ", ".join(["%s"] * len(columns))
+            cursor.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+
+    def write_totals(self, totals):
+        """Add the counters summed in ``totals`` (one executemany or COPY per table)."""
+        with connection.cursor() as cursor:
+            for model, fields in COUNTER_FIELDS.items():
+                assignments = ", ".join(f"{name} = {name} + %s" for name in fields)
+                cursor.executemany(
+                    f"UPDATE {model._meta.db_table} SET {assignments} WHERE id = %s", totals.counters(model)
+                )
+            for model, owner_field in ((WorkerDeadlineDay, "worker_id"), (TaskTypeDeadlineDay, "task_type_id")):
+                # In key order, so the unique (owner, day) index is appended to rather than split.
+                rows = [[owner_id, day, count] for (owner_id, day), count in sorted(totals.days[model].items())]
+                self.insert_rows(cursor, model._meta.db_table, [owner_field, "day", "open_count"], rows)
+
+    def create_tasks(self, count, task_type_ids, worker_ids, assignees_per_task, totals):
+        # Rows go in as raw INSERTs (COPY on PostgreSQL) with ids reserved up
+        # front: building a model instance per task costs more than the write.
+        adapt = (lambda value: value.isoformat()) if self.use_copy else connection.ops.adapt_datetimefield_value
+        adapt_day = (lambda value: value.isoformat()) if self.use_copy else connection.ops.adapt_datefield_value
+        now = timezone.now()
+        timestamp = adapt(now)
+        hours = range(-24 * 90, 24 * 90)
+        deadlines = [adapt(now + timedelta(hours=hour)) for hour in hours]
+        deadline_days = [adapt_day(timezone.localdate(now + timedelta(hours=hour))) for hour in hours]
+        # Deadlines before this index are in the past.
+        due = hours.index(0)
+        names = [f"{verb} {word}" for verb in VERBS for word in WORDS]
+        descriptions = [f"{first.title()} work touching {second}." for first in WORDS for second in WORDS]
+        priorities = Task.PriorityChoices.values
+        fan_out = min(assignees_per_task, len(worker_ids))
+
+        rand = self.random.random
+        task_table = Task._meta.db_table
+        through_table = Task.assignees.through._meta.db_table
+        task_columns = [
+            "id", "name", "description", "deadline", "priority", "is_completed", "task_type_id",
+            "created_at", "updated_at",
+        ]
+        created = assigned = 0
+        with connection.cursor() as cursor:
+            while created < count:
+                size = min(self.batch_size, count - created)
+                task_rows = []
+                through_rows = []
+                for n, pk in enumerate(self.reserve_ids(cursor, task_table, size), start=created + 1):
+                    name = f"{names[int(rand() * len(names))]} {n}"
+                    description = descriptions[int(rand() * len(descriptions))]
+                    deadline = int(rand() * len(deadlines))
+                    priority = priorities[int(rand() * len(priorities))]
+                    is_completed = rand() < 0.3
+                    task_type_id = task_type_ids[int(rand() * len(task_type_ids))]
+                    task_rows.append([
+                        pk, name, description, deadlines[deadline], priority, is_completed, task_type_id,
+                        timestamp, timestamp,
+                    ])
+                    # A run of consecutive workers from a random offset keeps
+                    # assignees distinct without sampling per task.
+                    offset = int(rand() * len(worker_ids))
+                    assignees = [worker_ids[(offset + i) % len(worker_ids)] for i in range(fan_out)]
+                    through_rows.extend([pk, worker_id] for worker_id in assignees)
+                    totals.add(
+                        task_type_id, assignees, (priority, is_completed, not is_completed and deadline < due),
+                        deadline_days[deadline],
+                    )
+                self.insert_rows(cursor, task_table, task_columns, task_rows)
+                self.insert_rows(cursor, through_table, ["task_id", "worker_id"], through_rows)
+                created += size
+                assigned += len(through_rows)
+        return created, assigned
@@ -0,0 +1,282 @@
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from tasks import audit
+from tasks.capacity import invalidate_capacity_report
+from tasks.counters import (
+    COUNTED_FIELDS, apply_assignee_change, apply_task_change, counted_state, move_worker_position, normalize_state,
+    recount_positions, recount_task_types, recount_workers,
+)
+from tasks.models import Position, Task, TaskEvent, TaskType, Tombstone, Worker
+from tasks.search import get_search_backend, get_search_fields
+from tasks.stats import invalidate_dashboard_stats
+
+_deferred = threading.local()
+
+
+def get_deferred_deletes():
+    return getattr(_deferred, "deletes", None)
+
+
+@contextmanager
+def deferred_delete_side_effects():
+    """
+    Collect the per-row post_delete work (tombstones, search index removal,
+    cache invalidation) and write it in bulk when the block exits.
+    """
+    if get_deferred_deletes() is not None:
+        yield
+        return
+    _deferred.deletes = defaultdict(list)
+    try:
+        yield
+        deletes = _deferred.deletes
+    finally:
+        _deferred.deletes = None
+
+    backend = get_search_backend()
+    tombstones = []
+    for model, pks in deletes.items():
+        tombstones.extend(Tombstone(model=model._meta.label_lower, object_id=pk) for pk in pks)
+        if model in (Task, Worker):
+            backend.remove_objects(model, pks)
+    Tombstone.objects.bulk_create(tombstones)
+    audit.record_deleted(deletes.get(Task, ()))
+    if deletes:
+        transaction.on_commit(invalidate_dashboard_stats)
+        transaction.on_commit(invalidate_capacity_report)
+
+
+@receiver(post_save, sender=Task)
+@receiver(m2m_changed, sender=Task.assignees.through)
+def invalidate_dashboard_stats_on_change(sender, **kwargs):
+    # After commit, so a request racing the transaction cannot cache the old rows again.
+    transaction.on_commit(invalidate_dashboard_stats)
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Worker)
+def invalidate_dashboard_stats_on_delete(sender, **kwargs):
+    if get_deferred_deletes() is None:
+        transaction.on_commit(invalidate_dashboard_stats)
+
+
+@receiver(post_save, sender=Worker)
+def invalidate_dashboard_stats_on_worker_created(sender, created, **kwargs):
+    # Workers are saved on every login; only new rows change the counters.
+    if created:
+        transaction.on_commit(invalidate_dashboard_stats)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Position)
+@receiver(m2m_changed, sender=Task.assignees.through)
+def invalidate_capacity_report_on_change(sender, **kwargs):
+    transaction.on_commit(invalidate_capacity_report)
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Worker)
+@receiver(post_delete, sender=Position)
+def invalidate_capacity_report_on_delete(sender, **kwargs):
+    if get_deferred_deletes() is None:
+        transaction.on_commit(invalidate_capacity_report)
+
+
+@receiver(post_save, sender=Worker)
+def invalidate_capacity_report_on_worker_change(sender, created, update_fields=None, **kwargs):
+    # New workers have no open tasks yet, and logins only save last_login.
+    if created or update_fields and not set(update_fields) & {"username", "position"}:
+        return
+    transaction.on_commit(invalidate_capacity_report)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Worker)
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not set(update_fields) & set(get_search_fields(sender)):
+        return
+    get_search_backend().index_object(instance)
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Worker)
+def remove_from_search_index(sender, instance, **kwargs):
+    if get_deferred_deletes() is None:
+        get_search_backend().remove_object(instance)
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def touch_tasks_on_assignee_change(sender, instance, action, reverse, pk_set, **kwargs):
+    # Assignee changes do not save the task, so bump updated_at by hand to
+    # keep change markers (ETags) in step with the serialized assignees.
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        task_ids = [instance.pk]
+    elif action == "pre_clear":
+        task_ids = list(instance.assigned_tasks.values_list("pk", flat=True))
+    else:
+        task_ids = pk_set
+    if task_ids:
+        Task.objects.filter(pk__in=task_ids).update(updated_at=timezone.now())
+
+
+@receiver(pre_delete, sender=Worker)
+def touch_tasks_on_worker_delete(sender, instance, **kwargs):
+    # The through rows go away in a cascade that sends no m2m_changed.
+    instance.assigned_tasks.update(updated_at=timezone.now())
+
+
+@receiver(post_delete, sender=Position)
+@receiver(post_delete, sender=TaskType)
+@receiver(post_delete, sender=Worker)
+@receiver(post_delete, sender=Task)
+def record_tombstone(sender, instance, **kwargs):
+    deferred = get_deferred_deletes()
+    if deferred is not None:
+        deferred[sender].append(instance.pk)
+    else:
+        Tombstone.objects.create(model=sender._meta.label_lower, object_id=instance.pk)
+
+
+COUNTED_TASK_FIELDS = {"is_completed", "deadline", "task_type", "task_type_id", "priority"}
+
+
+@receiver(post_save, sender=Task)
+def update_counters_on_task_save(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw or update_fields and not set(update_fields) & COUNTED_TASK_FIELDS:
+        return
+    # A new task has no assignees yet; they arrive through m2m_changed.
+    worker_ids = () if created else Task.assignees.through.objects.filter(task_id=instance.pk).values_list(
+        "worker_id", flat=True
+    )
+    old = None if created else counted_state(instance)
+    if old is None and not created:
+        # Some counted fields were never loaded, so the old contribution is unknown.
+        recount_task_types({instance.task_type_id, getattr(instance, "_loaded_values", {}).get("task_type")} - {None})
+        recount_workers(worker_ids)
+        return
+    saved = instance.audited_values(update_fields)
+    new = normalize_state({name: saved.get(name, old and old[name]) for name in COUNTED_FIELDS})
+    apply_task_change(old, new, worker_ids)
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def remember_removed_assignees(sender, instance, action, reverse, pk_set, **kwargs):
+    # remove() passes every requested id on in pk_set, assigned or not; keep the ones that had a row.
+    if action != "pre_remove":
+        return
+    if reverse:
+        rows = sender.objects.filter(worker_id=instance.pk, task_id__in=pk_set).values_list("task_id", flat=True)
+    else:
+        rows = sender.objects.filter(task_id=instance.pk, worker_id__in=pk_set).values_list("worker_id", flat=True)
+    instance._removed_assignee_ids = set(rows)
+
+
+def removed_assignee_ids(instance):
+    """The ids of the last remove() on ``instance`` that were actually assigned."""
+    return instance.__dict__.get("_removed_assignee_ids", set())
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def update_counters_on_assignee_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear":
+        # The rows are gone by post_clear, so remember which ones there were.
+        related = instance.assigned_tasks if reverse else instance.assignees
+        instance._counter_cleared_ids = list(related.values_list("pk", flat=True))
+        return
+    if action == "post_clear":
+        pk_set = instance.__dict__.pop("_counter_cleared_ids", ())
+    elif action == "post_remove":
+        pk_set = removed_assignee_ids(instance)
+    elif action != "post_add":
+        return
+    if not pk_set:
+        return
+    task_ids, worker_ids = (pk_set, [instance.pk]) if reverse else ([instance.pk], pk_set)
+    apply_assignee_change(task_ids, worker_ids, added=action == "post_add")
+
+
+@receiver(pre_delete, sender=Task)
+def remember_assignees_on_task_delete(sender, instance, **kwargs):
+    if get_deferred_deletes() is None:
+        instance._deleted_assignee_ids = list(instance.assignees.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Task)
+def update_counters_on_task_delete(sender, instance, **kwargs):
+    # Bulk deletes recount once for the whole batch instead (tasks.bulk).
+    if get_deferred_deletes() is not None:
+        return
+    worker_ids = instance.__dict__.pop("_deleted_assignee_ids", ())
+    old = counted_state(instance)
+    if old is None:
+        recount_task_types([instance.task_type_id])
+        recount_workers(worker_ids)
+    else:
+        apply_task_change(old, None, worker_ids)
+
+
+@receiver(post_save, sender=Worker)
+def update_position_count_on_worker_save(sender, instance, created, update_fields=None, **kwargs):
+    # Logins save only last_login.
+    if update_fields and not set(update_fields) & {"position", "position_id"}:
+        return
+    if created:
+        move_worker_position(None, instance.position_id)
+    elif hasattr(instance, "_loaded_position_id"):
+        move_worker_position(instance._loaded_position_id, instance.position_id)
+    else:
+        # The position the worker had is unknown (never loaded), so count every position again.
+        recount_positions()
+    instance._loaded_position_id = instance.position_id
+
+
+@receiver(post_delete, sender=Worker)
+def update_position_count_on_worker_delete(sender, instance, **kwargs):
+    move_worker_position(instance.position_id, None)
+
+
+@receiver(post_save, sender=Task)
+def record_task_save(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if not raw:
+        audit.record_save(instance, created, update_fields)
+
+
+@receiver(post_delete, sender=Task)
+def record_task_delete(sender, instance, **kwargs):
+    # Bulk deletes record theirs in deferred_delete_side_effects().
+    if get_deferred_deletes() is None:
+        audit.record_deleted([instance.pk])
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def record_assignee_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear":
+        related = instance.assigned_tasks if reverse else instance.assignees
+        instance._audit_cleared_ids = list(related.values_list("pk", flat=True))
+        return
+    if action == "post_clear":
+        kind, pk_set = TaskEvent.Kind.UNASSIGNED, instance.__dict__.pop("_audit_cleared_ids", ())
+    elif action == "post_add":
+        kind = TaskEvent.Kind.ASSIGNED
+    elif action == "post_remove":
+        kind, pk_set = TaskEvent.Kind.UNASSIGNED, removed_assignee_ids(instance)
+    else:
+        return
+    pairs = [(pk, instance.pk) if reverse else (instance.pk, pk) for pk in pk_set or ()]
+    audit.record_assignees(kind, pairs)
+
+
+@receiver(pre_delete, sender=Worker)
+def record_unassigned_on_worker_delete(sender, instance, **kwargs):
+    # Like touch_tasks_on_worker_delete: the cascade sends no m2m_changed.
+    task_ids = instance.assigned_tasks.values_list("pk", flat=True)
+    audit.record_assignees(TaskEvent.Kind.UNASSIGNED, [(task_id, instance.pk) for task_id in task_ids])
@@ -0,0 +1,56 @@
+import asyncio
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from tasks.models import Task, Worker
+
+DASHBOARD_STATS_CACHE_KEY = "tasks:dashboard-stats"
+
+
+def dashboard_aggregates():
+    aggregates = {
+        "num_tasks": Count("id"),
+        "num_completed_tasks": Count("id", filter=Q(is_completed=True)),
+    }
+    for priority in Task.PriorityChoices:
+        aggregates[f"priority_{priority.name.lower()}"] = Count(
+            "id", filter=Q(priority=priority)
+        )
+    return aggregates
+
+
+def compute_dashboard_stats():
+    stats = Task.objects.order_by().aggregate(**dashboard_aggregates())
+    stats["num_workers"] = Worker.objects.count()
+    return stats
+
+
+async def acompute_dashboard_stats():
+    stats, num_workers = await asyncio.gather(
+        Task.objects.order_by().aaggregate(**dashboard_aggregates()),
+        Worker.objects.acount(),
+    )
+    stats["num_workers"] = num_workers
+    return stats
+
+
+def get_dashboard_stats():
+    return cache.get_or_set(
+        DASHBOARD_STATS_CACHE_KEY,
+        compute_dashboard_stats,
+        settings.DASHBOARD_STATS_CACHE_TIMEOUT,
+    )
+
+
+async def aget_dashboard_stats():
+    stats = await cache.aget(DASHBOARD_STATS_CACHE_KEY)
+    if stats is None:
+        stats = await acompute_dashboard_stats()
+        await cache.aset(DASHBOARD_STATS_CACHE_KEY, stats, settings.DASHBOARD_STATS_CACHE_TIMEOUT)
+    return stats
+
+
+def invalidate_dashboard_stats():
+    cache.delete(DASHBOARD_STATS_CACHE_KEY)
@@ -0,0 +1,124 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Sum
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks import bulk
+from tasks.analytics import build_task_trend, compute_task_trend, roll_up_events
+from tasks.models import Position, PositionDailyStat, Task, TaskEvent, TaskType, TaskTypeDailyStat
+from tasks.seeding import FixtureGenerator
+from tasks.tests.utils import TaskFactoryMixin
+
+
+class DailyTaskStatTests(TaskFactoryMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.developer = Position.objects.create(name="Developer")
+        self.tester = Position.objects.create(name="Tester")
+        Worker = get_user_model()
+        self.alice = Worker.objects.create(username="alice", position=self.developer)
+        self.bob = Worker.objects.create(username="bob", position=self.tester)
+        self.overdue = self.create_task([self.alice], days=-1, priority=Task.PriorityChoices.URGENT)
+        self.create_task([self.alice, self.bob], days=3)
+
+    def totals(self, model=TaskTypeDailyStat, **filters):
+        return model.objects.filter(**filters).aggregate(
+            created=Sum("created"), completed=Sum("completed"), overdue=Sum("overdue")
+        )
+
+    def test_first_run_rebuilds_from_tasks(self):
+        self.assertEqual(roll_up_events(), 0)
+        self.assertEqual(self.totals(), {"created": 2, "completed": 0, "overdue": 1})
+        self.assertEqual(self.totals(priority=Task.PriorityChoices.URGENT)["overdue"], 1)
+        self.assertFalse(TaskEvent.objects.filter(pending_rollup=True).exists())
+
+    def test_later_runs_add_only_new_events(self):
+        roll_up_events()
+        task = self.create_task([self.bob])
+        bulk.complete_tasks([task.pk, self.overdue.pk])
+
+        self.assertEqual(roll_up_events(), 3)
+        self.assertEqual(self.totals(), {"created": 3, "completed": 2, "overdue": 0})
+        self.assertEqual(roll_up_events(), 0)
+        self.assertEqual(self.totals()["created"], 3)
+
+        # Deleted tasks keep counting as created, and reopening is not a completion.
+        bulk.delete_tasks([task.pk])
+        self.create_task().delete()
+        self.overdue.is_completed = False
+        self.overdue.save()
+        roll_up_events()
+        self.assertEqual(self.totals(), {"created": 4, "completed": 2, "overdue": 1})
+
+    def test_events_committed_late_are_still_counted(self):
+        roll_up_events()
+        # A long import commits its events after newer ones were rolled up:
+        # they surface behind the latest processed id.
+        task = self.create_task()
+        event = TaskEvent.objects.get(task=task, kind=TaskEvent.Kind.CREATED)
+        event.delete()
+        self.create_task()
+        self.assertEqual(roll_up_events(), 1)
+        TaskEvent.objects.bulk_create([event])
+        self.assertEqual(roll_up_events(), 1)
+        self.assertEqual(self.totals()["created"], 4)
+
+    def test_seeded_tasks_are_counted(self):
+        roll_up_events()
+        FixtureGenerator(batch_size=10).run(positions=1, task_types=1, workers=3, tasks=5, assignees_per_task=1)
+        self.assertEqual(self.totals()["created"], 7)
+        roll_up_events()
+        self.assertEqual(self.totals()["created"], 7)
+
+    def test_tasks_count_for_each_assignee_position(self):
+        roll_up_events()
+        self.assertEqual(self.totals(PositionDailyStat, position=self.developer)["created"], 2)
+        self.assertEqual(self.totals(PositionDailyStat, position=self.tester)["created"], 1)
+
+        self.create_task()
+        self.create_task([self.alice, get_user_model().objects.create(username="carol", position=self.developer)])
+        roll_up_events()
+        self.assertEqual(self.totals(PositionDailyStat, position=self.developer)["created"], 3)
+        self.assertEqual(self.totals()["created"], 4)
+
+    def test_weekly_trend(self):
+        start = timezone.localdate() - timedelta(days=13)
+        start -= timedelta(days=start.weekday())
+        end = start + timedelta(days=13)
+        rows = [
+            (start, 2, 1, 3, timedelta(days=2)),
+            (start + timedelta(days=6), 1, 1, 5, timedelta(days=4)),
+            (start + timedelta(days=8), 4, 0, 1, timedelta()),
+        ]
+        self.assertEqual(build_task_trend(rows, start, end), {
+            "labels": [start.isoformat(), (start + timedelta(weeks=1)).isoformat()],
+            "created": [3, 4],
+            "completed": [2, 0],
+            "overdue": [5, 1],
+            "lead_time_days": [3.0, None],
+        })
+
+    def test_trend_reads_only_the_rollups(self):
+        roll_up_events()
+        with self.assertNumQueries(1):
+            trend = compute_task_trend()
+        self.assertEqual(len(trend["labels"]), 53)
+        self.assertEqual((trend["created"][-1], trend["overdue"][-1]), (2, 1))
+
+        self.client.force_login(self.alice)
+        response = self.client.get(reverse("tasks:index"))
+        self.assertEqual(response.context["task_trend"], trend)
+        self.assertContains(response, 'id="task-trend"')
+
+    def test_command(self):
+        out = StringIO()
+        call_command("rollup_analytics", stdout=out)
+        call_command("rollup_analytics", "--rebuild", stdout=out)
+        self.assertIn("Rebuilt the daily task stats", out.getvalue())
+        self.assertEqual(self.totals()["created"], 2)
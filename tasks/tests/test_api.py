@@ -0,0 +1,182 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Position, Task, TaskType
+
+
+class ApiTests(TestCase):
+    def setUp(self):
+        self.position = Position.objects.create(name="Developer")
+        self.user = get_user_model().objects.create(username="admin", position=self.position)
+        self.client.force_login(self.user)
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.tasks = []
+        for i in range(5):
+            task = Task.objects.create(
+                name=f"Task {i}",
+                description="Desc",
+                deadline=timezone.now() + timedelta(days=i),
+                task_type=self.task_type,
+                is_completed=i % 2 == 0,
+            )
+            task.assignees.add(self.user)
+            self.tasks.append(task)
+
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.get(reverse("tasks:api-task-list"))
+        self.assertEqual(response.status_code, 403)
+
+    def test_task_list_with_sparse_fields(self):
+        response = self.client.get(reverse("tasks:api-task-list"), {"fields": "id,assignees"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["results"][0],
+            {"id": self.tasks[0].pk, "assignees": [self.user.pk]},
+        )
+
+    def test_unknown_field(self):
+        response = self.client.get(reverse("tasks:api-task-list"), {"fields": "id,secret"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_task_list_filters_and_pagination(self):
+        url = reverse("tasks:api-task-list")
+        response = self.client.get(url, {"status": "completed", "limit": 2, "fields": "name"})
+        data = response.json()
+        self.assertEqual([row["name"] for row in data["results"]], ["Task 0", "Task 2"])
+        self.assertIsNone(data["previous"])
+
+        data = self.client.get(data["next"]).json()
+        self.assertEqual([row["name"] for row in data["results"]], ["Task 4"])
+        self.assertIsNone(data["next"])
+
+    def test_etag_returns_not_modified(self):
+        url = reverse("tasks:api-task-list")
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(4):
+            response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_list_etag_changes_on_delete_and_filter_exit(self):
+        url = reverse("tasks:api-task-list")
+        etag = self.client.get(url, {"status": "completed"})["ETag"]
+        self.tasks[4].delete()
+        response = self.client.get(url, {"status": "completed"}, headers={"if-none-match": etag})
+        self.assertEqual(len(response.json()["results"]), 2)
+
+        etag = response["ETag"]
+        self.tasks[2].is_completed = False
+        self.tasks[2].save()
+        response = self.client.get(url, {"status": "completed"}, headers={"if-none-match": etag})
+        self.assertEqual(len(response.json()["results"]), 1)
+
+    def test_invalid_list_cursor(self):
+        response = self.client.get(reverse("tasks:api-task-list"), {"cursor": "bogus"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": "Invalid cursor"})
+
+    def test_etag_changes_on_update(self):
+        url = reverse("tasks:api-task-detail", args=[self.tasks[0].pk])
+        etag = self.client.get(url)["ETag"]
+        other = get_user_model().objects.create(username="worker")
+        self.tasks[0].assignees.add(other)
+        response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["assignees"], [self.user.pk, other.pk])
+
+    def test_worker_and_reference_endpoints(self):
+        worker = self.client.get(reverse("tasks:api-worker-detail", args=[self.user.pk])).json()
+        self.assertEqual(worker["position"], self.position.pk)
+        positions = self.client.get(reverse("tasks:api-position-list")).json()["results"]
+        self.assertEqual(positions[0]["name"], "Developer")
+        task_types = self.client.get(reverse("tasks:api-task-type-list"), {"fields": "name"}).json()
+        self.assertEqual(task_types["results"], [{"name": "Bug"}])
+
+    def test_detail_not_found(self):
+        response = self.client.get(reverse("tasks:api-task-detail", args=[0]))
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(SYNC_SAFETY_LAG_SECONDS=0)
+class ChangesFeedTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="admin")
+        self.client.force_login(self.user)
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.task = Task.objects.create(
+            name="Task",
+            description="Desc",
+            deadline=timezone.now() + timedelta(days=1),
+            task_type=self.task_type,
+        )
+
+    def poll(self, since=None, limit=None):
+        params = {key: value for key, value in (("since", since), ("limit", limit)) if value}
+        return self.client.get(reverse("tasks:api-changes"), params).json()
+
+    def test_initial_sync_returns_everything(self):
+        data = self.poll()
+        self.assertEqual(
+            {(change["model"], change["id"]) for change in data["changes"]},
+            {("tasks.worker", self.user.pk), ("tasks.tasktype", self.task_type.pk), ("tasks.task", self.task.pk)},
+        )
+        self.assertFalse(data["has_more"])
+        self.assertEqual(self.poll(data["cursor"])["changes"], [])
+
+    def test_incremental_changes_and_tombstones(self):
+        cursor = self.poll()["cursor"]
+        self.task.name = "Renamed"
+        self.task.save()
+        other = Task.objects.create(
+            name="Gone", description="", deadline=timezone.now(), task_type=self.task_type
+        )
+        other_pk = other.pk
+        other.delete()
+
+        changes = self.poll(cursor)["changes"]
+        updated = [change for change in changes if not change["deleted"]]
+        self.assertEqual([change["data"]["name"] for change in updated if change["model"] == "tasks.task"],
+                         ["Renamed"])
+        self.assertIn(
+            {"model": "tasks.task", "id": other_pk, "deleted": True, "data": None},
+            [{key: change[key] for key in ("model", "id", "deleted", "data")} for change in changes],
+        )
+
+    def test_paging_with_small_limit_sees_every_row(self):
+        seen = []
+        cursor = None
+        while True:
+            data = self.poll(cursor, limit=1)
+            seen.extend((change["model"], change["id"]) for change in data["changes"])
+            cursor = data["cursor"]
+            if not data["has_more"]:
+                break
+        self.assertEqual(len(seen), 3)
+        self.assertEqual(len(set(seen)), 3)
+
+    @override_settings(SYNC_SAFETY_LAG_SECONDS=60)
+    def test_rows_committed_late_are_not_skipped(self):
+        now = timezone.now()
+        Task.objects.update(updated_at=now - timedelta(minutes=5))
+        get_user_model().objects.update(updated_at=now - timedelta(minutes=5))
+        TaskType.objects.update(updated_at=now - timedelta(minutes=5))
+        fresh = Task.objects.create(name="Fresh", description="", deadline=now, task_type=self.task_type)
+        data = self.poll()
+        self.assertEqual(len(data["changes"]), 3)
+        self.assertNotIn(fresh.pk, [change["id"] for change in data["changes"] if change["model"] == "tasks.task"])
+
+        # A long transaction commits a row stamped before the fresh one, after the poll above.
+        late = Task.objects.create(name="Late", description="", deadline=now, task_type=self.task_type)
+        Task.objects.filter(pk=late.pk).update(updated_at=fresh.updated_at - timedelta(seconds=30))
+        with mock.patch("tasks.sync.timezone.now", return_value=now + timedelta(minutes=2)):
+            data = self.poll(data["cursor"])
+        self.assertEqual([change["data"]["name"] for change in data["changes"]], ["Late", "Fresh"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse("tasks:api-changes"), {"since": "bogus"})
+        self.assertEqual(response.status_code, 400)
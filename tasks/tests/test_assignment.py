@@ -0,0 +1,105 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks import bulk
+from tasks.assignment import AssignmentEngine, compute_position_fit, get_position_fit, refresh_position_fit
+from tasks.forms import TaskForm
+from tasks.models import Position, Task, TaskType
+from tasks.tests.utils import TaskFactoryMixin
+
+
+class AssignmentEngineTests(TaskFactoryMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.deadline = timezone.now() + timedelta(days=10)
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.docs = TaskType.objects.create(name="Docs")
+        self.developer = Position.objects.create(name="Developer")
+        self.writer = Position.objects.create(name="Writer")
+        Worker = get_user_model()
+        self.busy = Worker.objects.create(username="busy", position=self.developer)
+        self.clustered = Worker.objects.create(username="clustered", position=self.developer)
+        self.idle = Worker.objects.create(username="idle", position=self.writer)
+        Worker.objects.create(username="inactive", is_active=False)
+
+        for days in (1, 2, 3):
+            self.create_task([self.busy], days=days, priority=Task.PriorityChoices.URGENT)
+        self.create_task([self.clustered], days=10, priority=Task.PriorityChoices.LOW)
+        self.create_task([self.idle], days=1, task_type=self.docs, is_completed=True)
+
+    def usernames(self, suggestions):
+        return [suggestion.username for suggestion in suggestions]
+
+    def test_ranks_by_load_and_deadline_clustering(self):
+        suggestions = AssignmentEngine().suggest(self.task_type.pk, self.deadline, count=5)
+        self.assertEqual(self.usernames(suggestions), ["idle", "clustered", "busy"])
+        busy = suggestions[2]
+        self.assertEqual((busy.open_tasks, busy.load, busy.clustered), (3, 12, 0))
+        self.assertEqual(suggestions[1].clustered, 1)
+
+    def test_position_fit_comes_from_completed_tasks(self):
+        self.assertEqual(compute_position_fit(), {self.docs.pk: {self.writer.pk: 1.0}})
+        # Requests read the fit the recount job stored, not the live history.
+        self.assertEqual(get_position_fit(self.docs.pk), {})
+        self.assertEqual(refresh_position_fit(), 1)
+        self.assertEqual(get_position_fit(self.docs.pk), {self.writer.pk: 1.0})
+        for _ in range(3):
+            self.create_task([self.idle], days=30)
+
+        engine = AssignmentEngine()
+        self.assertEqual(self.usernames(engine.suggest(self.task_type.pk, self.deadline, count=1)), ["clustered"])
+        # Writers have only ever completed Docs tasks, which outweighs idle's new load.
+        self.assertEqual(self.usernames(engine.suggest(self.docs.pk, self.deadline, count=1)), ["idle"])
+
+    def test_exclude_skips_workers(self):
+        suggestions = AssignmentEngine().suggest(self.task_type.pk, self.deadline, exclude=[self.idle.pk])
+        self.assertEqual(self.usernames(suggestions), ["clustered", "busy"])
+
+    def test_open_load_follows_priority_changes(self):
+        self.busy.refresh_from_db()
+        self.assertEqual(self.busy.open_load, 12)
+        task = self.busy.assigned_tasks.first()
+        task.priority = Task.PriorityChoices.LOW
+        task.save(update_fields=["priority"])
+        self.busy.refresh_from_db()
+        self.assertEqual(self.busy.open_load, 9)
+
+        bulk.set_priority(self.busy.assigned_tasks.all(), Task.PriorityChoices.MEDIUM)
+        self.busy.refresh_from_db()
+        self.assertEqual(self.busy.open_load, 6)
+
+    def test_suggest_runs_a_fixed_number_of_queries(self):
+        refresh_position_fit()
+        get_user_model().objects.bulk_create(
+            [get_user_model()(username=f"extra{n}", position=self.developer) for n in range(20)]
+        )
+        # Fit, window load, candidates and the winners' usernames.
+        with self.assertNumQueries(4):
+            AssignmentEngine().suggest(self.task_type.pk, self.deadline)
+
+    def test_task_form_auto_assigns_the_best_worker(self):
+        data = {
+            "name": "New", "description": "Desc", "deadline": "2030-01-01T10:00",
+            "priority": "High", "task_type": self.task_type.pk,
+        }
+        form = TaskForm(data=data)
+        self.assertFalse(form.is_valid())
+        self.assertIn("assignees", form.errors)
+
+        form = TaskForm(data=dict(data, auto_assign="on"))
+        self.assertTrue(form.is_valid(), form.errors)
+        task = form.save()
+        self.assertEqual(list(task.assignees.all()), [self.idle])
+
+    def test_suggestion_endpoint(self):
+        self.client.force_login(self.idle)
+        url = reverse("tasks:task-suggest-assignees")
+        response = self.client.get(
+            url, {"task_type": self.task_type.pk, "deadline": "2030-01-01T10:00", "exclude": [self.idle.pk]}
+        )
+        self.assertEqual([result["text"] for result in response.json()["results"]], ["clustered", "busy"])
+        self.assertEqual(self.client.get(url, {"task_type": self.task_type.pk}).status_code, 400)
@@ -0,0 +1,126 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks import bulk, jobs
+from tasks.audit import buffered_events
+from tasks.models import Task, TaskEvent, TaskType
+
+
+class TaskEventTests(TestCase):
+    def setUp(self):
+        self.task_type = TaskType.objects.create(name="Bug")
+        Worker = get_user_model()
+        self.alice = Worker.objects.create(username="alice")
+        self.bob = Worker.objects.create(username="bob")
+        self.task = Task.objects.create(
+            name="Fix", description="Desc", deadline=timezone.now() + timedelta(days=1), task_type=self.task_type
+        )
+        self.task.assignees.add(self.alice)
+
+    def kinds(self, **filters):
+        return list(TaskEvent.objects.filter(**filters).order_by("id").values_list("kind", flat=True))
+
+    def test_records_creation_and_assignees(self):
+        self.assertEqual(self.kinds(task=self.task), ["created", "assigned"])
+        created = TaskEvent.objects.get(task=self.task, kind="created")
+        self.assertEqual(created.changes["name"], "Fix")
+        self.assertEqual(created.changes["task_type"], self.task_type.pk)
+        self.assertEqual(TaskEvent.objects.get(kind="assigned").worker, self.alice)
+
+    def test_updates_store_only_changed_fields(self):
+        task = Task.objects.get(pk=self.task.pk)
+        task.save()
+        self.assertFalse(TaskEvent.objects.filter(kind="updated").exists())
+
+        task.priority = Task.PriorityChoices.URGENT
+        task.is_completed = True
+        task.save()
+        event = TaskEvent.objects.get(kind="updated")
+        self.assertEqual(event.changes, {"priority": ["Medium", "Urgent"], "is_completed": [False, True]})
+
+        task.is_completed = False
+        task.name = "Unsaved"
+        task.save(update_fields=["is_completed"])
+        self.assertEqual(TaskEvent.objects.filter(kind="updated").first().changes, {"is_completed": [True, False]})
+
+    def test_buffered_events_are_one_insert_in_the_same_transaction(self):
+        with CaptureQueriesContext(connection) as queries, buffered_events(actor=self.bob):
+            self.task.name = "Renamed"
+            self.task.save(update_fields=["name"])
+            self.task.assignees.add(self.bob)
+            self.assertEqual(TaskEvent.objects.count(), 2)
+        inserts = [query for query in queries if query["sql"].startswith('INSERT INTO "tasks_taskevent"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(set(TaskEvent.objects.filter(actor=self.bob).values_list("kind", flat=True)), {
+            "updated", "assigned"
+        })
+
+        with self.assertRaises(RuntimeError), transaction.atomic(), buffered_events(actor=self.bob):
+            self.task.assignees.remove(self.bob)
+            raise RuntimeError
+        self.assertFalse(TaskEvent.objects.filter(kind="unassigned").exists())
+
+    def test_update_view_records_the_user(self):
+        self.client.force_login(self.bob)
+        self.client.post(reverse("tasks:task-update", args=[self.task.pk]), {
+            "name": "Fix",
+            "description": "Desc",
+            "deadline": "2030-01-01T10:00",
+            "priority": "Medium",
+            "task_type": self.task_type.pk,
+            "assignees": [self.bob.pk],
+        })
+        events = TaskEvent.objects.filter(actor=self.bob)
+        self.assertEqual(sorted(events.values_list("kind", flat=True)), ["assigned", "unassigned", "updated"])
+        self.assertEqual(list(events.get(kind="updated").changes), ["deadline"])
+        response = self.client.get(reverse("tasks:task-detail", args=[self.task.pk]))
+        self.assertEqual(len(response.context["events"]), 5)
+        self.assertContains(response, "deadline")
+
+    def test_removing_a_non_assignee_records_nothing(self):
+        self.task.assignees.remove(self.bob)
+        self.bob.assigned_tasks.remove(self.task)
+        self.task.assignees.remove(self.alice, self.bob)
+        self.assertEqual(self.kinds(worker=self.bob), [])
+        self.assertEqual(self.kinds(worker=self.alice), ["assigned", "unassigned"])
+
+    def test_bulk_actions_record_events(self):
+        bulk.set_priority([self.task.pk], Task.PriorityChoices.LOW)
+        bulk.complete_tasks([self.task.pk])
+        bulk.complete_tasks([self.task.pk])
+        bulk.add_assignees([self.task.pk], [self.alice, self.bob])
+        bulk.remove_assignees([self.task.pk], [self.alice])
+        self.assertEqual(self.kinds(task=self.task)[2:], ["updated", "updated", "assigned", "unassigned"])
+        self.assertEqual(self.kinds(worker=self.bob), ["assigned"])
+
+    def test_bulk_view_records_the_user(self):
+        self.client.force_login(self.bob)
+        self.client.post(reverse("tasks:task-bulk"), {"tasks": [self.task.pk], "action": "complete"})
+        event = TaskEvent.objects.get(kind="updated")
+        self.assertEqual(event.changes, {"is_completed": [False, True]})
+        self.assertEqual(event.actor, self.bob)
+
+    def test_history_outlives_deletes(self):
+        self.bob.assigned_tasks.add(self.task)
+        self.bob.assigned_tasks.clear()
+        self.assertEqual(self.kinds(worker=self.bob), ["assigned", "unassigned"])
+
+        alice_id = self.alice.pk
+        self.alice.delete()
+        self.assertEqual(self.kinds(worker_id=alice_id), ["assigned", "unassigned"])
+
+        task_id = self.task.pk
+        bulk.delete_tasks([task_id])
+        self.assertEqual(self.kinds(task_id=task_id)[-1], "deleted")
+
+    def test_prune_job_drops_old_events(self):
+        TaskEvent.objects.filter(kind="created").update(created_at=timezone.now() - timedelta(days=400))
+        jobs.enqueue("prune_task_events")
+        jobs.run_pending("test")
+        self.assertEqual(self.kinds(), ["assigned"])
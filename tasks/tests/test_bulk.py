@@ -0,0 +1,113 @@
+from datetime import timedelta
+
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks import bulk
+from tasks.models import Task, TaskType, Tombstone
+
+
+class BulkActionTests(TestCase):
+    def setUp(self):
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.workers = [get_user_model().objects.create(username=f"worker{i}") for i in range(3)]
+        self.tasks = [
+            Task.objects.create(
+                name=f"Task {i}",
+                description="Desc",
+                deadline=timezone.now() + timedelta(days=i),
+                task_type=self.task_type,
+            )
+            for i in range(20)
+        ]
+        self.ids = [task.pk for task in self.tasks]
+
+    def test_complete_is_one_update(self):
+        # savepoint, UPDATE, resolve affected workers (none) and task types, recount the
+        # task type (counters, then DELETE and INSERT ... SELECT of its deadline days), release
+        with self.assertNumQueries(10):
+            self.assertEqual(bulk.complete_tasks(self.ids), 20)
+        self.assertFalse(Task.objects.filter(is_completed=False).exists())
+
+    def test_set_priority(self):
+        bulk.set_priority(Task.objects.filter(pk__in=self.ids[:5]), Task.PriorityChoices.URGENT)
+        self.assertEqual(Task.objects.filter(priority=Task.PriorityChoices.URGENT).count(), 5)
+
+    def test_add_and_remove_assignees(self):
+        self.tasks[0].assignees.add(self.workers[0])
+        with self.assertNumQueries(9):
+            bulk.add_assignees(self.ids, self.workers[:2])
+        self.assertEqual(Task.assignees.through.objects.count(), 40)
+
+        bulk.remove_assignees(self.ids, [self.workers[0]])
+        self.assertEqual(list(self.workers[0].assigned_tasks.all()), [])
+        self.assertEqual(self.workers[1].assigned_tasks.count(), 20)
+
+    def test_delete_writes_tombstones_in_bulk(self):
+        for task in self.tasks:
+            task.assignees.add(self.workers[0])
+        with self.assertNumQueries(17):
+            self.assertEqual(bulk.delete_tasks(self.ids), 20)
+        self.assertFalse(Task.objects.exists())
+        self.assertEqual(Tombstone.objects.filter(model="tasks.task").count(), 20)
+
+
+class BulkActionViewTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="admin", is_staff=True, is_superuser=True)
+        self.client.force_login(self.user)
+        task_type = TaskType.objects.create(name="Bug")
+        self.tasks = [
+            Task.objects.create(
+                name=f"Task {i}",
+                description="Desc",
+                deadline=timezone.now() + timedelta(days=i),
+                task_type=task_type,
+            )
+            for i in range(3)
+        ]
+
+    def post(self, data):
+        return self.client.post(reverse("tasks:task-bulk"), {"tasks": [task.pk for task in self.tasks], **data})
+
+    def test_complete(self):
+        response = self.post({"action": "complete"})
+        self.assertRedirects(response, reverse("tasks:task-list"))
+        self.assertEqual(Task.objects.filter(is_completed=True).count(), 3)
+
+    def test_add_assignees_by_username(self):
+        self.post({"action": "add_assignees", "assignees": "admin"})
+        self.assertEqual(self.user.assigned_tasks.count(), 3)
+
+    def test_unknown_username_is_rejected(self):
+        response = self.post({"action": "add_assignees", "assignees": "ghost"})
+        self.assertRedirects(response, reverse("tasks:task-list"))
+        self.assertFalse(Task.assignees.through.objects.exists())
+
+    def test_priority_required(self):
+        self.post({"action": "priority"})
+        self.assertFalse(Task.objects.exclude(priority=Task.PriorityChoices.MEDIUM).exists())
+
+    def test_redirects_back_to_filtered_list(self):
+        next_url = reverse("tasks:task-list") + "?status=pending"
+        response = self.post({"action": "delete", "next": next_url})
+        self.assertRedirects(response, next_url)
+        self.assertFalse(Task.objects.exists())
+
+    def test_admin_priority_action(self):
+        self.client.post(reverse("admin:tasks_task_changelist"), {
+            "action": "set_priority_urgent",
+            ACTION_CHECKBOX_NAME: [task.pk for task in self.tasks],
+        })
+        self.assertEqual(Task.objects.filter(priority=Task.PriorityChoices.URGENT).count(), 3)
+
+    def test_admin_add_assignees_action(self):
+        data = {"action": "add_assignees", ACTION_CHECKBOX_NAME: [task.pk for task in self.tasks]}
+        response = self.client.post(reverse("admin:tasks_task_changelist"), data)
+        self.assertTemplateUsed(response, "admin/tasks/task/assignees_action.html")
+
+        self.client.post(reverse("admin:tasks_task_changelist"), {**data, "apply": "1", "assignees": "admin"})
+        self.assertEqual(self.user.assigned_tasks.count(), 3)
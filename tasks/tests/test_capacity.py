@@ -0,0 +1,83 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks import bulk
+from tasks.capacity import compute_capacity_report, get_capacity_report
+from tasks.models import Position, Task, TaskType
+from tasks.tests.utils import TaskFactoryMixin
+
+
+class CapacityReportTests(TaskFactoryMixin, TestCase):
+    deadline_at_noon = True
+
+    def setUp(self):
+        super().setUp()
+        self.today = timezone.localdate()
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.developer = Position.objects.create(name="Developer")
+        Worker = get_user_model()
+        self.alice = Worker.objects.create(username="alice", position=self.developer)
+        self.bob = Worker.objects.create(username="bob", position=self.developer)
+        self.carol = Worker.objects.create(username="carol")
+
+        self.create_task([self.alice], days=-14, priority=Task.PriorityChoices.URGENT)
+        self.create_task([self.alice, self.bob], days=0, priority=Task.PriorityChoices.HIGH)
+        self.create_task([self.alice], days=7, priority=Task.PriorityChoices.HIGH)
+        self.create_task([self.carol], days=365, priority=Task.PriorityChoices.LOW)
+        self.create_task([self.bob], days=0, is_completed=True)
+
+    def test_counts_open_tasks_by_priority_and_week(self):
+        report = compute_capacity_report(self.today)
+        alice, bob, carol = report["workers"]
+        self.assertEqual(alice["name"], "alice")
+        self.assertEqual(alice["total"], 3)
+        self.assertEqual(alice["priorities"], [1, 2, 0, 0])
+        self.assertEqual(alice["weeks"], [1, 1, 1, 0, 0, 0, 0, 0])
+        self.assertEqual(bob["weeks"][1], 1)
+        self.assertEqual(carol["weeks"][-1], 1)
+
+    def test_rolls_up_per_position(self):
+        developers, unassigned = compute_capacity_report(self.today)["positions"]
+        # The task alice and bob share counts once for their position.
+        self.assertEqual((developers["name"], developers["total"]), ("Developer", 3))
+        self.assertEqual(developers["priorities"], [1, 2, 0, 0])
+        self.assertEqual(developers["weeks"], [1, 1, 1, 0, 0, 0, 0, 0])
+        self.assertEqual((unassigned["name"], unassigned["total"]), ("No position", 1))
+
+    def test_report_is_two_queries_and_cached(self):
+        with self.assertNumQueries(2):
+            get_capacity_report()
+        with self.assertNumQueries(0):
+            get_capacity_report()
+
+    def test_changes_invalidate_the_cache(self):
+        self.assertEqual(get_capacity_report()["workers"][0]["total"], 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            task = self.create_task([self.alice], days=1)
+        self.assertEqual(get_capacity_report()["workers"][0]["total"], 4)
+        with self.captureOnCommitCallbacks() as callbacks:
+            bulk.complete_tasks([task.pk])
+        # Other connections see the task open until the commit.
+        self.assertEqual(get_capacity_report()["workers"][0]["total"], 4)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(get_capacity_report()["workers"][0]["total"], 3)
+        self.bob.position = None
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bob.save()
+        self.assertEqual(get_capacity_report()["positions"][0]["total"], 3)
+
+    def test_page_and_csv(self):
+        self.client.force_login(self.alice)
+        response = self.client.get(reverse("tasks:capacity-report"))
+        self.assertContains(response, "Open Tasks by Worker")
+        self.assertEqual([entry["name"] for entry in response.context["workers"]], ["alice", "bob", "carol"])
+
+        response = self.client.get(reverse("tasks:capacity-export"))
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(lines[0].split(",")[:5], ["Level", "Name", "Position", "Open tasks", "Urgent"])
+        self.assertEqual(lines[1].split(",")[:4], ["worker", "alice", "Developer", "3"])
+        self.assertEqual(len(lines), 6)
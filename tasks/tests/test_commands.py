@@ -0,0 +1,185 @@
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Count
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from tasks.analytics import rebuild_daily_stats
+from tasks.counters import recount_all
+from tasks.management.commands.explain_queries import find_sequential_scans
+from tasks.models import Position, Task, TaskType, TaskTypeDailyStat, TaskTypeDeadlineDay, Worker, WorkerDeadlineDay
+from tasks.search import search
+from tasks.seeding import get_secondary_index_definitions
+from tasks.transfer import TaskImporter, TaskImportError, iter_task_rows
+
+
+class ExplainQueriesCommandTests(TestCase):
+    def test_detects_sqlite_sequential_scans(self):
+        plan = "\n".join([
+            "6 0 0 SCAN tasks_task USING INDEX task_ordering_idx",
+            "9 0 0 SCAN tasks_tasktype",
+        ])
+        self.assertEqual(find_sequential_scans(plan, "sqlite"), ["tasks_tasktype"])
+
+    def test_detects_postgres_sequential_scans(self):
+        plan = "\n".join([
+            "Limit  (cost=0.42..1.02 rows=5 width=80)",
+            "  ->  Index Scan using task_ordering_idx on tasks_task  (cost=0.42..1.02 rows=5 width=80)",
+            "  ->  Seq Scan on tasks_tasktype  (cost=0.00..1.01 rows=1 width=16)",
+        ])
+        self.assertEqual(find_sequential_scans(plan, "postgresql"), ["tasks_tasktype"])
+
+    def test_command_explains_every_view(self):
+        out = StringIO()
+        call_command("explain_queries", stdout=out)
+        self.assertIn("== tasks:task-list", out.getvalue())
+        self.assertIn("== tasks:index upcoming deadlines", out.getvalue())
+
+
+class TaskTransferCommandTests(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.workers = [get_user_model().objects.create(username=f"worker{i}") for i in range(3)]
+        for i in range(5):
+            task = Task.objects.create(
+                name=f"Task {i}",
+                description=f"Line one\nline, two {i}",
+                deadline=timezone.now() + timedelta(days=i),
+                priority=Task.PriorityChoices.HIGH,
+                task_type=self.task_type,
+                is_completed=i % 2 == 0,
+            )
+            task.assignees.set(self.workers[:i % 3])
+
+    def round_trip(self, fmt):
+        path = Path(self.tmpdir) / f"tasks.{fmt}"
+        call_command("export_tasks", str(path), stdout=StringIO())
+        originals = list(iter_task_rows())
+        Task.objects.all().delete()
+
+        call_command("import_tasks", str(path), "--batch-size", "2", stdout=StringIO())
+        imported = list(iter_task_rows(Task.objects.order_by("id")))
+        for row in imported + originals:
+            row.pop("id")
+        self.assertEqual(imported, originals)
+
+    def test_export_to_stdout(self):
+        out = StringIO()
+        call_command("export_tasks", "-", "--format", "jsonl", stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), Task.objects.count())
+        self.assertEqual(json.loads(lines[0])["name"], Task.objects.order_by("id").first().name)
+
+    def test_csv_round_trip(self):
+        self.round_trip("csv")
+
+    def test_jsonl_round_trip(self):
+        self.round_trip("jsonl")
+
+    def test_import_query_count_does_not_grow_with_rows(self):
+        def import_rows(count):
+            rows = [
+                {"name": f"Imported {i}", "deadline": "2030-01-01T10:00:00", "task_type": "Feature",
+                 "assignees": ["worker0", "worker1"]}
+                for i in range(count)
+            ]
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertEqual(TaskImporter(batch_size=count, use_copy=False).run(rows), count)
+            TaskType.objects.filter(name="Feature").delete()
+            return len(ctx.captured_queries)
+
+        self.assertEqual(import_rows(5), import_rows(50))
+
+    def test_import_rejects_unknown_worker(self):
+        rows = [{"name": "Task", "deadline": "2030-01-01T10:00:00", "task_type": "Bug", "assignees": ["ghost"]}]
+        with self.assertRaisesMessage(TaskImportError, "unknown worker 'ghost'"):
+            TaskImporter(use_copy=False).run(rows)
+
+    def test_import_reports_malformed_jsonl_lines(self):
+        path = Path(self.tmpdir) / "tasks.jsonl"
+        path.write_text('{"name": "Task", "deadline": "2030-01-01T10:00:00", "task_type": "Bug"}\n\n{"name": \n')
+        with self.assertRaisesMessage(CommandError, "Line 3: invalid JSON"):
+            call_command("import_tasks", str(path), stdout=StringIO())
+        self.assertFalse(Task.objects.filter(deadline__year=2030).exists())
+
+        path.write_text("[1, 2]\n")
+        with self.assertRaisesMessage(CommandError, "Line 1: expected a JSON object"):
+            call_command("import_tasks", str(path), stdout=StringIO())
+
+    def test_export_uses_constant_queries(self):
+        with self.assertNumQueries(2):
+            rows = list(iter_task_rows(chunk_size=100))
+        self.assertEqual(len(rows), 5)
+
+
+class SeedCommandTests(TestCase):
+    def seed(self, **options):
+        call_command(
+            "seed", positions=2, task_types=3, workers=12, tasks=40, assignees_per_task=3,
+            batch_size=15, stdout=StringIO(), **options
+        )
+
+    def test_creates_requested_volumes(self):
+        self.seed(password="pass123")
+
+        self.assertEqual(get_user_model().objects.count(), 12)
+        self.assertEqual(Task.objects.count(), 40)
+        self.assertEqual(TaskType.objects.count(), 3)
+        self.assertEqual(Task.assignees.through.objects.count(), 120)
+        self.assertFalse(Task.objects.annotate(n=Count("assignees")).exclude(n=3).exists())
+
+    def test_workers_share_one_password_hash(self):
+        self.seed(password="pass123")
+
+        hashes = set(get_user_model().objects.values_list("password", flat=True))
+        self.assertEqual(len(hashes), 1)
+        self.assertTrue(get_user_model().objects.first().check_password("pass123"))
+
+    def test_seeded_tasks_are_searchable(self):
+        self.seed()
+        task = Task.objects.first()
+        self.assertIn(task, search(Task.objects.all(), task.name))
+
+    def test_seeded_counters_match_a_recount(self):
+        def counters():
+            return [
+                list(model.objects.order_by("pk").values_list(*fields))
+                for model, fields in (
+                    (Worker, ["open_task_count", "completed_task_count", "overdue_task_count", "open_load"]),
+                    (TaskType, ["open_task_count", "completed_task_count", "overdue_task_count"]),
+                    (Position, ["worker_count"]),
+                    (WorkerDeadlineDay, ["worker_id", "day", "open_count"]),
+                    (TaskTypeDeadlineDay, ["task_type_id", "day", "open_count"]),
+                    (TaskTypeDailyStat, ["task_type_id", "day", "priority", "created", "completed", "overdue"]),
+                )
+            ]
+
+        # Frozen, so no seeded deadline passes between the seed and the recount.
+        with mock.patch("django.utils.timezone.now", return_value=timezone.now()):
+            self.seed()
+            self.seed()
+            seeded = counters()
+            recount_all()
+            rebuild_daily_stats()
+            self.assertEqual(counters(), seeded)
+
+    def test_large_loads_restore_dropped_indexes(self):
+        with connection.cursor() as cursor:
+            before = get_secondary_index_definitions(cursor, Task._meta.db_table)
+        with mock.patch("tasks.seeding.DEFER_INDEXES_THRESHOLD", 1):
+            self.seed()
+        with connection.cursor() as cursor:
+            self.assertCountEqual(get_secondary_index_definitions(cursor, Task._meta.db_table), before)
+        self.assertEqual(Task.objects.count(), 40)
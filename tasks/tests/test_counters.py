@@ -0,0 +1,173 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks import bulk
+from tasks.models import Position, Task, TaskType, WorkerDeadlineDay
+from tasks.tests.utils import TaskFactoryMixin
+
+
+class CounterTests(TaskFactoryMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.position = Position.objects.create(name="Developer")
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.worker = get_user_model().objects.create(username="alice", position=self.position)
+        self.other = get_user_model().objects.create(username="bob")
+
+    def assertCounts(self, obj, open_count, completed_count, overdue_count):
+        obj.refresh_from_db()
+        self.assertEqual(
+            (obj.open_task_count, obj.completed_task_count, obj.overdue_task_count),
+            (open_count, completed_count, overdue_count),
+        )
+
+    def test_assignee_changes_update_worker_counts(self):
+        task = self.create_task()
+        overdue = self.create_task(days=-1)
+        task.assignees.add(self.worker)
+        self.worker.assigned_tasks.add(overdue)
+        self.assertCounts(self.worker, 2, 0, 1)
+
+        task.assignees.remove(self.worker)
+        self.assertCounts(self.worker, 1, 0, 1)
+
+        overdue.assignees.clear()
+        self.assertCounts(self.worker, 0, 0, 0)
+
+    def test_removing_a_non_assignee_changes_nothing(self):
+        task = self.create_task(days=-1)
+        task.assignees.add(self.worker)
+        for days in (-1, 2):
+            self.create_task(days=days).assignees.add(self.worker, self.other)
+        Worker = get_user_model()
+        loads = {worker.pk: worker.open_load for worker in Worker.objects.all()}
+        days = dict(WorkerDeadlineDay.objects.filter(worker=self.other).values_list("day", "open_count"))
+
+        task.assignees.remove(self.other)
+        self.other.assigned_tasks.remove(task)
+        task.assignees.remove(self.other, self.worker)
+        self.assertCounts(self.other, 2, 0, 1)
+        self.assertCounts(self.worker, 2, 0, 1)
+        self.assertEqual(Worker.objects.get(pk=self.other.pk).open_load, loads[self.other.pk])
+        self.assertEqual(Worker.objects.get(pk=self.worker.pk).open_load, loads[self.worker.pk] - 2)
+        self.assertEqual(
+            dict(WorkerDeadlineDay.objects.filter(worker=self.other).values_list("day", "open_count")), days
+        )
+
+    def test_task_save_moves_counts(self):
+        task = self.create_task(days=-1)
+        task.assignees.add(self.worker)
+        self.assertCounts(self.task_type, 1, 0, 1)
+
+        task.is_completed = True
+        task.save()
+        self.assertCounts(self.worker, 0, 1, 0)
+        self.assertCounts(self.task_type, 0, 1, 0)
+
+        feature = TaskType.objects.create(name="Feature")
+        task.task_type = feature
+        task.save()
+        self.assertCounts(self.task_type, 0, 0, 0)
+        self.assertCounts(feature, 0, 1, 0)
+
+    def test_task_changes_apply_deltas_without_counting(self):
+        task = self.create_task()
+        task.assignees.add(self.worker, self.other)
+        with CaptureQueriesContext(connection) as queries:
+            task.priority = Task.PriorityChoices.URGENT
+            task.deadline = timezone.now() - timedelta(days=1)
+            task.save()
+            task.assignees.remove(self.other)
+        counter_updates = [
+            query["sql"] for query in queries
+            if query["sql"].startswith(('UPDATE "tasks_worker"', 'UPDATE "tasks_tasktype"'))
+        ]
+        self.assertEqual(len(counter_updates), 3)
+        self.assertFalse([sql for sql in counter_updates if "COUNT(" in sql])
+        self.assertCounts(self.worker, 1, 0, 1)
+        self.assertCounts(self.other, 0, 0, 0)
+        self.worker.refresh_from_db()
+        self.assertEqual(self.worker.open_load, 4)
+
+    def test_task_delete_updates_counts(self):
+        task = self.create_task()
+        task.assignees.add(self.worker)
+        task.delete()
+        self.assertCounts(self.worker, 0, 0, 0)
+        self.assertCounts(self.task_type, 0, 0, 0)
+
+    def test_bulk_operations_update_counts(self):
+        tasks = [self.create_task() for _ in range(3)]
+        ids = [task.pk for task in tasks]
+        bulk.add_assignees(ids, [self.worker, self.other])
+        self.assertCounts(self.other, 3, 0, 0)
+
+        bulk.complete_tasks(ids[:2])
+        self.assertCounts(self.worker, 1, 2, 0)
+        self.assertCounts(self.task_type, 1, 2, 0)
+
+        bulk.remove_assignees(ids, [self.other])
+        self.assertCounts(self.other, 0, 0, 0)
+
+        bulk.delete_tasks(ids)
+        self.assertCounts(self.worker, 0, 0, 0)
+        self.assertCounts(self.task_type, 0, 0, 0)
+
+    def test_position_worker_count(self):
+        self.position.refresh_from_db()
+        self.assertEqual(self.position.worker_count, 1)
+
+        self.other.position = self.position
+        self.other.save()
+        self.position.refresh_from_db()
+        self.assertEqual(self.position.worker_count, 2)
+
+        self.worker.delete()
+        self.position.refresh_from_db()
+        self.assertEqual(self.position.worker_count, 1)
+
+    def test_recount_repairs_drift(self):
+        task = self.create_task(days=1)
+        task.assignees.add(self.worker)
+        # Deadlines passing and raw updates bypass the signals.
+        Task.objects.filter(pk=task.pk).update(deadline=timezone.now() - timedelta(days=1))
+        self.assertCounts(self.worker, 1, 0, 0)
+
+        out = StringIO()
+        call_command("recount", stdout=out)
+        self.assertCounts(self.worker, 1, 0, 1)
+        self.assertCounts(self.task_type, 1, 0, 1)
+        self.assertIn("2 workers", out.getvalue())
+
+
+class WorkloadOrderingTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="admin")
+        self.client.force_login(self.user)
+        task_type = TaskType.objects.create(name="Bug")
+        self.busy = get_user_model().objects.create(username="zed")
+        for _ in range(2):
+            task = Task.objects.create(
+                name="Task", description="Desc", deadline=timezone.now() + timedelta(days=1), task_type=task_type
+            )
+            task.assignees.add(self.busy)
+
+    def test_worker_list_orders_by_open_tasks(self):
+        response = self.client.get(reverse("tasks:worker-list"), {"ordering": "workload"})
+        self.assertEqual(response.context["worker_list"][0], self.busy)
+
+    def test_cursor_pagination_follows_ordering(self):
+        response = self.client.get(reverse("tasks:worker-list"), {"ordering": "workload", "cursor": ""})
+        self.assertEqual(list(response.context["worker_list"]), [self.busy, self.user])
+
+    def test_unknown_ordering_is_ignored(self):
+        response = self.client.get(reverse("tasks:worker-list"), {"ordering": "password"})
+        self.assertEqual(list(response.context["worker_list"]), [self.user, self.busy])
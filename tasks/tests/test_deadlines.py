@@ -0,0 +1,93 @@
+import warnings
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks import bulk
+from tasks.counters import recount_all
+from tasks.deadlines import task_type_deadline_buckets, worker_deadline_buckets
+from tasks.models import Task, TaskType, TaskTypeDeadlineDay, WorkerDeadlineDay
+from tasks.tests.utils import TaskFactoryMixin
+
+
+class DeadlineBucketTests(TaskFactoryMixin, TestCase):
+    deadline_at_noon = True
+
+    def setUp(self):
+        super().setUp()
+        self.today = timezone.localdate()
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.worker = get_user_model().objects.create(username="alice")
+        self.tasks = {
+            name: self.create_task([self.worker], days)
+            for name, days in (("overdue", -2), ("today", 0), ("this_week", 3), ("later", 30))
+        }
+        self.create_task([self.worker], -1, is_completed=True)
+
+    def test_buckets_count_open_tasks(self):
+        expected = {"overdue": 1, "today": 1, "this_week": 1, "later": 1}
+        self.assertEqual(worker_deadline_buckets(self.worker.pk, self.today), expected)
+        summary = task_type_deadline_buckets(self.today)
+        self.assertEqual(summary["deadline_totals"], expected)
+        self.assertEqual(summary["task_type_deadlines"][0]["task_type__name"], "Bug")
+
+    def test_buckets_follow_the_current_date(self):
+        buckets = worker_deadline_buckets(self.worker.pk, self.today + timedelta(days=5))
+        self.assertEqual(buckets, {"overdue": 3, "today": 0, "this_week": 0, "later": 1})
+
+    def test_task_changes_refresh_deadline_days(self):
+        task = self.tasks["later"]
+        task.deadline -= timedelta(days=29)
+        task.save()
+        self.assertEqual(worker_deadline_buckets(self.worker.pk, self.today)["this_week"], 2)
+
+        bulk.complete_tasks([self.tasks["overdue"].pk])
+        self.assertEqual(worker_deadline_buckets(self.worker.pk, self.today)["overdue"], 0)
+        self.assertEqual(task_type_deadline_buckets(self.today)["deadline_totals"]["overdue"], 0)
+
+        self.tasks["today"].assignees.remove(self.worker)
+        self.assertEqual(worker_deadline_buckets(self.worker.pk, self.today)["today"], 0)
+
+    def test_single_changes_apply_deltas_matching_a_rebuild(self):
+        other = get_user_model().objects.create(username="bob")
+        feature = TaskType.objects.create(name="Feature")
+        task = self.tasks["today"]
+        task.assignees.add(other)
+        task.deadline += timedelta(days=3)
+        task.task_type = feature
+        task.save()
+        self.tasks["this_week"].delete()
+        other.assigned_tasks.add(self.tasks["later"])
+        self.worker.assigned_tasks.clear()
+
+        def rows():
+            return (
+                set(WorkerDeadlineDay.objects.values_list("worker_id", "day", "open_count")),
+                set(TaskTypeDeadlineDay.objects.values_list("task_type_id", "day", "open_count")),
+            )
+
+        maintained = rows()
+        recount_all()
+        self.assertEqual(maintained, rows())
+        self.assertFalse(WorkerDeadlineDay.objects.filter(worker=self.worker).exists())
+
+    def test_recount_rebuilds_rows(self):
+        WorkerDeadlineDay.objects.all().delete()
+        recount_all()
+        self.assertEqual(WorkerDeadlineDay.objects.filter(worker=self.worker).count(), 4)
+
+    def test_dashboard_and_worker_page_show_buckets(self):
+        self.client.force_login(self.worker)
+        response = self.client.get(reverse("tasks:index"))
+        self.assertEqual(response.context["deadline_totals"]["overdue"], 1)
+        response = self.client.get(reverse("tasks:worker-detail", args=[self.worker.pk]))
+        self.assertEqual(response.context["deadline_buckets"]["later"], 1)
+
+    def test_upcoming_compares_aware_datetimes(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", RuntimeWarning)
+            upcoming = list(Task.objects.upcoming())
+        self.assertEqual(upcoming, [self.tasks["today"], self.tasks["this_week"]])
@@ -1,4 +1,5 @@
 from django.test import TestCase
+from django.urls import reverse
 from django.contrib.auth import get_user_model
 from tasks.models import TaskType, Position
 from tasks.forms import (
@@ -115,3 +116,48 @@ class WorkerUsernameSearchFormTests(TestCase):
     def test_empty_username_search(self):
         form = WorkerUsernameSearchForm(data={"username": ""})
         self.assertTrue(form.is_valid())
+
+
+class TaskFormAssigneeWidgetTests(TestCase):
+    def setUp(self):
+        self.position = Position.objects.create(name="Developer")
+        self.workers = [
+            get_user_model().objects.create(username=f"worker{i}", position=self.position)
+            for i in range(10)
+        ]
+
+    def test_renders_only_selected_workers(self):
+        form = TaskForm(initial={"assignees": [self.workers[3].pk]})
+        with self.assertNumQueries(2):  # task types, selected workers with positions
+            html = form.as_p()
+        self.assertIn(str(self.workers[3]), html)
+        self.assertNotIn("worker4", html)
+        self.assertIn("data-autocomplete-url", html)
+
+    def test_validates_submitted_ids(self):
+        task_type = TaskType.objects.create(name="Bug")
+        data = {
+            "name": "Task",
+            "description": "Desc",
+            "deadline": "2030-01-01T10:00",
+            "priority": "Low",
+            "task_type": task_type.pk,
+            "assignees": [self.workers[0].pk, 0],
+        }
+        form = TaskForm(data=data)
+        self.assertFalse(form.is_valid())
+        self.assertIn("assignees", form.errors)
+
+    def test_renders_non_integer_ids_as_errors(self):
+        self.client.force_login(self.workers[0])
+        response = self.client.post(reverse("tasks:task-create"), {
+            "name": "Task",
+            "description": "Desc",
+            "deadline": "2030-01-01T10:00",
+            "priority": "Low",
+            "task_type": TaskType.objects.create(name="Bug").pk,
+            "assignees": ["abc", self.workers[1].pk],
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("assignees", response.context["form"].errors)
+        self.assertContains(response, "worker1")
@@ -0,0 +1,188 @@
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks import jobs
+from tasks.models import Job, Task, TaskReminder, TaskType
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        self.calls = []
+        jobs.handlers["test_job"] = self.handler
+        self.addCleanup(jobs.handlers.pop, "test_job")
+
+    def handler(self, job):
+        self.calls.append(job.payload)
+        if job.payload.get("fail"):
+            raise RuntimeError("boom")
+        return {"ok": True}
+
+    def test_runs_queued_jobs_in_order(self):
+        first = jobs.enqueue("test_job", {"n": 1})
+        jobs.enqueue("test_job", {"n": 2})
+        jobs.enqueue("test_job", {"n": 3}, run_after=timezone.now() + timedelta(hours=1))
+
+        self.assertEqual(jobs.run_pending("test"), 2)
+        self.assertEqual(self.calls, [{"n": 1}, {"n": 2}])
+        first.refresh_from_db()
+        self.assertEqual(first.status, Job.Status.DONE)
+        self.assertEqual(first.result, {"ok": True})
+        self.assertEqual(first.attempts, 1)
+        self.assertIsNotNone(first.duration)
+
+    def test_unknown_kind_is_rejected(self):
+        with self.assertRaises(ValueError):
+            jobs.enqueue("no_such_job")
+
+    def test_dedupe_key_allows_one_pending_job(self):
+        self.assertIsNotNone(jobs.enqueue("test_job", dedupe_key="nightly"))
+        self.assertIsNone(jobs.enqueue("test_job", dedupe_key="nightly"))
+        jobs.run_pending("test")
+        self.assertIsNotNone(jobs.enqueue("test_job", dedupe_key="nightly"))
+
+    @override_settings(JOB_MAX_ATTEMPTS=2, JOB_RETRY_BASE_SECONDS=30)
+    def test_failures_are_retried_with_backoff(self):
+        job = jobs.enqueue("test_job", {"fail": True})
+        with self.assertLogs("tasks.jobs", level="WARNING"):
+            jobs.run_pending("test")
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertIn("boom", job.last_error)
+        self.assertGreater(job.run_after, timezone.now() + timedelta(seconds=20))
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        with self.assertLogs("tasks.jobs", level="WARNING"):
+            jobs.run_pending("test")
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_stale_running_jobs_are_requeued(self):
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        job = jobs.enqueue("test_job")
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.Status.RUNNING, attempts=1, started_at=an_hour_ago, heartbeat_at=an_hour_ago
+        )
+        # Long-running jobs stay put as long as their worker keeps beating.
+        alive = jobs.enqueue("test_job")
+        Job.objects.filter(pk=alive.pk).update(
+            status=Job.Status.RUNNING, attempts=1, started_at=an_hour_ago, heartbeat_at=timezone.now()
+        )
+        self.assertEqual(jobs.requeue_stale(), 1)
+        job.refresh_from_db()
+        alive.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertEqual(alive.status, Job.Status.RUNNING)
+
+    @override_settings(JOB_HEARTBEAT_SECONDS=0.01)
+    def test_running_jobs_send_heartbeats(self):
+        jobs.handlers["test_job"] = lambda job: time.sleep(0.1)
+        job = jobs.enqueue("test_job")
+        with mock.patch("tasks.jobs.touch_heartbeat") as touch:
+            jobs.run_pending("test")
+        touch.assert_called_with(job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.DONE)
+        self.assertIsNotNone(job.heartbeat_at)
+
+    @override_settings(PERIODIC_JOBS={"recount": 3600})
+    def test_periodic_jobs_wait_one_interval_after_the_last_run(self):
+        now = timezone.now()
+        jobs.schedule_periodic(now)
+        jobs.schedule_periodic(now)
+        self.assertEqual(Job.objects.filter(kind="recount").count(), 1)
+
+        jobs.run_pending("test")
+        jobs.schedule_periodic(now)
+        pending = Job.objects.get(kind="recount", status=Job.Status.QUEUED)
+        self.assertGreater(pending.run_after, now + timedelta(minutes=59))
+
+    def test_run_worker_once(self):
+        jobs.enqueue("test_job", {"n": 1})
+        out = StringIO()
+        call_command("run_worker", "--once", "--no-schedule", stdout=out)
+        self.assertEqual(self.calls, [{"n": 1}])
+        self.assertIn("Processed 1 job(s)", out.getvalue())
+
+
+class DeadlineReminderTests(TestCase):
+    def setUp(self):
+        self.worker = get_user_model().objects.create(username="alice")
+        task_type = TaskType.objects.create(name="Bug")
+        self.soon = Task.objects.create(
+            name="Soon", description="Desc", deadline=timezone.now() + timedelta(hours=2), task_type=task_type
+        )
+        later = Task.objects.create(
+            name="Later", description="Desc", deadline=timezone.now() + timedelta(days=5), task_type=task_type
+        )
+        self.soon.assignees.add(self.worker)
+        later.assignees.add(self.worker)
+
+    def run_reminders(self):
+        jobs.enqueue("send_deadline_reminders")
+        jobs.run_pending("test")
+        return Job.objects.filter(kind="send_deadline_reminders").latest("id").result["reminders"]
+
+    def test_reminds_each_assignee_once_per_deadline(self):
+        self.assertEqual(self.run_reminders(), 1)
+        self.assertEqual(TaskReminder.objects.get().task, self.soon)
+        self.assertEqual(self.run_reminders(), 0)
+
+        self.soon.deadline += timedelta(hours=1)
+        self.soon.save()
+        self.assertEqual(self.run_reminders(), 1)
+
+
+class ExportJobTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.user = get_user_model().objects.create(username="admin")
+        self.client.force_login(self.user)
+        task_type = TaskType.objects.create(name="Bug")
+        for i in range(3):
+            Task.objects.create(
+                name=f"Task {i}", description="Desc", deadline=timezone.now(), task_type=task_type,
+                is_completed=i == 0,
+            )
+
+    def test_export_runs_in_the_background(self):
+        response = self.client.post(reverse("tasks:task-export-job"), {"format": "csv", "status": "pending"})
+        job = Job.objects.get(kind="export_tasks")
+        self.assertRedirects(response, reverse("tasks:job-detail", args=[job.pk]))
+        self.assertContains(self.client.get(reverse("tasks:job-detail", args=[job.pk])), "Queued")
+        self.assertEqual(self.client.get(reverse("tasks:job-download", args=[job.pk])).status_code, 404)
+
+        jobs.run_pending("test")
+        response = self.client.get(reverse("tasks:job-download", args=[job.pk]))
+        body = b"".join(response.streaming_content).decode()
+        self.assertEqual(body.count("\n"), 3)
+        self.assertIn("Task 1", body)
+        self.assertNotIn("Task 0", body)
+
+    def test_jobs_are_private_to_their_creator(self):
+        job = jobs.enqueue("export_tasks", {"format": "csv"}, created_by=self.user)
+        self.client.force_login(get_user_model().objects.create(username="other"))
+        self.assertEqual(self.client.get(reverse("tasks:job-detail", args=[job.pk])).status_code, 404)
+
+    def test_rejects_unknown_format(self):
+        response = self.client.post(reverse("tasks:task-export-job"), {"format": "<script>alert(1)</script>"})
+        self.assertEqual(response.status_code, 400)
+        self.assertNotContains(response, "<script>", status_code=400)
+
+    def test_metrics_include_job_gauges(self):
+        jobs.enqueue("export_tasks", {"format": "csv"})
+        body = self.client.get(reverse("tasks:metrics")).content.decode()
+        self.assertIn('taskflow_jobs{kind="export_tasks",status="queued"} 1', body)
+        self.assertIn('taskflow_job_queue_lag_seconds{kind="export_tasks"}', body)
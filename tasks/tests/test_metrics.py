@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tasks.metrics import registry
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        registry.reset()
+        self.user = get_user_model().objects.create(username="admin")
+        self.client.force_login(self.user)
+
+    def test_records_requests_per_url_name(self):
+        self.client.get(reverse("tasks:task-list"))
+        self.client.get(reverse("tasks:task-list"))
+
+        metrics = registry.views["tasks:task-list"]
+        self.assertEqual(metrics.requests["GET", 200], 2)
+        self.assertEqual(metrics.latency_count, 2)
+        self.assertGreater(metrics.queries, 0)
+        self.assertGreater(metrics.template_seconds, 0)
+
+    def test_unresolved_requests_are_grouped(self):
+        self.client.get("/no-such-page/")
+        self.assertEqual(registry.views["<unresolved>"].requests["GET", 404], 1)
+
+    def test_metrics_endpoint_renders_prometheus_text(self):
+        self.client.get(reverse("tasks:index"))
+        response = self.client.get(reverse("tasks:metrics"))
+
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('taskflow_requests_total{view="tasks:index",method="GET",status="200"} 1', body)
+        self.assertIn('taskflow_request_duration_seconds_count{view="tasks:index"} 1', body)
+        self.assertIn("# TYPE taskflow_db_queries_total counter", body)
+
+    def test_metrics_endpoint_is_restricted(self):
+        response = self.client.get(reverse("tasks:metrics"), REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_metrics_endpoint_accepts_token(self):
+        url = reverse("tasks:metrics")
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.assertEqual(self.client.get(url, headers={"authorization": "Bearer s3cret"}).status_code, 200)
+
+    @override_settings(SLOW_REQUEST_THRESHOLD_MS=0)
+    def test_logs_slow_requests_with_top_queries(self):
+        with self.assertLogs("tasks.requests", level="WARNING") as logs:
+            self.client.get(reverse("tasks:task-list"))
+        self.assertIn("tasks:task-list", logs.output[0])
+        self.assertIn("SELECT", logs.output[0])
@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Task, TaskType
+from tasks.pagination import CursorPaginator, InvalidCursor
+
+
+class CursorPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        task_type = TaskType.objects.create(name="Bug")
+        deadline = timezone.now() + timedelta(days=1)
+        for i in range(12):
+            Task.objects.create(
+                name=f"Task {i}",
+                description="Desc",
+                # duplicate deadlines and priorities exercise the id tie-breaker
+                deadline=deadline + timedelta(days=i // 4),
+                priority=Task.PriorityChoices.MEDIUM if i % 2 else Task.PriorityChoices.HIGH,
+                task_type=task_type,
+            )
+        cls.expected = list(Task.objects.order_by("deadline", "priority", "id"))
+
+    def setUp(self):
+        self.paginator = CursorPaginator(Task.objects.all(), 5, ["deadline", "priority", "id"])
+
+    def test_walk_forward_and_back(self):
+        first = self.paginator.page()
+        self.assertFalse(first.has_previous())
+        second = self.paginator.page(first.next_cursor)
+        third = self.paginator.page(second.next_cursor)
+        self.assertFalse(third.has_next())
+        self.assertEqual(
+            list(first) + list(second) + list(third),
+            self.expected,
+        )
+
+        back = self.paginator.page(third.previous_cursor)
+        self.assertEqual(list(back), list(second))
+        self.assertEqual(list(self.paginator.page(back.previous_cursor)), list(first))
+
+    def test_page_queries_do_not_count(self):
+        cursor = self.paginator.page().next_cursor
+        with self.assertNumQueries(1):
+            self.paginator.page(cursor)
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(InvalidCursor):
+            self.paginator.page("not-a-cursor")
+
+
+class CursorPaginationViewTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="admin")
+        for i in range(6):
+            get_user_model().objects.create(username=f"worker{i}")
+        self.client.force_login(self.user)
+
+    def test_offset_pagination_is_default(self):
+        response = self.client.get(reverse("tasks:worker-list"))
+        self.assertFalse(response.context["cursor_pagination"])
+        self.assertIsNotNone(response.context["paginator"])
+
+    def test_cursor_pagination_opt_in(self):
+        url = reverse("tasks:worker-list")
+        response = self.client.get(url, {"cursor": ""})
+        self.assertTrue(response.context["cursor_pagination"])
+        self.assertEqual(len(response.context["worker_list"]), 5)
+        next_cursor = response.context["page_obj"].next_cursor
+        self.assertContains(response, f"?cursor={next_cursor}")
+
+        response = self.client.get(url, {"cursor": next_cursor})
+        self.assertEqual(
+            [worker.username for worker in response.context["worker_list"]],
+            ["worker4", "worker5"],
+        )
+
+    def test_cursor_keeps_search_params(self):
+        response = self.client.get(reverse("tasks:worker-list"), {"username": "worker", "cursor": ""})
+        next_cursor = response.context["page_obj"].next_cursor
+        self.assertContains(response, f"?username=worker&amp;cursor={next_cursor}")
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(reverse("tasks:task-list"), {"cursor": "garbage"})
+        self.assertEqual(response.status_code, 404)
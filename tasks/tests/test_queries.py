@@ -0,0 +1,77 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Position, Task, TaskType
+from tasks.views import TaskListView
+
+
+class QueryCountMixin:
+    def count_queries(self, func):
+        with CaptureQueriesContext(connection) as ctx:
+            func()
+        return len(ctx.captured_queries)
+
+    def assertConstantQueries(self, func, sizes):
+        counts = {size: self.count_queries(lambda: func(size)) for size in sizes}
+        self.assertEqual(
+            len(set(counts.values())), 1,
+            f"Query count depends on size: {counts}"
+        )
+        return next(iter(counts.values()))
+
+
+class TaskListQueryTests(QueryCountMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="admin")
+        position = Position.objects.create(name="Developer")
+        task_type = TaskType.objects.create(name="Bug")
+        workers = [
+            get_user_model().objects.create(username=f"worker{i}", position=position)
+            for i in range(3)
+        ]
+        for i in range(30):
+            task = Task.objects.create(
+                name=f"Task {i}",
+                description="Desc",
+                deadline=timezone.now() + timedelta(days=i),
+                task_type=task_type,
+            )
+            task.assignees.set(workers[: i % 4])
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_for_list_query_count(self):
+        def evaluate(size):
+            for task in Task.objects.for_list()[:size]:
+                str(task.task_type)
+                for worker in task.assignees.all():
+                    str(worker)
+
+        with self.assertNumQueries(2):
+            evaluate(30)
+        self.assertConstantQueries(evaluate, (1, 5, 30))
+
+    def test_task_list_view_query_count_is_constant(self):
+        def render_page(size):
+            with mock.patch.object(TaskListView, "paginate_by", size):
+                response = self.client.get(reverse("tasks:task-list"))
+            self.assertEqual(len(response.context["task_list"]), size)
+
+        self.assertConstantQueries(render_page, (1, 5, 25))
+
+    def test_task_detail_view_query_count(self):
+        task = Task.objects.filter(assignees__isnull=False).first()
+        count = self.count_queries(
+            lambda: self.client.get(reverse("tasks:task-detail", args=[task.pk]))
+        )
+        # session, user, task with type, assignees with positions, history
+        self.assertEqual(count, 5)
@@ -0,0 +1,178 @@
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tasks.models import Job, Position, Task, TaskType
+from tasks.seeding import FixtureGenerator
+from tasks.urls import urlpatterns
+
+# Multiply to rehearse with production-like volumes, e.g. TASKS_BENCHMARK_SCALE=1000
+SCALE = int(os.environ.get("TASKS_BENCHMARK_SCALE", 1))
+
+# Exact query count per (url name, method). Every view in tasks/urls.py needs
+# an entry; a changed count means a template or view now touches the
+# database differently, so update the number only after checking why.
+QUERY_BUDGETS = {
+    ("index", "get"): 7,
+    ("task-list", "get"): 5,
+    ("task-bulk", "post"): 17,
+    ("task-export", "get"): 4,
+    ("task-export-job", "post"): 3,
+    ("task-create", "get"): 3,
+    ("task-create", "post"): 18,
+    ("task-update", "get"): 6,
+    ("task-update", "post"): 35,
+    ("task-suggest-assignees", "get"): 7,
+    ("task-delete", "get"): 3,
+    ("task-delete", "post"): 16,
+    ("task-detail", "get"): 5,
+    ("worker-list", "get"): 4,
+    ("worker-autocomplete", "get"): 3,
+    ("worker-create", "get"): 3,
+    ("worker-create", "post"): 10,
+    ("worker-update", "get"): 4,
+    ("worker-update", "post"): 9,
+    ("worker-delete", "get"): 4,
+    ("worker-delete", "post"): 17,
+    ("worker-detail", "get"): 6,
+    ("worker-tasks", "get"): 4,
+    ("api-task-list", "get"): 6,
+    ("api-task-detail", "get"): 5,
+    ("api-worker-list", "get"): 5,
+    ("api-worker-detail", "get"): 4,
+    ("api-task-type-list", "get"): 5,
+    ("api-task-type-detail", "get"): 4,
+    ("api-position-list", "get"): 5,
+    ("api-position-detail", "get"): 4,
+    ("api-changes", "get"): 8,
+    ("capacity-report", "get"): 4,
+    ("capacity-export", "get"): 4,
+    ("metrics", "get"): 1,
+    ("job-detail", "get"): 3,
+    ("job-download", "get"): 3,
+    ("async-index", "get"): 7,
+    ("async-task-list", "get"): 5,
+    ("async-task-detail", "get"): 5,
+    ("async-worker-detail", "get"): 6,
+}
+
+
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        FixtureGenerator(seed=1).run(
+            positions=3, task_types=4, workers=30 * SCALE, tasks=60 * SCALE, assignees_per_task=3
+        )
+        cls.user = get_user_model().objects.create(username="admin")
+        cls.task = Task.objects.filter(assignees__isnull=False).first()
+        cls.worker = get_user_model().objects.filter(assigned_tasks__isnull=False).first()
+        cls.other_worker = get_user_model().objects.exclude(assigned_tasks=cls.task).exclude(pk=cls.user.pk).first()
+        cls.task_type = TaskType.objects.first()
+        cls.position = Position.objects.first()
+        media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, media_root)
+        # Serve the just-created rows from the changes feed instead of holding them back.
+        cls.enterClassContext(override_settings(MEDIA_ROOT=media_root, SYNC_SAFETY_LAG_SECONDS=0))
+        path = default_storage.save("exports/budget.csv", ContentFile(b"id\n"))
+        cls.job = Job.objects.create(
+            kind="export_tasks", status=Job.Status.DONE, result={"path": path, "rows": 0}, created_by=cls.user
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def task_form_data(self):
+        return {
+            "name": "Budgeted task",
+            "description": "Desc",
+            "deadline": "2030-01-01T10:00",
+            "priority": "High",
+            "task_type": self.task_type.pk,
+            "assignees": [self.other_worker.pk],
+        }
+
+    def worker_form_data(self):
+        return {
+            "username": self.worker.username,
+            "first_name": "First",
+            "last_name": "Last",
+            "email": "first@example.com",
+            "position": self.position.pk,
+        }
+
+    def get_cases(self):
+        task, worker = self.task, self.worker
+        tasks = list(Task.objects.values_list("pk", flat=True)[:5])
+        return {
+            ("index", "get"): ((), {}),
+            ("task-list", "get"): ((), {}),
+            ("task-bulk", "post"): ((), {"tasks": tasks, "action": "complete"}),
+            ("task-export", "get"): ((), {"format": "csv"}),
+            ("task-export-job", "post"): ((), {"format": "csv", "status": "pending"}),
+            ("task-create", "get"): ((), {}),
+            ("task-create", "post"): ((), self.task_form_data()),
+            ("task-update", "get"): ((task.pk,), {}),
+            ("task-update", "post"): ((task.pk,), self.task_form_data()),
+            ("task-suggest-assignees", "get"): ((), {"task_type": self.task_type.pk, "deadline": "2030-01-01T10:00"}),
+            ("task-delete", "get"): ((task.pk,), {}),
+            ("task-delete", "post"): ((task.pk,), {}),
+            ("task-detail", "get"): ((task.pk,), {}),
+            ("worker-list", "get"): ((), {}),
+            ("worker-autocomplete", "get"): ((), {"q": "worker"}),
+            ("worker-create", "get"): ((), {}),
+            ("worker-create", "post"): ((), dict(
+                self.worker_form_data(), username="newworker", password1="Str0ng-pass!", password2="Str0ng-pass!"
+            )),
+            ("worker-update", "get"): ((worker.pk,), {}),
+            ("worker-update", "post"): ((worker.pk,), self.worker_form_data()),
+            ("worker-delete", "get"): ((worker.pk,), {}),
+            ("worker-delete", "post"): ((worker.pk,), {}),
+            ("worker-detail", "get"): ((worker.pk,), {}),
+            ("worker-tasks", "get"): ((worker.pk, "open"), {}),
+            ("api-task-list", "get"): ((), {}),
+            ("api-task-detail", "get"): ((task.pk,), {}),
+            ("api-worker-list", "get"): ((), {}),
+            ("api-worker-detail", "get"): ((worker.pk,), {}),
+            ("api-task-type-list", "get"): ((), {}),
+            ("api-task-type-detail", "get"): ((self.task_type.pk,), {}),
+            ("api-position-list", "get"): ((), {}),
+            ("api-position-detail", "get"): ((self.position.pk,), {}),
+            ("api-changes", "get"): ((), {}),
+            ("capacity-report", "get"): ((), {}),
+            ("capacity-export", "get"): ((), {}),
+            ("metrics", "get"): ((), {}),
+            ("job-detail", "get"): ((self.job.pk,), {}),
+            ("job-download", "get"): ((self.job.pk,), {}),
+            ("async-index", "get"): ((), {}),
+            ("async-task-list", "get"): ((), {}),
+            ("async-task-detail", "get"): ((task.pk,), {}),
+            ("async-worker-detail", "get"): ((worker.pk,), {}),
+        }
+
+    def request(self, name, method, args, data):
+        response = getattr(self.client, method)(reverse(f"tasks:{name}", args=args), data)
+        if response.streaming:
+            b"".join(response.streaming_content)
+        return response
+
+    def test_every_view_has_a_budget(self):
+        names = {pattern.name for pattern in urlpatterns}
+        self.assertEqual(names - {name for name, _ in QUERY_BUDGETS}, set())
+
+    def test_views_stay_within_query_budget(self):
+        for (name, method), (args, data) in self.get_cases().items():
+            with self.subTest(view=name, method=method), transaction.atomic():
+                cache.clear()
+                with self.assertNumQueries(QUERY_BUDGETS[name, method]):
+                    response = self.request(name, method, args, data)
+                self.assertLess(response.status_code, 400)
+                transaction.set_rollback(True)
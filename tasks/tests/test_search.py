@@ -0,0 +1,84 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Task, TaskType
+from tasks.search import (
+    IContainsSearchBackend,
+    SQLiteFTSSearchBackend,
+    get_search_backend,
+    search,
+)
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        task_type = TaskType.objects.create(name="Bug")
+        self.login_task = Task.objects.create(
+            name="Fix login bug",
+            description="Users cannot sign in",
+            deadline=timezone.now() + timedelta(days=1),
+            task_type=task_type,
+        )
+        self.report_task = Task.objects.create(
+            name="Quarterly report",
+            description="Collect the login statistics",
+            deadline=timezone.now() + timedelta(days=2),
+            task_type=task_type,
+        )
+
+    def test_searches_name_and_description(self):
+        self.assertEqual(set(search(Task.objects.all(), "LOGIN")), {self.login_task, self.report_task})
+        self.assertEqual(list(search(Task.objects.all(), "sign in")), [self.login_task])
+
+    def test_short_terms_fall_back_to_icontains(self):
+        self.assertEqual(list(search(Task.objects.all(), "Qu")), [self.report_task])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.login_task.name = "Fix logout bug"
+        self.login_task.description = "Session is kept"
+        self.login_task.save()
+        self.assertEqual(list(search(Task.objects.all(), "login")), [self.report_task])
+        self.report_task.delete()
+        self.assertEqual(list(search(Task.objects.all(), "login")), [])
+
+    def test_matches_icontains_backend(self):
+        for term in ("bug", "report", "stat", "missing"):
+            self.assertEqual(
+                set(get_search_backend().search(Task.objects.all(), term)),
+                set(IContainsSearchBackend().search(Task.objects.all(), term)),
+            )
+
+    def test_rebuild_command(self):
+        Task.objects.filter(pk=self.login_task.pk).update(name="Renamed outside signals")
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertEqual(list(search(Task.objects.all(), "renamed")), [self.login_task])
+
+    def test_default_backend_for_sqlite(self):
+        if connection.vendor == "sqlite":
+            self.assertIsInstance(get_search_backend(), SQLiteFTSSearchBackend)
+
+    @override_settings(TASKS_SEARCH_BACKEND="tasks.search.IContainsSearchBackend")
+    def test_backend_setting(self):
+        self.assertIsInstance(get_search_backend(), IContainsSearchBackend)
+
+
+class WorkerSearchTests(TestCase):
+    def setUp(self):
+        self.admin = get_user_model().objects.create_superuser(username="admin", password="pass")
+        self.worker = get_user_model().objects.create(username="jdoe", first_name="Jane")
+        self.client.force_login(self.admin)
+
+    def test_worker_list_search(self):
+        response = self.client.get(reverse("tasks:worker-list"), {"username": "jane"})
+        self.assertEqual(list(response.context["worker_list"]), [self.worker])
+
+    def test_admin_uses_search_backend(self):
+        response = self.client.get(reverse("admin:tasks_worker_changelist"), {"q": "jane"})
+        self.assertEqual(list(response.context["cl"].result_list), [self.worker])
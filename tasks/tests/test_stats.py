@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Task, TaskType
+from tasks.stats import get_dashboard_stats
+
+
+class DashboardStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.worker = get_user_model().objects.create(username="worker1")
+        for priority in Task.PriorityChoices:
+            Task.objects.create(
+                name=f"{priority} task",
+                description="Desc",
+                deadline=timezone.now() + timedelta(days=1),
+                priority=priority,
+                task_type=self.task_type,
+                is_completed=priority == Task.PriorityChoices.LOW,
+            )
+
+    def test_counts_every_priority(self):
+        stats = get_dashboard_stats()
+        self.assertEqual(stats["num_tasks"], 4)
+        self.assertEqual(stats["num_completed_tasks"], 1)
+        self.assertEqual(stats["num_workers"], 1)
+        for priority in Task.PriorityChoices:
+            self.assertEqual(stats[f"priority_{priority.name.lower()}"], 1)
+
+    def test_stats_are_cached(self):
+        get_dashboard_stats()
+        with self.assertNumQueries(0):
+            get_dashboard_stats()
+
+    def test_task_changes_invalidate_cache(self):
+        get_dashboard_stats()
+        task = Task.objects.get(priority=Task.PriorityChoices.URGENT)
+        task.is_completed = True
+        with self.captureOnCommitCallbacks(execute=True):
+            task.save()
+        self.assertEqual(get_dashboard_stats()["num_completed_tasks"], 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            task.delete()
+        self.assertEqual(get_dashboard_stats()["num_tasks"], 3)
+
+    def test_worker_changes_invalidate_cache(self):
+        get_dashboard_stats()
+        with self.captureOnCommitCallbacks(execute=True):
+            get_user_model().objects.create(username="worker2")
+        self.assertEqual(get_dashboard_stats()["num_workers"], 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.worker.delete()
+        self.assertEqual(get_dashboard_stats()["num_workers"], 1)
+
+    def test_cache_is_invalidated_after_commit(self):
+        get_dashboard_stats()
+        with self.captureOnCommitCallbacks() as callbacks:
+            Task.objects.filter(priority=Task.PriorityChoices.URGENT).get().delete()
+            get_dashboard_stats()
+        # Until the commit other connections still see four tasks, so the entry must survive it.
+        self.assertEqual(get_dashboard_stats()["num_tasks"], 4)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(get_dashboard_stats()["num_tasks"], 3)
+
+    def test_index_view_context(self):
+        response = self.client.get(reverse("tasks:index"))
+        self.assertEqual(response.context["num_tasks"], 4)
+        self.assertEqual(response.context["priority_urgent"], 1)
@@ -1,5 +1,9 @@
+import json
+
+from django.core.cache import cache
 from django.test import TestCase, Client
 from django.urls import reverse
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from tasks.models import Position, Task, TaskType
 from datetime import datetime, timedelta
@@ -214,3 +218,199 @@ class PrivateTaskTests(TestCase):
         response = self.client.get(reverse("tasks:task-list"), {"name": "Task 1"})
         self.assertContains(response, "Task 1")
         self.assertNotContains(response, "Task 2")
+
+    def test_row_fragments_are_cached_until_task_changes(self):
+        cache.clear()
+        self.client.get(reverse("tasks:task-list"))
+
+        Task.objects.filter(pk=self.task.pk).update(name="Renamed without touching")
+        self.assertNotContains(self.client.get(reverse("tasks:task-list")), "Renamed without touching")
+
+        self.task.refresh_from_db()
+        self.task.name = "Renamed"
+        self.task.save()
+        self.assertContains(self.client.get(reverse("tasks:task-list")), "Renamed")
+
+    def test_row_fragments_follow_related_rows(self):
+        cache.clear()
+        worker = get_user_model().objects.create(username="assignee")
+        self.task.assignees.add(worker)
+        self.client.get(reverse("tasks:task-list"))
+
+        worker.username = "renamed-assignee"
+        worker.save()
+        self.assertContains(self.client.get(reverse("tasks:task-list")), "renamed-assignee")
+
+        Task.objects.filter(pk=self.task.pk).update(name="Renamed without touching")
+        self.task.task_type.save()
+        self.assertContains(self.client.get(reverse("tasks:task-list")), "Renamed without touching")
+
+
+class TaskExportViewTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="admin")
+        self.client.force_login(self.user)
+        task_type = TaskType.objects.create(name="Bug")
+        for i in range(4):
+            task = Task.objects.create(
+                name=f"Export {i}",
+                description="Desc",
+                deadline=timezone.now() + timedelta(days=i),
+                task_type=task_type,
+                is_completed=i % 2 == 0,
+            )
+            task.assignees.add(self.user)
+
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.get(reverse("tasks:task-export"))
+        self.assertEqual(response.status_code, 302)
+
+    def test_streams_filtered_csv(self):
+        response = self.client.get(reverse("tasks:task-export"), {"status": "pending"})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "id,name,description,deadline,priority,is_completed,task_type,assignees")
+        self.assertEqual([line.split(",")[1] for line in lines[1:]], ["Export 1", "Export 3"])
+
+    def test_streams_jsonl(self):
+        response = self.client.get(reverse("tasks:task-export"), {"format": "jsonl", "name": "Export 2"})
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual([row["name"] for row in rows], ["Export 2"])
+        self.assertEqual(rows[0]["assignees"], ["admin"])
+
+    def test_rejects_unknown_format(self):
+        response = self.client.get(reverse("tasks:task-export"), {"format": "<script>alert(1)</script>"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response["Content-Type"], "text/plain")
+        self.assertNotContains(response, "<script>", status_code=400)
+
+
+class WorkerAutocompleteViewTests(TestCase):
+    def setUp(self):
+        self.position = Position.objects.create(name="Developer")
+        self.user = get_user_model().objects.create(username="admin")
+        for i in range(25):
+            get_user_model().objects.create(username=f"dev{i:02d}", position=self.position)
+        self.client.force_login(self.user)
+
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.get(reverse("tasks:worker-autocomplete"))
+        self.assertEqual(response.status_code, 403)
+
+    def test_paginates_search_results(self):
+        url = reverse("tasks:worker-autocomplete")
+        data = self.client.get(url, {"q": "dev"}).json()
+        self.assertEqual(len(data["results"]), 20)
+        self.assertEqual(data["results"][0]["text"], "dev00 (Developer)")
+
+        data = self.client.get(url, {"q": "dev", "cursor": data["next"]}).json()
+        self.assertEqual(len(data["results"]), 5)
+        self.assertIsNone(data["next"])
+
+    def test_task_create_page_does_not_render_every_worker(self):
+        response = self.client.get(reverse("tasks:task-create"))
+        self.assertNotContains(response, "dev00")
+
+
+class WorkerTaskPanelTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="admin")
+        self.client.force_login(self.user)
+        task_type = TaskType.objects.create(name="Bug")
+        now = timezone.now()
+        self.open_tasks = []
+        for i in range(12):
+            task = Task.objects.create(
+                name=f"Open {i:02d}", description="Desc", deadline=now + timedelta(days=i), task_type=task_type
+            )
+            task.assignees.add(self.user)
+            self.open_tasks.append(task)
+        done = Task.objects.create(
+            name="Done", description="Desc", deadline=now, task_type=task_type, is_completed=True
+        )
+        done.assignees.add(self.user)
+
+    def test_detail_page_shows_first_page_of_each_section(self):
+        response = self.client.get(reverse("tasks:worker-detail", args=[self.user.pk]))
+        self.assertEqual(list(response.context["open_tasks"]), self.open_tasks[:10])
+        self.assertEqual([task.name for task in response.context["completed_tasks"]], ["Done"])
+        self.assertNotContains(response, "Open 10")
+        self.assertContains(response, reverse("tasks:worker-tasks", args=[self.user.pk, "open"]))
+
+    def test_more_fragment_returns_next_page(self):
+        page = self.client.get(reverse("tasks:worker-detail", args=[self.user.pk])).context["open_tasks"]
+        response = self.client.get(
+            reverse("tasks:worker-tasks", args=[self.user.pk, "open"]), {"cursor": page.next_cursor}
+        )
+        self.assertTemplateUsed(response, "tasks/worker_task_items.html")
+        self.assertEqual(list(response.context["page"]), self.open_tasks[10:])
+        self.assertNotContains(response, "Show more")
+
+    def test_more_fragment_rejects_bad_input(self):
+        url = reverse("tasks:worker-tasks", args=[self.user.pk, "archived"])
+        self.assertEqual(self.client.get(url).status_code, 404)
+        url = reverse("tasks:worker-tasks", args=[self.user.pk, "open"])
+        self.assertEqual(self.client.get(url, {"cursor": "garbage"}).status_code, 404)
+        self.assertEqual(self.client.get(reverse("tasks:worker-tasks", args=[0, "open"])).status_code, 404)
+        self.client.logout()
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create(username="admin")
+        self.client.force_login(self.user)
+        task_type = TaskType.objects.create(name="Bug")
+        self.tasks = []
+        for i in range(7):
+            task = Task.objects.create(
+                name=f"Task {i}",
+                description="Desc",
+                deadline=timezone.now() + timedelta(days=i + 1),
+                task_type=task_type,
+            )
+            task.assignees.add(self.user)
+            self.tasks.append(task)
+
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.get(reverse("tasks:async-task-list"))
+        self.assertRedirects(response, "/accounts/login/?next=/async/tasks/", fetch_redirect_response=False)
+
+    def test_index_matches_sync_view(self):
+        sync = self.client.get(reverse("tasks:index")).context
+        cache.clear()
+        response = self.client.get(reverse("tasks:async-index"))
+        self.assertEqual(response.status_code, 200)
+        for key in ("num_tasks", "num_workers", "num_completed_tasks", "priority_medium"):
+            self.assertEqual(response.context[key], sync[key])
+        self.assertEqual(list(response.context["upcoming_deadlines"]), list(sync["upcoming_deadlines"]))
+
+    def test_task_list_paginates(self):
+        response = self.client.get(reverse("tasks:async-task-list"), {"page": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["task_list"], self.tasks[5:])
+        self.assertTrue(response.context["is_paginated"])
+        self.assertEqual(self.client.get(reverse("tasks:async-task-list"), {"page": 9}).status_code, 404)
+        self.assertEqual(self.client.get(reverse("tasks:async-task-list"), {"page": "x"}).status_code, 404)
+        response = self.client.get(reverse("tasks:async-task-list"), {"page": "last"})
+        self.assertEqual(response.context["task_list"], self.tasks[5:])
+
+    def test_task_list_cursor_pagination(self):
+        response = self.client.get(reverse("tasks:async-task-list"), {"cursor": "", "name": "Task"})
+        self.assertEqual(response.context["task_list"], self.tasks[:5])
+        next_cursor = response.context["page_obj"].next_cursor
+        response = self.client.get(reverse("tasks:async-task-list"), {"cursor": next_cursor})
+        self.assertEqual(response.context["task_list"], self.tasks[5:])
+
+    def test_detail_views(self):
+        response = self.client.get(reverse("tasks:async-task-detail", args=[self.tasks[0].pk]))
+        self.assertContains(response, "Task 0")
+        self.assertContains(response, "admin")
+        response = self.client.get(reverse("tasks:async-worker-detail", args=[self.user.pk]))
+        self.assertContains(response, "Task 6")
+        self.assertEqual(self.client.get(reverse("tasks:async-task-detail", args=[0])).status_code, 404)
@@ -0,0 +1,35 @@
+from datetime import datetime, time, timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from tasks.models import Task
+
+
+class TaskFactoryMixin:
+    """
+    Starts each test with an empty cache and creates tasks of
+    ``self.task_type`` due ``days`` from now, assigned to ``workers``.
+    """
+
+    # Due at local noon instead, so tests of calendar days do not depend on the time they run at.
+    deadline_at_noon = False
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def due_in(self, days):
+        if self.deadline_at_noon:
+            return timezone.make_aware(datetime.combine(timezone.localdate() + timedelta(days=days), time(12)))
+        return timezone.now() + timedelta(days=days)
+
+    def create_task(self, workers=(), days=1, task_type=None, **kwargs):
+        task = Task.objects.create(
+            name="Task", description="Desc", deadline=self.due_in(days), task_type=task_type or self.task_type,
+            **kwargs
+        )
+        if workers:
+            task.assignees.add(*workers)
+        return task
@@ -0,0 +1,239 @@
+import csv
+import io
+import json
+
+from django.db import connection, transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from tasks import audit
+from tasks.capacity import invalidate_capacity_report
+from tasks.counters import recount_task_types, recount_workers
+from tasks.models import Task, TaskEvent, TaskType, Worker
+from tasks.search import get_search_backend
+from tasks.stats import invalidate_dashboard_stats
+
+EXPORT_FIELDS = ["id", "name", "description", "deadline", "priority", "is_completed", "task_type", "assignees"]
+ASSIGNEE_SEPARATOR = "|"
+FORMATS = ("csv", "jsonl")
+
+
+class TaskImportError(Exception):
+    pass
+
+
+def export_queryset(queryset=None):
+    queryset = Task.objects.all() if queryset is None else queryset
+    return queryset.select_related("task_type").prefetch_related(
+        Prefetch("assignees", queryset=Worker.objects.only("id", "username"))
+    )
+
+
+def task_to_row(task):
+    return {
+        "id": task.pk,
+        "name": task.name,
+        "description": task.description,
+        "deadline": task.deadline.isoformat(),
+        "priority": task.priority,
+        "is_completed": task.is_completed,
+        "task_type": task.task_type.name,
+        "assignees": [worker.username for worker in task.assignees.all()],
+    }
+
+
+def iter_task_rows(queryset=None, chunk_size=2000):
+    for task in export_queryset(queryset).iterator(chunk_size=chunk_size):
+        yield task_to_row(task)
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        row = dict(row, assignees=ASSIGNEE_SEPARATOR.join(row["assignees"]))
+        yield writer.writerow([row[field] for field in EXPORT_FIELDS])
+
+
+def iter_jsonl(rows):
+    for row in rows:
+        yield json.dumps(row) + "\n"
+
+
+def serialize_rows(rows, fmt):
+    return iter_csv(rows) if fmt == "csv" else iter_jsonl(rows)
+
+
+def read_rows(stream, fmt):
+    if fmt == "jsonl":
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as error:
+                raise TaskImportError(f"Line {number}: invalid JSON ({error.msg})")
+            if not isinstance(row, dict):
+                raise TaskImportError(f"Line {number}: expected a JSON object")
+            yield row
+        return
+    for row in csv.DictReader(stream):
+        assignees = row.get("assignees") or ""
+        row["assignees"] = [username for username in assignees.split(ASSIGNEE_SEPARATOR) if username]
+        yield row
+
+
+def parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "y")
+
+
+class TaskImporter:
+    """
+    Inserts task rows in batches, resolving task types and workers through
+    lookup maps loaded once up front. Task types missing from the map are
+    created; unknown workers abort the import.
+    """
+
+    def __init__(self, batch_size=1000, use_copy=None):
+        self.batch_size = batch_size
+        self.use_copy = connection.vendor == "postgresql" if use_copy is None else use_copy
+        self.task_types = dict(TaskType.objects.values_list("name", "id"))
+        self.workers = dict(Worker.objects.values_list("username", "id"))
+        self.priorities = set(Task.PriorityChoices.values)
+        self.search_backend = get_search_backend()
+        self.count = 0
+        self.task_ids = []
+        self.touched_task_type_ids = set()
+        self.touched_worker_ids = set()
+
+    def build_task(self, row, line):
+        deadline = parse_datetime(str(row.get("deadline") or ""))
+        if deadline is None:
+            raise TaskImportError(f"Row {line}: invalid deadline {row.get('deadline')!r}")
+        if timezone.is_naive(deadline):
+            deadline = timezone.make_aware(deadline)
+
+        priority = row.get("priority") or Task.PriorityChoices.MEDIUM
+        if priority not in self.priorities:
+            raise TaskImportError(f"Row {line}: invalid priority {priority!r}")
+
+        type_name = row.get("task_type") or ""
+        if not type_name:
+            raise TaskImportError(f"Row {line}: task_type is required")
+        if type_name not in self.task_types:
+            self.task_types[type_name] = TaskType.objects.create(name=type_name).pk
+
+        try:
+            assignee_ids = [self.workers[username] for username in row.get("assignees") or []]
+        except KeyError as error:
+            raise TaskImportError(f"Row {line}: unknown worker {error.args[0]!r}")
+
+        task = Task(
+            name=row.get("name") or "",
+            description=row.get("description") or "",
+            deadline=deadline,
+            priority=priority,
+            is_completed=parse_bool(row.get("is_completed", False)),
+            task_type_id=self.task_types[type_name],
+        )
+        return task, assignee_ids
+
+    def run(self, rows):
+        batch = []
+        with transaction.atomic():
+            for line, row in enumerate(rows, start=1):
+                batch.append(self.build_task(row, line))
+                if len(batch) >= self.batch_size:
+                    self.flush(batch)
+                    batch = []
+            if batch:
+                self.flush(batch)
+            self.restamp()
+            recount_task_types(self.touched_task_type_ids)
+            recount_workers(self.touched_worker_ids)
+        transaction.on_commit(invalidate_dashboard_stats)
+        transaction.on_commit(invalidate_capacity_report)
+        return self.count
+
+    def flush(self, batch):
+        if self.use_copy:
+            self.copy_batch(batch)
+        else:
+            self.insert_batch(batch)
+        tasks = [task for task, _ in batch]
+        self.search_backend.index_objects(Task, tasks)
+        audit.record_created(tasks)
+        audit.record_assignees(TaskEvent.Kind.ASSIGNED, self.through_rows(batch))
+        self.task_ids.extend(task.pk for task in tasks)
+        for task, assignee_ids in batch:
+            self.touched_task_type_ids.add(task.task_type_id)
+            self.touched_worker_ids.update(assignee_ids)
+        self.count += len(batch)
+
+    def restamp(self):
+        # The rows were stamped as they were written, possibly long before this
+        # transaction commits; the changes feed (tasks.sync) only holds back rows
+        # younger than SYNC_SAFETY_LAG_SECONDS, so stamp them again at the end.
+        now = timezone.now()
+        for start in range(0, len(self.task_ids), self.batch_size):
+            Task.objects.filter(pk__in=self.task_ids[start:start + self.batch_size]).update(updated_at=now)
+
+    def through_rows(self, batch):
+        return [
+            (task.pk, worker_id)
+            for task, assignee_ids in batch
+            for worker_id in dict.fromkeys(assignee_ids)
+        ]
+
+    def insert_batch(self, batch):
+        Task.objects.bulk_create([task for task, _ in batch], batch_size=self.batch_size)
+        Through = Task.assignees.through
+        Through.objects.bulk_create(
+            [Through(task_id=task_id, worker_id=worker_id) for task_id, worker_id in self.through_rows(batch)],
+            batch_size=self.batch_size,
+        )
+
+    def copy_batch(self, batch):
+        # COPY cannot return generated keys, so ids are reserved from the sequence first.
+        table = Task._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+                [table, len(batch)],
+            )
+            for (task, _), (pk,) in zip(batch, cursor.fetchall()):
+                task.pk = pk
+
+            now = timezone.now().isoformat()
+            columns = [
+                "id", "name", "description", "deadline", "priority", "is_completed", "task_type_id",
+                "created_at", "updated_at",
+            ]
+            copy_rows(cursor, table, columns, (
+                [task.pk, task.name, task.description, task.deadline.isoformat(),
+                 task.priority, task.is_completed, task.task_type_id, now, now]
+                for task, _ in batch
+            ))
+            copy_rows(
+                cursor, Task.assignees.through._meta.db_table, ["task_id", "worker_id"], self.through_rows(batch)
+            )
+
+
+def copy_rows(cursor, table, columns, rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    if hasattr(cursor, "copy_expert"):
+        cursor.copy_expert(sql, buffer)
+    else:
+        with cursor.copy(sql) as copy:
+            copy.write(buffer.getvalue())
@@ -1,27 +1,73 @@
 from django.urls import path
 
+from tasks.api import (
+    TaskApiListView,
+    TaskApiDetailView,
+    WorkerApiListView,
+    WorkerApiDetailView,
+    TaskTypeApiListView,
+    TaskTypeApiDetailView,
+    PositionApiListView,
+    PositionApiDetailView,
+    ChangesApiView,
+)
+from tasks.async_views import AsyncIndexView, AsyncTaskListView, AsyncTaskDetailView, AsyncWorkerDetailView
 from tasks.views import (
     IndexView,
     TaskListView,
+    TaskExportView,
+    TaskExportJobView,
+    TaskBulkActionView,
     TaskCreateView,
     TaskUpdateView,
-    TaskDeleteView, TaskDetailView, WorkerListView, WorkerCreateView, WorkerUpdateView, WorkerDeleteView,
-    WorkerDetailView,
+    TaskDeleteView, TaskDetailView, AssigneeSuggestionView,
+    WorkerListView, WorkerCreateView, WorkerUpdateView, WorkerDeleteView,
+    WorkerDetailView, WorkerTaskListView, WorkerAutocompleteView, MetricsView, JobDetailView, JobDownloadView,
+    CapacityReportView, CapacityExportView,
 )
 
 urlpatterns = [
     path("", IndexView.as_view(), name="index"),
     path("tasks/", TaskListView.as_view(), name="task-list"),
+    path("tasks/bulk/", TaskBulkActionView.as_view(), name="task-bulk"),
+    path("tasks/export/", TaskExportView.as_view(), name="task-export"),
+    path("tasks/export/jobs/", TaskExportJobView.as_view(), name="task-export-job"),
     path("tasks/create/", TaskCreateView.as_view(), name="task-create"),
+    path("tasks/suggest-assignees/", AssigneeSuggestionView.as_view(), name="task-suggest-assignees"),
     path("tasks/<int:pk>/update/", TaskUpdateView.as_view(), name="task-update"),
     path("tasks/<int:pk>/delete/", TaskDeleteView.as_view(), name="task-delete"),
     path("tasks/<int:pk>/", TaskDetailView.as_view(), name="task-detail"),
 
     path("workers/", WorkerListView.as_view(), name="worker-list"),
+    path("workers/autocomplete/", WorkerAutocompleteView.as_view(), name="worker-autocomplete"),
     path("workers/create/", WorkerCreateView.as_view(), name="worker-create"),
     path("workers/<int:pk>/update/", WorkerUpdateView.as_view(), name="worker-update"),
     path("workers/<int:pk>/delete/", WorkerDeleteView.as_view(), name="worker-delete"),
     path("workers/<int:pk>/", WorkerDetailView.as_view(), name="worker-detail"),
+    path("workers/<int:pk>/tasks/<str:status>/", WorkerTaskListView.as_view(), name="worker-tasks"),
+
+    path("capacity/", CapacityReportView.as_view(), name="capacity-report"),
+    path("capacity/export/", CapacityExportView.as_view(), name="capacity-export"),
+
+    path("api/tasks/", TaskApiListView.as_view(), name="api-task-list"),
+    path("api/tasks/<int:pk>/", TaskApiDetailView.as_view(), name="api-task-detail"),
+    path("api/workers/", WorkerApiListView.as_view(), name="api-worker-list"),
+    path("api/workers/<int:pk>/", WorkerApiDetailView.as_view(), name="api-worker-detail"),
+    path("api/task-types/", TaskTypeApiListView.as_view(), name="api-task-type-list"),
+    path("api/task-types/<int:pk>/", TaskTypeApiDetailView.as_view(), name="api-task-type-detail"),
+    path("api/positions/", PositionApiListView.as_view(), name="api-position-list"),
+    path("api/positions/<int:pk>/", PositionApiDetailView.as_view(), name="api-position-detail"),
+    path("api/changes/", ChangesApiView.as_view(), name="api-changes"),
+
+    path("jobs/<int:pk>/", JobDetailView.as_view(), name="job-detail"),
+    path("jobs/<int:pk>/download/", JobDownloadView.as_view(), name="job-download"),
+
+    path("metrics/", MetricsView.as_view(), name="metrics"),
+
+    path("async/", AsyncIndexView.as_view(), name="async-index"),
+    path("async/tasks/", AsyncTaskListView.as_view(), name="async-task-list"),
+    path("async/tasks/<int:pk>/", AsyncTaskDetailView.as_view(), name="async-task-detail"),
+    path("async/workers/<int:pk>/", AsyncWorkerDetailView.as_view(), name="async-worker-detail"),
 ]
 
 app_name = "tasks"
@@ -1,14 +1,39 @@
-from datetime import date, timedelta
+import csv
+import os
 
+from django.conf import settings
+from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
-from django.urls import reverse_lazy
+from django.core.files.storage import default_storage
+from django.core.paginator import Paginator
+from django.http import (
+    FileResponse, Http404, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, HttpResponseRedirect,
+    JsonResponse, StreamingHttpResponse,
+)
+from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
+from django.urls import reverse, reverse_lazy
+from django.utils.crypto import constant_time_compare
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.views import generic
 
-from tasks.forms import TaskForm, WorkerCreationForm, TaskNameSearchForm, WorkerUsernameSearchForm, \
-    TaskStatusFilterForm, WorkerUpdateForm
-from tasks.models import Task, Worker
+from tasks import bulk
+from tasks.analytics import get_task_trend
+from tasks.assignment import AssignmentEngine
+from tasks.audit import buffered_events, task_history
+from tasks.capacity import get_capacity_report, iter_capacity_csv_rows
+from tasks.counters import deferred_recounts
+from tasks.deadlines import task_type_deadline_buckets, worker_deadline_buckets
+from tasks.forms import filter_tasks, TaskForm, WorkerCreationForm, TaskNameSearchForm, WorkerUsernameSearchForm, \
+    TaskStatusFilterForm, WorkerUpdateForm, TaskBulkActionForm, AssigneeSuggestionForm
+from tasks.jobs import enqueue, render_job_metrics
+from tasks.metrics import registry
+from tasks.models import Job, Task
+from tasks.pagination import CursorPaginationMixin, CursorPaginator, InvalidCursor, default_cursor_ordering
+from tasks.search import search
+from tasks.stats import get_dashboard_stats
+from tasks.transfer import Echo, iter_task_rows, serialize_rows
 
 
 class IndexView(generic.TemplateView):
@@ -17,111 +42,274 @@ class IndexView(generic.TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        context["num_workers"] = Worker.objects.count()
-        context["num_tasks"] = Task.objects.count()
-        context["num_completed_tasks"] = Task.objects.filter(is_completed=True).count()
+        context.update(get_dashboard_stats())
 
-        upcoming_tasks_queryset = Task.objects.filter(
-            is_completed=False,
-            deadline__gte=date.today(),
-            deadline__lte=date.today() + timedelta(days=7)
-        ).order_by('deadline')[:5]
-        context["upcoming_deadlines"] = upcoming_tasks_queryset
+        context["upcoming_deadlines"] = Task.objects.upcoming()[:5]
+        context.update(task_type_deadline_buckets())
+        context["task_trend"] = get_task_trend()
 
-        priority_counts = Task.objects.values('priority').annotate(count=Count('priority'))
-
-        priority_high = 0
-        priority_medium = 0
-        priority_low = 0
-
-        for item in priority_counts:
-            if item['priority'] == 'High':
-                priority_high = item['count']
-            elif item['priority'] == 'Medium':
-                priority_medium = item['count']
-            elif item['priority'] == 'Low':
-                priority_low = item['count']
+        return context
 
-        context["priority_high"] = priority_high
-        context["priority_medium"] = priority_medium
-        context["priority_low"] = priority_low
 
-        return context
+class TaskFilterMixin:
+    def filter_tasks(self, queryset):
+        return filter_tasks(queryset, self.request.GET)
 
 
-class TaskListView(LoginRequiredMixin, generic.ListView):
+class TaskListView(LoginRequiredMixin, TaskFilterMixin, CursorPaginationMixin, generic.ListView):
     model = Task
     context_object_name = "task_list"
     template_name = "tasks/task_list.html"
     paginate_by = 5
 
     def get_queryset(self):
-        queryset = Task.objects.all()
-
-        search_form = TaskNameSearchForm(self.request.GET)
-        if search_form.is_valid():
-            name = search_form.cleaned_data["name"]
-            if name:
-                queryset = queryset.filter(name__icontains=name)
-
-        status_form = TaskStatusFilterForm(self.request.GET)
-        if status_form.is_valid():
-            status = status_form.cleaned_data["status"]
-            if status == "completed":
-                queryset = queryset.filter(is_completed=True)
-            elif status == "pending":
-                queryset = queryset.filter(is_completed=False)
-
-        return queryset
+        return self.filter_tasks(Task.objects.for_list())
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["search_form"] = TaskNameSearchForm(self.request.GET)
         context["filter_form"] = TaskStatusFilterForm(self.request.GET)
+        context["bulk_form"] = TaskBulkActionForm()
         return context
 
 
+def unsupported_format():
+    # Never echo the requested format back: it is user input.
+    supported = ", ".join(TaskExportView.content_types)
+    return HttpResponseBadRequest(f"Unsupported format; use one of: {supported}", content_type="text/plain")
+
+
+class TaskExportView(LoginRequiredMixin, TaskFilterMixin, generic.View):
+    chunk_size = 2000
+    content_types = {
+        "csv": "text/csv",
+        "jsonl": "application/x-ndjson",
+    }
+
+    def get(self, request, *args, **kwargs):
+        fmt = request.GET.get("format", "csv")
+        if fmt not in self.content_types:
+            return unsupported_format()
+
+        rows = iter_task_rows(self.filter_tasks(Task.objects.all()), chunk_size=self.chunk_size)
+        response = StreamingHttpResponse(serialize_rows(rows, fmt), content_type=self.content_types[fmt])
+        response["Content-Disposition"] = f'attachment; filename="tasks.{fmt}"'
+        return response
+
+
+class TaskExportJobView(LoginRequiredMixin, generic.View):
+    """Queue an export of the filtered task list for run_worker instead of streaming it in the request."""
+
+    http_method_names = ["post"]
+
+    def post(self, request, *args, **kwargs):
+        fmt = request.POST.get("format", "csv")
+        if fmt not in TaskExportView.content_types:
+            return unsupported_format()
+        filters = {key: request.POST[key] for key in ("name", "status") if request.POST.get(key)}
+        job = enqueue("export_tasks", {"format": fmt, "filters": filters}, created_by=request.user)
+        return HttpResponseRedirect(reverse("tasks:job-detail", args=[job.pk]))
+
+
+class UserJobMixin(LoginRequiredMixin):
+    model = Job
+
+    def get_queryset(self):
+        return Job.objects.filter(created_by=self.request.user)
+
+
+class JobDetailView(UserJobMixin, generic.DetailView):
+    template_name = "tasks/job_detail.html"
+
+
+class JobDownloadView(UserJobMixin, generic.detail.SingleObjectMixin, generic.View):
+    def get(self, request, *args, **kwargs):
+        job = self.get_object()
+        path = (job.result or {}).get("path") if job.status == Job.Status.DONE else None
+        if not path or not default_storage.exists(path):
+            raise Http404("Export is not available.")
+        return FileResponse(default_storage.open(path), as_attachment=True, filename=os.path.basename(path))
+
+
+class TaskEventMixin:
+    """Write the task events of a form save in one insert, attributed to the requesting user."""
+
+    def form_valid(self, form):
+        with buffered_events(actor=self.request.user):
+            return super().form_valid(form)
+
+
+class TaskBulkActionView(LoginRequiredMixin, generic.FormView):
+    form_class = TaskBulkActionForm
+    http_method_names = ["post"]
+
+    def get_success_url(self):
+        next_url = self.request.POST.get("next")
+        if next_url and url_has_allowed_host_and_scheme(next_url, allowed_hosts={self.request.get_host()}):
+            return next_url
+        return reverse("tasks:task-list")
+
+    def perform_action(self, form):
+        tasks = form.cleaned_data["tasks"]
+        action = form.cleaned_data["action"]
+        if action == "complete":
+            return bulk.complete_tasks(tasks)
+        if action == "priority":
+            return bulk.set_priority(tasks, form.cleaned_data["priority"])
+        if action == "add_assignees":
+            return bulk.add_assignees(tasks, form.cleaned_data["assignees"])
+        if action == "remove_assignees":
+            return bulk.remove_assignees(tasks, form.cleaned_data["assignees"])
+        return bulk.delete_tasks(tasks)
+
+    def form_valid(self, form):
+        action = form.cleaned_data["action"]
+        with buffered_events(actor=self.request.user):
+            count = self.perform_action(form)
+        messages.success(self.request, f"{dict(form.ACTION_CHOICES)[action]}: {count} task(s) updated.")
+        return super().form_valid(form)
+
+    def form_invalid(self, form):
+        for errors in form.errors.values():
+            for error in errors:
+                messages.error(self.request, error)
+        return HttpResponseRedirect(self.get_success_url())
+
+
 class TaskDetailView(LoginRequiredMixin, generic.DetailView):
     model = Task
+    queryset = Task.objects.for_list()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["events"] = task_history(self.object.pk)
+        return context
+
+
+class DeferredRecountMixin:
+    """Recount once after the task and its assignees are saved, not after each signal."""
 
+    def form_valid(self, form):
+        with deferred_recounts():
+            return super().form_valid(form)
 
-class TaskCreateView(LoginRequiredMixin, generic.CreateView):
+
+class TaskCreateView(LoginRequiredMixin, TaskEventMixin, DeferredRecountMixin, generic.CreateView):
     model = Task
     form_class = TaskForm
     template_name = "tasks/task_form.html"
     success_url = reverse_lazy("tasks:task-list")
 
 
-class TaskUpdateView(LoginRequiredMixin, generic.UpdateView):
+class TaskUpdateView(LoginRequiredMixin, TaskEventMixin, DeferredRecountMixin, generic.UpdateView):
     model = Task
     form_class = TaskForm
     success_url = reverse_lazy("tasks:task-list")
 
 
-class TaskDeleteView(LoginRequiredMixin, generic.DeleteView):
+class TaskDeleteView(LoginRequiredMixin, TaskEventMixin, DeferredRecountMixin, generic.DeleteView):
     model = Task
     success_url = reverse_lazy("tasks:task-list")
 
 
-class WorkerListView(LoginRequiredMixin, generic.ListView):
+class WorkerListView(LoginRequiredMixin, CursorPaginationMixin, generic.ListView):
     model = get_user_model()
     context_object_name = "worker_list"
     template_name = "tasks/worker_list.html"
     paginate_by = 5
+    # Sorts on maintained counter columns (tasks.counters), so no aggregation.
+    orderings = {
+        "workload": ["-open_task_count", "username", "id"],
+        "overdue": ["-overdue_task_count", "username", "id"],
+    }
+
+    def get_ordering(self):
+        return self.orderings.get(self.request.GET.get("ordering"))
+
+    def get_cursor_ordering(self):
+        return self.get_ordering() or super().get_cursor_ordering()
 
     def get_queryset(self):
-        queryset = get_user_model().objects.all()
+        queryset = get_user_model().objects.select_related("position")
         form = WorkerUsernameSearchForm(self.request.GET)
         if form.is_valid() and form.cleaned_data["username"]:
-            queryset = queryset.filter(username__icontains=form.cleaned_data["username"])
+            queryset = search(queryset, form.cleaned_data["username"])
+        ordering = self.get_ordering()
+        if ordering:
+            queryset = queryset.order_by(*ordering)
         return queryset
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["search_form"] = WorkerUsernameSearchForm(self.request.GET)
+        context["ordering"] = self.request.GET.get("ordering") if self.get_ordering() else ""
         return context
 
 
+class WorkerAutocompleteView(LoginRequiredMixin, generic.View):
+    raise_exception = True
+    page_size = 20
+
+    def get(self, request, *args, **kwargs):
+        queryset = get_user_model().objects.select_related("position")
+        term = request.GET.get("q", "").strip()
+        if term:
+            queryset = search(queryset, term)
+
+        paginator = CursorPaginator(queryset, self.page_size, default_cursor_ordering(get_user_model()))
+        try:
+            page = paginator.page(request.GET.get("cursor"))
+        except InvalidCursor:
+            return JsonResponse({"detail": "Invalid cursor"}, status=400)
+        return JsonResponse({
+            "results": [{"id": worker.pk, "text": str(worker)} for worker in page],
+            "next": page.next_cursor,
+        })
+
+
+class AssigneeSuggestionView(LoginRequiredMixin, generic.View):
+    raise_exception = True
+    count = 5
+
+    def get(self, request, *args, **kwargs):
+        form = AssigneeSuggestionForm(request.GET)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors}, status=400)
+        suggestions = AssignmentEngine().suggest(
+            form.cleaned_data["task_type"].pk,
+            form.cleaned_data["deadline"],
+            count=self.count,
+            # Workers already picked in the task form.
+            exclude=[int(pk) for pk in request.GET.getlist("exclude") if pk.isdigit()],
+        )
+        return JsonResponse({
+            "results": [
+                {
+                    "id": suggestion.worker_id,
+                    "text": suggestion.username,
+                    "score": round(suggestion.score, 2),
+                    "open_tasks": suggestion.open_tasks,
+                    "clustered": suggestion.clustered,
+                }
+                for suggestion in suggestions
+            ],
+        })
+
+
+WORKER_TASK_SECTIONS = {
+    # status: (is_completed, cursor ordering)
+    "open": (False, ["deadline", "id"]),
+    "completed": (True, ["-deadline", "-id"]),
+}
+WORKER_TASK_PAGE_SIZE = 10
+
+
+def worker_task_paginator(worker_id, status):
+    is_completed, ordering = WORKER_TASK_SECTIONS[status]
+    queryset = Task.objects.filter(assignees=worker_id, is_completed=is_completed).select_related("task_type")
+    return CursorPaginator(queryset, WORKER_TASK_PAGE_SIZE, ordering)
+
+
 class WorkerDetailView(LoginRequiredMixin, generic.DetailView):
     model = get_user_model()
     template_name = "tasks/worker_detail.html"
@@ -129,10 +317,34 @@ class WorkerDetailView(LoginRequiredMixin, generic.DetailView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["tasks"] = self.object.assigned_tasks.all()
+        # Only the first page of each section; the rest is fetched from WorkerTaskListView.
+        context["open_tasks"] = worker_task_paginator(self.object.pk, "open").page()
+        context["completed_tasks"] = worker_task_paginator(self.object.pk, "completed").page()
+        context["deadline_buckets"] = worker_deadline_buckets(self.object.pk)
         return context
 
 
+class WorkerTaskListView(LoginRequiredMixin, generic.View):
+    """The next page of a worker's open or completed tasks, as list items for the detail page."""
+
+    raise_exception = True
+
+    def get(self, request, *args, **kwargs):
+        status = kwargs["status"]
+        if status not in WORKER_TASK_SECTIONS:
+            raise Http404("Unknown task status.")
+        worker = get_object_or_404(get_user_model().objects.only("pk"), pk=kwargs["pk"])
+        try:
+            page = worker_task_paginator(worker.pk, status).page(request.GET.get("cursor"))
+        except InvalidCursor:
+            raise Http404("Invalid cursor.")
+        return TemplateResponse(request, "tasks/worker_task_items.html", {
+            "page": page,
+            "status": status,
+            "worker_id": worker.pk,
+        })
+
+
 class WorkerCreateView(LoginRequiredMixin, generic.CreateView):
     model = get_user_model()
     form_class = WorkerCreationForm
@@ -151,3 +363,56 @@ class WorkerDeleteView(LoginRequiredMixin, generic.DeleteView):
     model = get_user_model()
     template_name = "tasks/worker_confirm_delete.html"
     success_url = reverse_lazy("tasks:worker-list")
+
+
+class CapacityReportView(LoginRequiredMixin, generic.TemplateView):
+    template_name = "tasks/capacity_report.html"
+    paginate_by = 25
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        report = get_capacity_report()
+        paginator = Paginator(report["workers"], self.paginate_by)
+        page = paginator.get_page(self.request.GET.get("page"))
+        context.update(
+            report,
+            workers=page.object_list,
+            paginator=paginator,
+            page_obj=page,
+            is_paginated=page.has_other_pages(),
+            # Name, total, "Earlier" and "Later" besides the priority and week columns.
+            column_count=len(report["priorities"]) + len(report["weeks"]) + 4,
+        )
+        return context
+
+
+class CapacityExportView(LoginRequiredMixin, generic.View):
+    def get(self, request, *args, **kwargs):
+        writer = csv.writer(Echo())
+        rows = (writer.writerow(row) for row in iter_capacity_csv_rows(get_capacity_report()))
+        response = StreamingHttpResponse(rows, content_type="text/csv")
+        response["Content-Disposition"] = 'attachment; filename="capacity.csv"'
+        return response
+
+
+class MetricsView(generic.View):
+    """
+    Prometheus text exposition of the request metrics. Requires the bearer
+    token from METRICS_TOKEN when set, otherwise only INTERNAL_IPS may scrape.
+    """
+
+    http_method_names = ["get"]
+
+    def is_allowed(self, request):
+        if settings.METRICS_TOKEN:
+            return constant_time_compare(
+                request.headers.get("Authorization", ""), f"Bearer {settings.METRICS_TOKEN}"
+            )
+        return request.META.get("REMOTE_ADDR") in settings.INTERNAL_IPS
+
+    def get(self, request, *args, **kwargs):
+        if not self.is_allowed(request):
+            return HttpResponseForbidden()
+        return HttpResponse(
+            registry.render() + render_job_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
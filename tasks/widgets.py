@@ -0,0 +1,44 @@
+from django import forms
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+
+SELECT2_VERSION = "4.1.0-rc.0"
+
+
+class WorkerAutocompleteWidget(forms.SelectMultiple):
+    """
+    Multi-select that only renders the currently selected workers; the rest
+    are fetched page by page from the autocomplete endpoint as the user types.
+    """
+
+    url_name = "tasks:worker-autocomplete"
+
+    class Media:
+        css = {"all": (f"https://cdn.jsdelivr.net/npm/select2@{SELECT2_VERSION}/dist/css/select2.min.css",)}
+        js = (f"https://cdn.jsdelivr.net/npm/select2@{SELECT2_VERSION}/dist/js/select2.min.js",)
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context["widget"]["attrs"]["data-autocomplete-url"] = reverse(self.url_name)
+        return context
+
+    def selected_pks(self, value):
+        # A bound form may hold anything the client posted; invalid ids are reported by the field, not looked up.
+        pk_field = self.choices.queryset.model._meta.pk
+        selected = []
+        for pk in value:
+            try:
+                selected.append(pk_field.to_python(pk))
+            except ValidationError:
+                continue
+        return [pk for pk in selected if pk]
+
+    def optgroups(self, name, value, attrs=None):
+        all_choices = self.choices
+        selected = self.selected_pks(value)
+        queryset = all_choices.queryset.filter(pk__in=selected) if selected else all_choices.queryset.none()
+        self.choices = [(worker.pk, str(worker)) for worker in queryset.select_related("position")]
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = all_choices